@@ -1,10 +1,100 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import PAGE_VAR
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
 from django.utils.html import format_html
-from urllib.parse import quote
 from .models import (
     Person, Allergy, PersonAllergy, Ingredient, AllergyIngredient,
     Fridge, Recipe, RecipeIngredient, Like, Shopping
 )
+from .thumbnails import thumbnail_url
+
+
+# ------------------------------
+# 대용량 목록용 페이지네이터
+# ------------------------------
+def estimated_row_count(model):
+    """DB 통계로 테이블 행 수 추정 (COUNT(*) 전체 스캔 없음). 알 수 없으면 None"""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", [table]
+            )
+        elif connection.vendor == 'sqlite':
+            # rowid B-tree 의 마지막 값 (삭제된 행만큼 많게 나올 수 있음)
+            cursor.execute(f'SELECT MAX(rowid) FROM "{table}"')
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row and row[0] and row[0] > 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    필터/검색이 없으면 COUNT(*) 대신 DB 통계 추정치 사용
+    필터/검색이 있으면 COUNT_LIMIT 건 (또는 요청한 페이지의 다음 페이지)까지만 센다.
+    그보다 많으면 capped = True → 목록 하단에 "N+" 로 표시하고 (admin/apis/pagination.html)
+    다음 페이지로 넘어갈 때마다 그 다음 페이지까지 다시 세므로 상한 뒤로도 계속 넘길 수 있다.
+    """
+    COUNT_LIMIT = 10_000
+    # LargeTableAdmin.get_paginator 가 요청의 ?p= 값으로 채움
+    requested_page = 1
+    capped = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model)
+            if estimate is not None and estimate > self.COUNT_LIMIT:
+                return estimate
+        limit = max(self.COUNT_LIMIT, (self.requested_page + 1) * self.per_page)
+        count = queryset[:limit + 1].count()
+        if count > limit:
+            self.capped = True
+            return limit
+        return count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    수백만 행 테이블용 기본 설정
+        - 추정 count 페이지네이터, "전체 N건" 용 두 번째 COUNT(*) 생략
+        - FK 컬럼은 list_select_related 로 JOIN (행마다 __str__ 조회 방지)
+        - FK 입력은 전체 목록 <select> 대신 autocomplete / raw id
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        paginator = super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+        try:
+            paginator.requested_page = max(1, int(request.GET.get(PAGE_VAR, 1)))
+        except ValueError:
+            pass
+        return paginator
+
+
+class IngredientCategoryFilter(admin.SimpleListFilter):
+    """재료 카테고리 필터 - 선택지는 Ingredient 테이블에서 (대용량 테이블 DISTINCT 방지)"""
+    title = '재료 카테고리'
+    parameter_name = 'ingredient_category'
+
+    def lookups(self, request, model_admin):
+        categories = Ingredient.objects.order_by('ingredient_category').values_list(
+            'ingredient_category', flat=True
+        ).distinct()
+        return [(c, c) for c in categories]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(ingredient__ingredient_category=self.value())
+        return queryset
 
 # ------------------------------
 # 1. Person (사용자)
@@ -27,10 +117,12 @@ class AllergyAdmin(admin.ModelAdmin):
 # 3. PersonAllergy
 # ------------------------------
 @admin.register(PersonAllergy)
-class PersonAllergyAdmin(admin.ModelAdmin):
+class PersonAllergyAdmin(LargeTableAdmin):
     list_display = ('person', 'allergy')
     list_filter = ('allergy',)
     search_fields = ('person__name', 'allergy__allergy_name')
+    list_select_related = ('person', 'allergy')
+    autocomplete_fields = ('person',)
 
 # ------------------------------
 # 4. Ingredient (식재료)
@@ -45,15 +137,11 @@ class IngredientAdmin(admin.ModelAdmin):
     search_fields = ('ingredient_name',)
 
     def preview_image(self, obj):
+        # 원본(수백 KB) 대신 썸네일 - 첫 요청 때 생성되고 이후에는 브라우저 캐시
         if obj.ingredient_img:
-            img_path = obj.ingredient_img
-            if not img_path.startswith("media/") and not img_path.startswith("/media/"):
-                img_path = f"/media/{img_path}"
-
-            encoded_path = quote(img_path)
             return format_html(
-                '<img src="{}" style="width:60px; height:60px; object-fit:cover; border-radius:8px;" />',
-                encoded_path
+                '<img src="{}" style="width:60px; height:60px; object-fit:cover; border-radius:8px;" loading="lazy" />',
+                thumbnail_url(obj.ingredient_img, "sm")
             )
         return "❌ 없음"
 
@@ -66,18 +154,24 @@ class IngredientAdmin(admin.ModelAdmin):
 class AllergyIngredientAdmin(admin.ModelAdmin):
     list_display = ('ingredient', 'allergy')
     search_fields = ('ingredient__ingredient_name', 'allergy__allergy_name')
+    list_select_related = ('ingredient', 'allergy')
+    autocomplete_fields = ('ingredient',)
 
 # ------------------------------
 # 6. Fridge (냉장고)
 # ------------------------------
 @admin.register(Fridge)
-class FridgeAdmin(admin.ModelAdmin):
+class FridgeAdmin(LargeTableAdmin):
     list_display = (
         'fridge_id', 'person', 'ingredient', 
         'f_quantity', 'added_date', 'expiry_date'
     )
     list_filter = ('expiry_date',)
     search_fields = ('person__name', 'ingredient__ingredient_name')
+    list_select_related = ('person', 'ingredient')
+    autocomplete_fields = ('person', 'ingredient')
+    # 유통기한 임박 순 - (expiry_date, fridge_id) 인덱스로 필터 + 정렬 (정렬용 임시 B-tree 없음)
+    ordering = ('expiry_date', 'fridge_id')
 
 # ------------------------------
 # 7. Recipe (레시피)
@@ -90,8 +184,8 @@ class RecipeAdmin(admin.ModelAdmin):
     def preview_image(self, obj):
         if obj.recipe_img:
             return format_html(
-                '<img src="/media/{}" style="width:80px; height:80px; object-fit:cover; border-radius:8px;" />',
-                obj.recipe_img
+                '<img src="{}" style="width:80px; height:80px; object-fit:cover; border-radius:8px;" loading="lazy" />',
+                thumbnail_url(obj.recipe_img, "sm")
             )
         return "❌ 없음"
 
@@ -101,24 +195,28 @@ class RecipeAdmin(admin.ModelAdmin):
 # 8. RecipeIngredient
 # ------------------------------
 @admin.register(RecipeIngredient)
-class RecipeIngredientAdmin(admin.ModelAdmin):
+class RecipeIngredientAdmin(LargeTableAdmin):
     list_display = ('recipe', 'ingredient', 'r_quantity')
     search_fields = ('recipe__recipe_name', 'ingredient__ingredient_name')
+    list_select_related = ('recipe', 'ingredient')
+    autocomplete_fields = ('recipe', 'ingredient')
 
 # ------------------------------
 # 9. Like (좋아요)
 # ------------------------------
 @admin.register(Like)
-class LikeAdmin(admin.ModelAdmin):
+class LikeAdmin(LargeTableAdmin):
     list_display = ('recipe', 'person')
     search_fields = ('recipe__recipe_name', 'person__name')
+    list_select_related = ('recipe', 'person')
+    autocomplete_fields = ('recipe', 'person')
 
 # ------------------------------
 # 10. Shopping (쇼핑 기록)
 # ------------------------------  
 
 @admin.register(Shopping)
-class ShoppingAdmin(admin.ModelAdmin):
+class ShoppingAdmin(LargeTableAdmin):
     list_display = (
         'shopping_id',
         'person',
@@ -134,7 +232,7 @@ class ShoppingAdmin(admin.ModelAdmin):
     list_filter = (
         'purchased_date',
         'added_to_fridge',
-        'ingredient__ingredient_category'
+        IngredientCategoryFilter
     )
 
     search_fields = (
@@ -143,7 +241,15 @@ class ShoppingAdmin(admin.ModelAdmin):
         'ingredient__ingredient_name'
     )
 
-    ordering = ('-purchased_date',)
+    # (purchased_date, shopping_id) 인덱스를 역순으로 읽음
+    ordering = ('-purchased_date', '-shopping_id')
+
+    # fridge_record.__str__ 도 person / ingredient 를 참조
+    list_select_related = (
+        'person', 'ingredient', 'fridge_record__person', 'fridge_record__ingredient'
+    )
+    # fridge_record 는 readonly 라서 <select> 를 만들지 않음
+    autocomplete_fields = ('person', 'ingredient')
 
     # ✔ 자동 계산 필드 수정 금지
     readonly_fields = (
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ApisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apis'
+
+    def ready(self):
+        # 시그널 수신자 등록
+        from . import signals  # noqa: F401
@@ -0,0 +1,123 @@
+"""
+재료 이름 자동완성 (메모리 정렬 배열 + 이진 탐색)
+
+재료 이름을 한글 자모 단위로 풀어 쓴 키로 정렬해 두고, 질의도 같은 방식으로 풀어서
+bisect 로 접두사 범위만 읽는다.
+    "두부" → "ㄷㅜㅂㅜ",  "닭" → "ㄷㅏㄹㄱ"   (겹받침/이중모음도 분해)
+그래서 입력 중인 글자도 접두사로 맞는다.
+    "ㄷ" / "두" / "둡" → 두부,  "달" → 닭고기
+자음만 입력하면(2자 이상) 초성 키로 찾는다.   "ㄷㅂ" → 두부
+
+Ingredient 변경 시 signals.py 에서 invalidate_ingredient_index() → 다음 요청에서 재구성
+(다른 워커는 CacheVersion 테이블의 버전으로 알게 됨, index_cache.py)
+"""
+from bisect import bisect_left
+
+from .index_cache import SharedIndex
+from .models import Ingredient
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = [
+    "ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ",
+    "ㅗㅣ", "ㅛ", "ㅜ", "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ",
+]
+JONGSEONG = [
+    "", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+    "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+# 따로 입력된 호환 자모 중 두 글자로 나눠야 하는 것 (겹받침, 이중모음)
+COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+
+def decompose(text):
+    """공백 제거 + 소문자 + 완성형 한글을 자모로 분해"""
+    out = []
+    for ch in text.lower():
+        if ch.isspace():
+            continue
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            out.append(CHOSEONG[offset // 588])
+            out.append(JUNGSEONG[offset % 588 // 28])
+            out.append(JONGSEONG[offset % 28])
+        else:
+            out.append(COMPOUND_JAMO.get(ch, ch))
+    return "".join(out)
+
+
+def initials(text):
+    """완성형 한글은 초성만, 나머지 글자는 그대로"""
+    out = []
+    for ch in text.lower():
+        if ch.isspace():
+            continue
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            out.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _is_choseong_query(query):
+    letters = [ch for ch in query if not ch.isspace()]
+    return len(letters) >= 2 and all(ch in CHOSEONG for ch in letters)
+
+
+class IngredientPrefixIndex:
+    def __init__(self, rows):
+        """rows: (ingredient_id, ingredient_name, unit, ingredient_category) 튜플 iterable"""
+        self.items = {}
+        by_jamo, by_initials = [], []
+        for ingredient_id, name, unit, category in rows:
+            self.items[ingredient_id] = {"id": ingredient_id, "name": name, "unit": unit, "category": category}
+            by_jamo.append((decompose(name), name, ingredient_id))
+            by_initials.append((initials(name), name, ingredient_id))
+        by_jamo.sort()
+        by_initials.sort()
+        self.jamo_keys = [key for key, _, _ in by_jamo]
+        self.jamo_ids = [pk for _, _, pk in by_jamo]
+        self.initial_keys = [key for key, _, _ in by_initials]
+        self.initial_ids = [pk for _, _, pk in by_initials]
+
+    @classmethod
+    def from_db(cls):
+        return cls(Ingredient.objects.values_list("ingredient_id", "ingredient_name", "unit", "ingredient_category"))
+
+    def lookup(self, query, limit=10):
+        """접두사가 일치하는 재료를 (자모 키 순서로) 최대 limit개"""
+        if _is_choseong_query(query):
+            keys, ids, prefix = self.initial_keys, self.initial_ids, initials(query)
+        else:
+            keys, ids, prefix = self.jamo_keys, self.jamo_ids, decompose(query)
+        if not prefix:
+            return []
+
+        results = []
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and len(results) < limit and keys[i].startswith(prefix):
+            results.append(self.items[ids[i]])
+            i += 1
+        return results
+
+
+# ============================
+# 프로세스 단위 인덱스 캐시 (워커 간 무효화는 CacheVersion 의 DB 버전)
+# ============================
+_shared = SharedIndex("ingredient", IngredientPrefixIndex.from_db)
+
+
+def get_ingredient_index():
+    return _shared.get()
+
+
+def invalidate_ingredient_index(**kwargs):
+    """Ingredient 변경 시그널 수신 → 모든 워커가 다음 요청에서 재구성"""
+    _shared.invalidate()
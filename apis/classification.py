@@ -0,0 +1,152 @@
+"""
+GPT 이미지 분석 (냉장고 사진 → 재료 인식) + 결과 캐시
+
+같은 사진을 다시 올려도 LLM을 또 부르지 않도록
+sha256(원본 이미지 바이트) + 프롬프트 + 모델 파라미터를 키로 결과를 'classify' 캐시에 저장한다.
+이미지 축소/재인코딩(imaging.prepare_for_llm)은 캐시 miss일 때만 수행한다.
+TTL / 최대 항목 수는 settings.CACHES['classify'] 에서 설정한다.
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.utils.module_loading import import_string
+from langchain_core.messages import HumanMessage, SystemMessage
+
+SYSTEM_PROMPT = """
+    재료 분석 전문가 역할을 수행하세요.
+    """
+
+LLM_PARAMS = {
+    "model": "gpt-4o",
+    "temperature": 0,
+    "max_tokens": 1000,
+    "top_p": 0.3,
+    "frequency_penalty": 0.1,
+}
+
+HITS_KEY = "classify:hits"
+MISSES_KEY = "classify:misses"
+
+
+class LLMUnavailable(Exception):
+    pass
+
+
+# ============================
+# GPT 초기화
+# ============================
+_llms = {}
+
+
+def _build_llm():
+    backend = settings.CLASSIFY_LLM_BACKEND
+    if backend:
+        # 테스트/오프라인용 (ex. 'apis.llm_stub.StubLLM')
+        return import_string(backend)()
+
+    if not os.environ.get("OPENAI_API_KEY"):
+        print("⚠️ OPENAI_API_KEY 없음 → GPT 비활성화")
+        return None
+    try:
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(**LLM_PARAMS)
+    except Exception as e:
+        print(f"⚠️ ChatOpenAI 초기화 실패: {e}")
+        return None
+
+
+_llm_slots = {}
+_slots_lock = threading.Lock()
+
+
+def llm_slots():
+    """LLM 동시 호출 수 제한 (CLASSIFY_LLM_CONCURRENCY)"""
+    limit = settings.CLASSIFY_LLM_CONCURRENCY
+    with _slots_lock:
+        if limit not in _llm_slots:
+            _llm_slots[limit] = threading.BoundedSemaphore(limit)
+    return _llm_slots[limit]
+
+
+def get_llm():
+    backend = settings.CLASSIFY_LLM_BACKEND
+    if backend not in _llms:
+        _llms[backend] = _build_llm()
+    if _llms[backend] is None:
+        raise LLMUnavailable("GPT가 비활성화되어 있습니다.")
+    return _llms[backend]
+
+
+# ============================
+# 결과 캐시
+# ============================
+def upload_digest(uploaded_file):
+    """업로드 파일 원본의 sha256 (chunk 단위로 읽어서 전체를 메모리에 올리지 않음)"""
+    h = hashlib.sha256()
+    uploaded_file.seek(0)
+    for chunk in uploaded_file.chunks():
+        h.update(chunk)
+    uploaded_file.seek(0)
+    return h.hexdigest()
+
+
+def cache_key(digest):
+    h = hashlib.sha256(digest.encode("ascii"))
+    h.update(SYSTEM_PROMPT.encode("utf-8"))
+    h.update(json.dumps(LLM_PARAMS, sort_keys=True).encode("utf-8"))
+    h.update((settings.CLASSIFY_LLM_BACKEND or "").encode("utf-8"))
+    return f"classify:{h.hexdigest()}"
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def cache_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": hits / total if total else 0.0}
+
+
+def cached_result(digest):
+    """캐시된 분석 결과 (없으면 None, 적중은 hits 로 집계)"""
+    content = caches["classify"].get(cache_key(digest))
+    if content is not None:
+        _count(HITS_KEY)
+    return content
+
+
+def classify_image(digest, load_image):
+    """
+    이미지 분석 결과(LLM 응답 문자열)와 캐시 적중 여부 반환
+    load_image() → (bytes, media_type) 는 캐시 miss일 때만 호출
+    """
+    content = cached_result(digest)
+    if content is not None:
+        return content, True
+
+    _count(MISSES_KEY)
+    image_bytes, media_type = load_image()
+    base64_image_data = base64.b64encode(image_bytes).decode("utf-8")
+    image_data_uri = f"data:{media_type};base64,{base64_image_data}"
+
+    messages = [
+        SystemMessage(content=SYSTEM_PROMPT),
+        HumanMessage(content=[{"type": "image_url", "image_url": {"url": image_data_uri}}])
+    ]
+
+    llm = get_llm()
+    with llm_slots():
+        content = llm.invoke(messages).content
+    caches["classify"].set(cache_key(digest), content)
+    return content, False
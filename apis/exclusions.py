@@ -0,0 +1,33 @@
+"""
+사용자별 "먹으면 안 되는 재료" 집합 (알러지 + 비건)
+
+PersonAllergy → AllergyIngredient 조인을 요청마다 하지 않도록
+사용자별 금지 재료 id 집합을 Django 캐시에 저장해 둔다.
+레시피 쪽은 RecipeIndex 의 레시피별 재료 frozenset 과 isdisjoint 한 번으로 안전 여부를 판단한다.
+
+무효화: 키에 response_cache 와 같은 버전(CacheVersion, DB)을 넣으므로 모든 워커에서 바로 바뀜
+    - PersonAllergy / Person 변경         → 사용자 버전 증가
+    - AllergyIngredient / Allergy 변경    → 카탈로그 버전 증가
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from . import response_cache
+from .models import AllergyIngredient
+
+
+def forbidden_ingredients(person):
+    """person 이 먹으면 안 되는 ingredient_id frozenset"""
+    key = f"forbidden:{response_cache.version_tag(person.p_id)}:{person.p_id}"
+    forbidden = cache.get(key)
+    if forbidden is None:
+        condition = Q(allergy__personallergy__person=person)
+        if person.is_vegan:
+            # 비건은 VEGAN_ALLERGY_NAME 알러지 그룹에 묶인 재료(육류/해산물/유제품 등)를 제외
+            condition |= Q(allergy__allergy_name=settings.VEGAN_ALLERGY_NAME)
+        forbidden = frozenset(
+            AllergyIngredient.objects.filter(condition).values_list("ingredient_id", flat=True)
+        )
+        cache.set(key, forbidden, settings.EXCLUSION_CACHE_TIMEOUT)
+    return forbidden
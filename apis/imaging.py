@@ -0,0 +1,76 @@
+"""
+이미지 전처리
+
+휴대폰 원본 사진(수 MB)을 그대로 base64로 올리지 않고,
+비전 모델이 실제로 쓰는 해상도(짧은 변 768px / 긴 변 2048px 이하)로 줄여서
+JPEG로 다시 인코딩한 뒤 전송한다.
+"""
+import io
+import logging
+from collections import namedtuple
+
+from django.conf import settings
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+PreparedImage = namedtuple("PreparedImage", "data media_type original_bytes width height")
+
+
+class ImageTooLarge(ValueError):
+    """픽셀 수가 Image.MAX_IMAGE_PIXELS 의 2배를 넘는 이미지 (압축 폭탄)"""
+
+
+def _target_size(width, height):
+    scale = min(
+        1.0,
+        settings.CLASSIFY_IMAGE_SHORT_SIDE / min(width, height),
+        settings.CLASSIFY_IMAGE_LONG_SIDE / max(width, height),
+    )
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def prepare_for_llm(uploaded_file):
+    """
+    업로드 파일 → 축소 + JPEG 재인코딩된 PreparedImage
+    이미지로 열 수 없으면 원본 바이트를 그대로 반환, 압축 폭탄이면 ImageTooLarge
+    """
+    original_bytes = uploaded_file.size
+    uploaded_file.seek(0)
+    try:
+        with Image.open(uploaded_file) as img:
+            # JPEG는 디코딩 단계에서부터 1/2, 1/4, 1/8 크기로 읽어 메모리 절약
+            img.draft("RGB", _target_size(*img.size))
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail(_target_size(*img.size), Image.LANCZOS)
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+
+            out = io.BytesIO()
+            img.save(out, format="JPEG", quality=settings.CLASSIFY_IMAGE_QUALITY, optimize=True)
+            width, height = img.size
+    except Image.DecompressionBombError as e:
+        # OSError 가 아니므로 따로 잡음. 원본을 LLM 으로 보내지도 않는다
+        raise ImageTooLarge("이미지 해상도가 너무 큽니다.") from e
+    except (UnidentifiedImageError, OSError) as e:
+        logger.warning("이미지 전처리 실패 → 원본 전송: %s", e)
+        uploaded_file.seek(0)
+        return PreparedImage(
+            uploaded_file.read(), uploaded_file.content_type or "image/jpeg",
+            original_bytes, None, None
+        )
+
+    data = out.getvalue()
+    if len(data) >= original_bytes:
+        # 이미 작은 이미지면 원본이 더 작을 수 있음
+        uploaded_file.seek(0)
+        return PreparedImage(
+            uploaded_file.read(), uploaded_file.content_type or "image/jpeg",
+            original_bytes, width, height
+        )
+
+    logger.info(
+        "이미지 전처리: %d → %d bytes (%d bytes 절약, %dx%d)",
+        original_bytes, len(data), original_bytes - len(data), width, height
+    )
+    return PreparedImage(data, "image/jpeg", original_bytes, width, height)
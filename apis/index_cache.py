@@ -0,0 +1,54 @@
+"""
+프로세스 메모리 인덱스 캐시 (RecipeIndex / IngredientPrefixIndex)
+
+인덱스는 워커 프로세스마다 메모리에 만들어 두고,
+    - CacheVersion 테이블의 버전(index:<name>)을 조회할 때마다 비교해서
+      다른 워커가 무효화했으면 다시 만든다. (LocMemCache 는 워커마다 따로라 다른 워커의 증가가 보이지 않음)
+    - 무효화마다 세대(generation)를 올리고, 재구성 전에 읽은 세대가 그대로일 때만 결과를 설치한다.
+      → 재구성 중에 들어온 변경을 반영하지 못한 인덱스가 남지 않음
+버전은 쓰기와 같은 트랜잭션에서 올라가므로 다른 워커는 커밋된 데이터로만 다시 만든다.
+"""
+import threading
+
+from .models import CacheVersion
+
+
+class SharedIndex:
+    def __init__(self, name, build):
+        """
+        name: CacheVersion 범위 이름 (index:<name>)
+        build: 인덱스를 DB 에서 새로 만드는 함수
+        """
+        self.scope = f"index:{name}"
+        self.build = build
+        self._entry = None          # (버전, 인덱스)
+        self._generation = 0
+        self._build_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+
+    def _version(self):
+        [(version, _)] = CacheVersion.current(self.scope)
+        return version
+
+    def get(self):
+        version = self._version()
+        entry = self._entry
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        with self._build_lock:
+            entry = self._entry
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            generation = self._generation
+            index = self.build()
+            with self._state_lock:
+                if self._generation == generation:
+                    self._entry = (version, index)
+        return index
+
+    def invalidate(self):
+        """이 프로세스의 인덱스를 버리고 다른 워커에도 알림 (DB 버전 증가)"""
+        with self._state_lock:
+            self._generation += 1
+            self._entry = None
+        CacheVersion.bump(self.scope)
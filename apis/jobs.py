@@ -0,0 +1,129 @@
+"""
+이미지 분석 비동기 작업 큐
+
+업로드 요청은 job_id만 받아서 바로 반환하고, 이미지 전처리와 LLM 호출은
+프로세스 내 ThreadPoolExecutor(CLASSIFY_WORKERS개)에서 수행한다.
+분석 결과가 이미 캐시에 있으면 전처리 / 큐 없이 완료된 작업으로 바로 기록한다.
+대기 중인 작업이 CLASSIFY_MAX_PENDING개를 넘으면 QueueFull.
+    - 업로드는 메모리에 올리지 않고 임시 파일로 복사해서 넘기고, 작업이 끝나면 지운다.
+    - 작업 상태는 ClassifyJob 테이블에 두므로 어느 워커로 조회가 가도 보인다.
+      (CLASSIFY_JOB_TIMEOUT 이 지난 작업은 조회되지 않고 다음 등록 때 정리)
+"""
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import connections
+from django.utils import timezone
+
+from .classification import cached_result, classify_image
+from .imaging import prepare_for_llm
+from .models import ClassifyJob
+
+PENDING = ClassifyJob.PENDING
+RUNNING = ClassifyJob.RUNNING
+DONE = ClassifyJob.DONE
+ERROR = ClassifyJob.ERROR
+
+
+class QueueFull(Exception):
+    pass
+
+
+_executor = None
+_lock = threading.Lock()
+_pending = 0
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.CLASSIFY_WORKERS, thread_name_prefix="classify"
+            )
+    return _executor
+
+
+def _cutoff():
+    return timezone.now() - timedelta(seconds=settings.CLASSIFY_JOB_TIMEOUT)
+
+
+def _save(job_id, **state):
+    # 조회 후 쓰기(update_or_create) 대신 단일 UPDATE → SQLite 에서도 작업 스레드끼리 잠금 승격 충돌 없음
+    ClassifyJob.objects.filter(job_id=job_id).update(updated_at=timezone.now(), **state)
+
+
+def get_job(job_id):
+    """작업 상태 dict (없거나 보관 시간이 지났으면 None)"""
+    job = ClassifyJob.objects.filter(job_id=job_id, updated_at__gte=_cutoff()).first()
+    return job.as_dict() if job is not None else None
+
+
+def _spool(uploaded_file):
+    """응답이 끝나면 업로드 파일이 닫히므로 임시 파일로 복사 (메모리에 통째로 올리지 않음) → 경로"""
+    with tempfile.NamedTemporaryFile(prefix="classify-", delete=False) as tmp:
+        for chunk in uploaded_file.chunks():
+            tmp.write(chunk)
+    return tmp.name
+
+
+def submit(digest, uploaded_file):
+    """분석 작업 등록 후 (job_id, 상태) 반환"""
+    global _pending
+    job_id = uuid.uuid4().hex
+    ClassifyJob.objects.filter(updated_at__lt=_cutoff()).delete()
+    content = cached_result(digest)
+    if content is not None:
+        ClassifyJob.objects.create(job_id=job_id, status=DONE, result=content, cached=True)
+        return job_id, DONE
+
+    with _lock:
+        if _pending >= settings.CLASSIFY_MAX_PENDING:
+            raise QueueFull("분석 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.")
+        _pending += 1
+
+    path = None
+    try:
+        ClassifyJob.objects.create(job_id=job_id, status=PENDING)
+        path = _spool(uploaded_file)
+        _get_executor().submit(
+            _run, job_id, digest, path, uploaded_file.name, uploaded_file.content_type
+        )
+    except Exception:
+        if path is not None:
+            os.unlink(path)
+        _finish()
+        raise
+    return job_id, PENDING
+
+
+def _finish():
+    global _pending
+    with _lock:
+        _pending -= 1
+
+
+def _run(job_id, digest, path, name, content_type):
+    def load_image():
+        with open(path, "rb") as f:
+            upload = UploadedFile(f, name, content_type, os.path.getsize(path))
+            prepared = prepare_for_llm(upload)
+        return prepared.data, prepared.media_type
+
+    try:
+        _save(job_id, status=RUNNING)
+        content, cached = classify_image(digest, load_image)
+        _save(job_id, status=DONE, result=content, cached=cached)
+    except Exception as e:
+        _save(job_id, status=ERROR, error=str(e))
+    finally:
+        os.unlink(path)
+        _finish()
+        # 요청 밖의 작업 스레드라 request_finished 로 연결이 닫히지 않음
+        connections.close_all()
@@ -0,0 +1,49 @@
+"""
+테스트/오프라인 개발용 가짜 LLM
+
+settings.CLASSIFY_LLM_BACKEND = 'apis.llm_stub.StubLLM' 로 지정하면
+OpenAI 호출 없이 고정된 재료 목록 JSON을 돌려준다.
+CLASSIFY_STUB_DELAY(초)를 주면 실제 API처럼 응답이 늦어진다.
+테스트는 시간 대신 StubLLM.gate(threading.Event)로 응답을 막아 두고,
+StubLLM.entered 세마포어로 호출이 시작됐는지 기다린다.
+"""
+import json
+import threading
+import time
+
+from django.conf import settings
+from langchain_core.messages import AIMessage
+
+
+class StubLLM:
+    calls = 0
+    active = 0
+    max_active = 0
+    gate = None                         # set() 될 때까지 응답 대기 (None 이면 바로 응답)
+    entered = threading.Semaphore(0)    # 호출이 시작될 때마다 release
+    GATE_TIMEOUT = 10                   # 테스트가 gate 를 열지 않고 끝나도 스레드가 남지 않도록
+    _lock = threading.Lock()
+
+    @classmethod
+    def reset(cls):
+        cls.calls = cls.active = cls.max_active = 0
+        cls.gate = None
+        cls.entered = threading.Semaphore(0)
+
+    def invoke(self, messages):
+        cls = type(self)
+        with cls._lock:
+            cls.calls += 1
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        cls.entered.release()
+        try:
+            if cls.gate is not None:
+                cls.gate.wait(cls.GATE_TIMEOUT)
+            time.sleep(getattr(settings, "CLASSIFY_STUB_DELAY", 0))
+            return AIMessage(content=json.dumps(
+                {"ingredients": [{"name": "계란", "quantity": 1}]}, ensure_ascii=False
+            ))
+        finally:
+            with cls._lock:
+                cls.active -= 1
@@ -0,0 +1,65 @@
+"""
+기존 재료/레시피 사진의 썸네일 일괄 생성
+
+    python manage.py make_thumbnails
+    python manage.py make_thumbnails --size sm --workers 8
+    python manage.py make_thumbnails --force      # 이미 있는 썸네일도 다시 생성
+
+새로 올린 사진은 add_recipe 가, 빠진 썸네일은 첫 요청이 만들어 주므로
+배포 직후나 THUMBNAIL_SIZES / THUMBNAIL_QUALITY 를 바꾼 뒤(--force)에 실행한다.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apis import thumbnails
+from apis.models import Ingredient, Recipe
+
+
+class Command(BaseCommand):
+    help = "Ingredient/Recipe 이미지의 크기별 썸네일을 원본 옆 thumbs/<size>/ 에 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', nargs='+', help="만들 크기 (기본: 전체)")
+        parser.add_argument('--workers', type=int, default=4, help="동시에 처리할 이미지 수")
+        parser.add_argument('--force', action='store_true', help="최신 썸네일이 있어도 다시 생성")
+
+    def handle(self, *args, **options):
+        sizes = options['size'] or list(settings.THUMBNAIL_SIZES)
+        unknown = [s for s in sizes if s not in settings.THUMBNAIL_SIZES]
+        if unknown:
+            raise CommandError(f"--size 는 {', '.join(settings.THUMBNAIL_SIZES)} 중에서 선택해야 합니다.")
+        if options['workers'] < 1:
+            raise CommandError("--workers 는 1 이상이어야 합니다.")
+
+        images = set(
+            Ingredient.objects.exclude(ingredient_img__isnull=True).exclude(ingredient_img="")
+            .values_list('ingredient_img', flat=True)
+        )
+        images.update(
+            Recipe.objects.exclude(recipe_img__isnull=True).exclude(recipe_img="")
+            .values_list('recipe_img', flat=True)
+        )
+
+        def make(image):
+            # Pillow 는 디코딩/리사이즈 중 GIL 을 풀어 주므로 스레드로 병렬 처리
+            failed = []
+            for size in sizes:
+                try:
+                    thumbnails.ensure_thumbnail(image, size, force=options['force'])
+                except (thumbnails.ThumbnailError, OSError) as e:
+                    failed.append(f"{image} ({size}): {e}")
+            return failed
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            failures = [f for failed in pool.map(make, sorted(images)) for f in failed]
+        elapsed = time.perf_counter() - start
+
+        for failure in failures:
+            self.stderr.write(f"⚠️ {failure}")
+        self.stdout.write(
+            f"✅ thumbnails: 이미지 {len(images)}개 × 크기 {len(sizes)}개, 실패 {len(failures)}건 ({elapsed:.2f}s)"
+        )
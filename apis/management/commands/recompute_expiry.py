@@ -0,0 +1,42 @@
+"""
+냉장고 유통기한 일괄 재계산 (expiry_date = added_date + shelf_life)
+
+    python manage.py recompute_expiry
+    python manage.py recompute_expiry --ingredient 두부 우유
+
+관리자 화면에서 shelf_life를 바꾸면 Ingredient.save()가 자동으로 재계산하므로,
+CSV/SQL 로 shelf_life를 직접 고친 뒤에만 실행하면 된다.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apis import response_cache
+from apis.models import Fridge, Ingredient
+
+
+class Command(BaseCommand):
+    help = "재료 shelf_life 기준으로 냉장고 expiry_date를 재료당 UPDATE 1번으로 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ingredient', nargs='+', help="재계산할 재료 이름 (기본: 전체)")
+
+    def handle(self, *args, **options):
+        ingredient_ids = None
+        if options['ingredient']:
+            found = dict(
+                Ingredient.objects.filter(ingredient_name__in=options['ingredient'])
+                .values_list('ingredient_name', 'pk')
+            )
+            missing = set(options['ingredient']) - set(found)
+            if missing:
+                raise CommandError(f"존재하지 않는 재료: {', '.join(sorted(missing))}")
+            ingredient_ids = list(found.values())
+
+        start = time.perf_counter()
+        count = Fridge.objects.recompute_expiry(ingredient_ids)
+        elapsed = time.perf_counter() - start
+
+        # QuerySet.update 는 시그널을 보내지 않으므로 응답 캐시 직접 무효화
+        response_cache.bump_all_users()
+        self.stdout.write(f"✅ expiry_date: {count}건 재계산 ({elapsed:.2f}s)")
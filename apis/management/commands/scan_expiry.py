@@ -0,0 +1,36 @@
+"""
+유통기한 임박 재료 스캔 (워터마크 이후 구간만 조회)
+
+    python manage.py scan_expiry
+    python manage.py scan_expiry --days 7 --batch-size 10000
+
+cron 등으로 주기 실행한다. 결과는 ExpiryNotice 테이블에 저장되어 웹 프로세스에서 get_digest 로 읽는다.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apis.expiry import scan_expiry
+
+
+class Command(BaseCommand):
+    help = "오늘 + N일 안에 만료되는 냉장고 재료를 사용자별 다이제스트로 모읍니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.EXPIRY_SCAN_DAYS)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if options['days'] < 0 or options['batch_size'] < 1:
+            raise CommandError("--days 는 0 이상, --batch-size 는 1 이상이어야 합니다.")
+
+        start = time.perf_counter()
+        digests = scan_expiry(days=options['days'], batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - start
+
+        count = sum(len(items) for items in digests.values())
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(
+            f"✅ expiry: {count}건 / 사용자 {len(digests)}명 ({elapsed:.2f}s, {rate:,.0f} rows/s)"
+        )
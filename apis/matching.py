@@ -0,0 +1,113 @@
+"""
+냉장고 재료 ↔ 레시피 재료 매칭 엔진
+
+RecipeIngredient 전체를 한 번 읽어서
+    ingredient_id → [(recipe_id, r_quantity), ...]  (역색인)
+    recipe_id     → [(ingredient_id, r_quantity), ...]
+    recipe_id     → 재료 id frozenset (알러지/비건 필터용)
+를 메모리에 만들어 두고, 냉장고에 있는 재료의 posting list만 훑어서
+레시피별 보유/부족 재료를 계산한다. 비용은 카탈로그 크기가 아니라
+(냉장고 재료 수 × 재료당 레시피 수)에 비례한다.
+"""
+import heapq
+from collections import defaultdict
+
+from .index_cache import SharedIndex
+from .models import Recipe, RecipeIngredient
+
+
+class RecipeIndex:
+    def __init__(self, rows, recipe_ids=()):
+        """
+        rows: (recipe_id, ingredient_id, r_quantity) 튜플 iterable
+        recipe_ids: 재료가 없는 레시피까지 포함한 전체 레시피 id (is_safe 에서 '알려진 레시피' 판정용)
+        """
+        self.postings = defaultdict(list)
+        self.requirements = defaultdict(list)
+        for recipe_id, ingredient_id, r_quantity in rows:
+            r_quantity = float(r_quantity)
+            self.postings[ingredient_id].append((recipe_id, r_quantity))
+            self.requirements[recipe_id].append((ingredient_id, r_quantity))
+        # 재료 id 크기와 무관하게 레시피 재료 수만큼만 메모리 사용
+        self.ingredient_sets = {
+            recipe_id: frozenset(i for i, _ in reqs)
+            for recipe_id, reqs in self.requirements.items()
+        }
+        for recipe_id in recipe_ids:
+            self.ingredient_sets.setdefault(recipe_id, frozenset())
+
+    @classmethod
+    def from_db(cls):
+        return cls(
+            RecipeIngredient.objects.values_list("recipe_id", "ingredient_id", "r_quantity"),
+            Recipe.objects.values_list("recipe_id", flat=True),
+        )
+
+    def is_safe(self, recipe_id, forbidden):
+        """
+        금지 재료 id 집합(forbidden)과 겹치는 재료가 없으면 True
+        인덱스를 만든 뒤 추가된(스냅샷에 없는) 레시피는 재료를 모르므로 False (fail closed)
+        """
+        ingredients = self.ingredient_sets.get(recipe_id)
+        return ingredients is not None and forbidden.isdisjoint(ingredients)
+
+    def match(self, fridge, limit=20, forbidden=frozenset()):
+        """
+        fridge: {ingredient_id: 보유 수량}
+        보유 재료 비율(coverage) 내림차순 → 부족 재료 수 → 수량 부족분 순으로 상위 limit개 반환
+        forbidden(금지 재료 id 집합)과 겹치는 레시피는 제외
+        """
+        present = defaultdict(int)
+        shortfall = defaultdict(float)
+        for ingredient_id, have in fridge.items():
+            for recipe_id, need in self.postings.get(ingredient_id, ()):
+                present[recipe_id] += 1
+                if have < need:
+                    shortfall[recipe_id] += need - have
+
+        def rank_key(recipe_id):
+            total = len(self.requirements[recipe_id])
+            return (-present[recipe_id] / total, total - present[recipe_id],
+                    shortfall[recipe_id], recipe_id)
+
+        candidates = present
+        if forbidden:
+            candidates = [r for r in present if self.is_safe(r, forbidden)]
+
+        top = heapq.nsmallest(limit, candidates, key=rank_key)
+        return [self._result(recipe_id, fridge) for recipe_id in top]
+
+    def _result(self, recipe_id, fridge):
+        have_ids, missing_ids, short = [], [], []
+        for ingredient_id, need in self.requirements[recipe_id]:
+            have = fridge.get(ingredient_id)
+            if have is None:
+                missing_ids.append(ingredient_id)
+                continue
+            have_ids.append(ingredient_id)
+            if have < need:
+                short.append((ingredient_id, need - have))
+
+        total = len(self.requirements[recipe_id])
+        return {
+            "recipe_id": recipe_id,
+            "coverage": len(have_ids) / total,
+            "present": have_ids,
+            "missing": missing_ids,
+            "shortfall": short,
+        }
+
+
+# ============================
+# 프로세스 단위 인덱스 캐시 (워커 간 무효화는 CacheVersion 의 DB 버전)
+# ============================
+_shared = SharedIndex("recipe", RecipeIndex.from_db)
+
+
+def get_recipe_index():
+    return _shared.get()
+
+
+def invalidate_recipe_index(**kwargs):
+    """RecipeIngredient 변경 시그널 수신 → 모든 워커가 다음 요청에서 재구성"""
+    _shared.invalidate()
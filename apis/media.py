@@ -0,0 +1,219 @@
+"""
+미디어 파일 저장 / 서빙
+
+업로드는 내용 sha256 으로 이름을 정한다 → 같은 사진은 한 파일만 저장되고,
+URL 이 가리키는 바이트가 바뀌지 않으므로 1년 + immutable 로 캐시한다.
+    recipes/3f/3fa9...c1.jpg   (앞 2글자로 디렉터리를 나눠 한 디렉터리에 파일이 몰리지 않게)
+load_data 로 들어온 photo/... 같은 기존 파일은 짧게 캐시하고 ETag / Last-Modified 로 재검증한다.
+MEDIA_ROOT 에는 시드 CSV 도 있으므로 MEDIA_SERVE_DIRS 아래의 이미지 확장자 파일만 내보내고 나머지는 404.
+
+서빙 방식 (MEDIA_SERVE_MODE)
+    "django"      FileResponse. 전체 파일은 WSGI 서버의 wsgi.file_wrapper(sendfile)가 보내고
+                  Range(단일 구간) / 조건부 GET 은 여기서 처리
+    "x-accel"     nginx 가 전송. X-Accel-Redirect: MEDIA_ACCEL_PREFIX + 경로
+                      location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+    "x-sendfile"  Apache mod_xsendfile / lighttpd. X-Sendfile: 절대 경로
+"""
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, Http404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from django.utils._os import safe_join
+from django.views.decorators.http import require_safe
+
+from .classification import upload_digest
+from .uploads import SNIFF_BYTES, sniff_content_type
+
+# 서빙 / 업로드 이름에 허용하는 이미지 확장자
+UPLOAD_EXTENSIONS = {".jpg", ".jpeg", ".jfif", ".png", ".webp", ".gif"}
+# 파일 내용으로 판별한 형식 → 저장 확장자 (이름의 확장자보다 우선)
+EXTENSION_BY_TYPE = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/gif": ".gif"}
+# mimetypes 가 모르는 확장자
+EXTRA_TYPES = {".jfif": "image/jpeg", ".webp": "image/webp"}
+
+_CONTENT_ADDRESSED = re.compile(r"(?:^|/)([0-9a-f]{2})/(\1[0-9a-f]{62})(?:\.[a-z0-9]+)?$")
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+# ============================
+# 저장 (내용 주소 이름 + 중복 제거)
+# ============================
+def _upload_extension(uploaded_file):
+    uploaded_file.seek(0)
+    head = uploaded_file.read(SNIFF_BYTES)
+    uploaded_file.seek(0)
+    ext = EXTENSION_BY_TYPE.get(sniff_content_type(head))
+    if ext is None:
+        ext = os.path.splitext(uploaded_file.name or "")[1].lower()
+    return ext if ext in UPLOAD_EXTENSIONS else ""
+
+
+def content_name(uploaded_file, directory, digest=None):
+    digest = digest or upload_digest(uploaded_file)
+    return f"{directory}/{digest[:2]}/{digest}{_upload_extension(uploaded_file)}"
+
+
+def store_upload(uploaded_file, directory, digest=None):
+    """
+    업로드 파일을 <directory>/<sha256 앞 2자>/<sha256><확장자> 로 저장하고 이름 반환
+    digest 를 주면 (업로드 중 계산한 해시) 파일을 다시 읽지 않음
+    """
+    name = content_name(uploaded_file, directory, digest)
+    if not default_storage.exists(name):
+        saved = default_storage.save(name, uploaded_file)
+        if saved != name:
+            # 같은 파일이 동시에 올라와 storage 가 다른 이름을 붙임 → 먼저 저장된 쪽 사용
+            default_storage.delete(saved)
+    return name
+
+
+def content_digest(path):
+    """내용 주소 경로면 sha256, 아니면 None"""
+    match = _CONTENT_ADDRESSED.search(path)
+    return match.group(2) if match else None
+
+
+# ============================
+# 서빙
+# ============================
+class _FileRange:
+    """파일의 [start, start + length) 구간만 읽는 file-like (Range 응답용)"""
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        data = self.file.read(self.remaining if size < 0 else min(size, self.remaining))
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _content_type(full_path):
+    return (
+        mimetypes.guess_type(full_path)[0]
+        or EXTRA_TYPES.get(os.path.splitext(full_path)[1].lower())
+        or "application/octet-stream"
+    )
+
+
+def _byte_range(request, size, etag, last_modified):
+    """
+    Range 헤더 → (start, end) 포함 구간. 없거나 무시할 때는 None
+    만족할 수 없는 구간이면 ValueError. 여러 구간 요청은 전체 응답(200)으로 처리
+    """
+    header = request.META.get("HTTP_RANGE")
+    if not header:
+        return None
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if if_range and if_range != etag and parse_http_date_safe(if_range) != last_modified:
+        return None
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or (last and int(last) < start):
+            raise ValueError(header)
+    else:
+        if int(last) == 0:
+            raise ValueError(header)
+        start, end = max(0, size - int(last)), size - 1
+    return start, end
+
+
+def _file_response(request, path, full_path, st, etag):
+    content_type = _content_type(full_path)
+    mode = settings.MEDIA_SERVE_MODE
+    if mode == "x-accel":
+        # 바이트 / Range 는 nginx 가 처리
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX + quote(path)
+        return response
+    if mode == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = full_path
+        return response
+
+    try:
+        byte_range = _byte_range(request, st.st_size, etag, int(st.st_mtime))
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{st.st_size}"
+        return response
+
+    if byte_range is None:
+        # 실제 파일 객체를 넘겨야 WSGI 서버가 sendfile 로 보냄
+        return FileResponse(open(full_path, "rb"), content_type=content_type)
+
+    start, end = byte_range
+    length = end - start + 1
+    response = FileResponse(_FileRange(open(full_path, "rb"), start, length), content_type=content_type)
+    response.status_code = 206
+    response["Content-Length"] = length
+    response["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+    return response
+
+
+def is_servable(full_path):
+    """MEDIA_SERVE_DIRS 아래의 이미지 확장자 파일만 (시드 CSV 등 MEDIA_ROOT 의 다른 파일은 제외)"""
+    relative = os.path.relpath(full_path, settings.MEDIA_ROOT).replace(os.sep, "/")
+    return (
+        relative.startswith(settings.MEDIA_SERVE_DIRS)
+        and os.path.splitext(relative)[1].lower() in UPLOAD_EXTENSIONS
+    )
+
+
+@require_safe
+def serve(request, path, max_age=None):
+    """
+    MEDIA_ROOT 기준 path 의 파일 응답
+    내용 주소 파일은 immutable, 그 외는 max_age (기본 MEDIA_CACHE_MAX_AGE) 후 재검증
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        st = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404("파일이 없습니다.")
+    if not stat.S_ISREG(st.st_mode) or not is_servable(full_path):
+        raise Http404("파일이 없습니다.")
+
+    digest = content_digest(path)
+    etag = f'"{digest}"' if digest else f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    last_modified = int(st.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _file_response(request, path, full_path, st, etag)
+        if response.status_code == 416:
+            return response
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Accept-Ranges"] = "bytes"
+    # 업로드 파일을 이미지 외 타입으로 해석하지 않도록
+    response["X-Content-Type-Options"] = "nosniff"
+    if digest:
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(
+            response, public=True,
+            max_age=settings.MEDIA_CACHE_MAX_AGE if max_age is None else max_age
+        )
+    return response
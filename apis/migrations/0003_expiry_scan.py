@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0002_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpiryWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_expiry_date', models.DateField(blank=True, null=True)),
+                ('last_fridge_id', models.IntegerField(default=0)),
+                ('max_fridge_id', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='fridge',
+            index=models.Index(fields=['expiry_date', 'fridge_id'], name='fridge_expiry_idx'),
+        ),
+    ]
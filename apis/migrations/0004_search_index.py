@@ -0,0 +1,74 @@
+# 레시피/재료 2-gram 검색 색인 (SQLite FTS5). 다른 DB 에서는 아무것도 하지 않음
+
+import operator
+import re
+from collections import defaultdict
+
+from django.db import migrations
+
+# apis.search 를 import 하지 않도록 마이그레이션 시점의 값 / 함수를 복사해 둠
+# (이후 search.py 가 바뀌어도 이 마이그레이션의 결과는 그대로)
+RECIPE_TABLE = "apis_recipe_search"
+INGREDIENT_TABLE = "apis_ingredient_search"
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def ngram_doc(*texts):
+    """단어별 글자 2-gram (한 글자 단어는 그대로)을 공백으로 이은 문서"""
+    tokens = []
+    for word in _WORD.findall(" ".join(filter(None, texts)).lower()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens += map(operator.add, word, word[1:])
+    return " ".join(tokens)
+
+
+def create_search_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Recipe = apps.get_model('apis', 'Recipe')
+    RecipeIngredient = apps.get_model('apis', 'RecipeIngredient')
+    Ingredient = apps.get_model('apis', 'Ingredient')
+
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {RECIPE_TABLE} USING fts5(name, ingredients, description, tokenize='unicode61')"
+    )
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {INGREDIENT_TABLE} USING fts5(name, tokenize='unicode61')"
+    )
+
+    ingredient_names = defaultdict(list)
+    for recipe_id, name in RecipeIngredient.objects.values_list('recipe_id', 'ingredient__ingredient_name'):
+        ingredient_names[recipe_id].append(name)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {RECIPE_TABLE} (rowid, name, ingredients, description) VALUES (%s, %s, %s, %s)",
+            [
+                (pk, ngram_doc(name), ngram_doc(*ingredient_names[pk]), ngram_doc(description))
+                for pk, name, description in Recipe.objects.values_list('pk', 'recipe_name', 'description')
+            ],
+        )
+        cursor.executemany(
+            f"INSERT INTO {INGREDIENT_TABLE} (rowid, name) VALUES (%s, %s)",
+            [(pk, ngram_doc(name)) for pk, name in Ingredient.objects.values_list('pk', 'ingredient_name')],
+        )
+
+
+def drop_search_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {RECIPE_TABLE}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {INGREDIENT_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0003_expiry_scan'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_tables, drop_search_tables),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0004_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='shopping',
+            index=models.Index(fields=['purchased_date', 'shopping_id'], name='shopping_purchased_idx'),
+        ),
+    ]
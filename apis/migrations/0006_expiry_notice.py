@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0005_shopping_purchased_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpiryNotice',
+            fields=[
+                ('fridge', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='apis.fridge')),
+                ('f_quantity', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('expiry_date', models.DateField()),
+                ('scanned_at', models.DateTimeField()),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='apis.ingredient')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='apis.person')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['person', 'expiry_date'], name='expiry_notice_person_idx'), models.Index(fields=['scanned_at'], name='expiry_notice_scanned_idx')],
+            },
+        ),
+    ]
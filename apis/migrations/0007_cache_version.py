@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:16
+
+import apis.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0006_expiry_notice'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheVersion',
+            fields=[
+                ('scope', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=apis.models._new_cache_version)),
+                ('written_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0007_cache_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassifyJob',
+            fields=[
+                ('job_id', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('status', models.CharField(default='pending', max_length=10)),
+                ('result', models.TextField(blank=True, null=True)),
+                ('cached', models.BooleanField(default=False)),
+                ('error', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['updated_at'], name='classify_job_updated_idx')],
+            },
+        ),
+    ]
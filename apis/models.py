@@ -1,11 +1,17 @@
-from django.db import models
+import time
+from datetime import timedelta
+
+from django.db import connection, models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Cast, Greatest
+from django.utils import timezone
 
 # ------------------------------
 # 1. 사용자 (Person)
 # ------------------------------
 class Person(models.Model):
     p_id = models.AutoField(primary_key=True)
-    user_id = models.CharField(max_length=50)
+    user_id = models.CharField(max_length=50, unique=True)
     name = models.CharField(max_length=50)
     password_2 = models.CharField(max_length=100)
     address = models.CharField(max_length=200)
@@ -43,7 +49,7 @@ class PersonAllergy(models.Model):
 # ------------------------------
 class Ingredient(models.Model):
     ingredient_id = models.AutoField(primary_key=True)
-    ingredient_name = models.CharField(max_length=100)
+    ingredient_name = models.CharField(max_length=100, unique=True)
     ingredient_img = models.CharField(max_length=200, blank=True, null=True)
     unit = models.CharField(max_length=20)
     ingredient_category = models.CharField(max_length=50)
@@ -52,6 +58,20 @@ class Ingredient(models.Model):
     # 🆕 추가: 유지기간 (일)
     shelf_life = models.IntegerField(default=3)  # ex) 3일, 5일, 7일 등
 
+    def save(self, *args, **kwargs):
+        """shelf_life가 바뀌면 이 재료의 냉장고 expiry_date를 UPDATE 1번으로 재계산"""
+        update_fields = kwargs.get('update_fields')
+        old_shelf_life = None
+        if self.pk is not None and (update_fields is None or 'shelf_life' in update_fields):
+            old_shelf_life = (
+                Ingredient.objects.filter(pk=self.pk).values_list('shelf_life', flat=True).first()
+            )
+        # 재료 행과 냉장고 expiry_date 를 한 트랜잭션으로 (응답 캐시 버전은 커밋 후에도 올림, signals.py)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if old_shelf_life is not None and old_shelf_life != self.shelf_life:
+                Fridge.objects.recompute_expiry([self.pk])
+
     def __str__(self):
         return self.ingredient_name
 
@@ -72,7 +92,72 @@ class AllergyIngredient(models.Model):
 # ------------------------------
 # 6. 냉장고 (Fridge)
 # ------------------------------
-from datetime import timedelta
+
+
+def _ingredient_values(objs, *fields):
+    """objs의 ingredient_id → (fields...) 를 IN 쿼리 1번으로 조회"""
+    ids = {obj.ingredient_id for obj in objs}
+    return {
+        row[0]: row[1:]
+        for row in Ingredient.objects.filter(pk__in=ids).values_list('pk', *fields)
+    }
+
+
+def _set_expiry(items, shelf_lives):
+    """Fridge.save()와 같은 규칙: added_date + shelf_life (shelf_lives: ingredient_id → 일수)"""
+    for item in items:
+        shelf_life = shelf_lives[item.ingredient_id]
+        if item.added_date and shelf_life:
+            item.expiry_date = item.added_date + timedelta(days=shelf_life)
+
+
+class FridgeManager(models.Manager):
+    def bulk_ingest(self, objs, batch_size=1000):
+        """
+        Fridge.save()와 같은 결과(expiry_date 자동 계산)를 내는 bulk_create
+        재료 shelf_life는 한 번에 조회
+        """
+        objs = list(objs)
+        values = _ingredient_values(objs, 'shelf_life')
+        _set_expiry(objs, {pk: v[0] for pk, v in values.items()})
+        return self.bulk_create(objs, batch_size=batch_size)
+
+    def bulk_change(self, objs, batch_size=1000):
+        """
+        f_quantity / added_date 변경을 bulk_update 1번으로 반영
+        expiry_date는 Fridge.save()와 같은 규칙으로 다시 계산
+        """
+        objs = list(objs)
+        values = _ingredient_values(objs, 'shelf_life')
+        _set_expiry(objs, {pk: v[0] for pk, v in values.items()})
+        with transaction.atomic():
+            updated = self.bulk_update(objs, ['f_quantity', 'added_date', 'expiry_date'], batch_size=batch_size)
+            ExpiryWatermark.rewind(min((o.expiry_date for o in objs if o.expiry_date), default=None))
+        return updated
+
+    def recompute_expiry(self, ingredient_ids=None):
+        """
+        expiry_date = added_date + shelf_life 를 재료당 UPDATE 1번으로 재계산 (Python 루프/save() 없음)
+        ingredient_ids가 None이면 전체 재료. save()와 같이 shelf_life가 0이면 건드리지 않음
+        QuerySet.update는 시그널을 보내지 않으므로 응답 캐시는 호출하는 쪽에서 무효화
+        """
+        ingredients = Ingredient.objects.filter(shelf_life__gt=0)
+        if ingredient_ids is not None:
+            ingredients = ingredients.filter(pk__in=ingredient_ids)
+
+        updated, ids = 0, []
+        with transaction.atomic():
+            for pk, shelf_life in ingredients.values_list('pk', 'shelf_life'):
+                ids.append(pk)
+                updated += self.filter(ingredient_id=pk, added_date__isnull=False).update(
+                    expiry_date=Cast(F('added_date') + timedelta(days=shelf_life), models.DateField())
+                )
+            if updated:
+                ExpiryWatermark.rewind(
+                    self.filter(ingredient_id__in=ids).aggregate(m=models.Min('expiry_date'))['m']
+                )
+        return updated
+
 
 class Fridge(models.Model):
     fridge_id = models.AutoField(primary_key=True)
@@ -86,12 +171,25 @@ class Fridge(models.Model):
     # 🆕 수정: 유통기한 (자동 계산된 값)
     expiry_date = models.DateField(null=True, blank=True)
 
+    objects = FridgeManager()
+
+    class Meta:
+        indexes = [
+            # 사용자별 냉장고 조회 / 유통기한 임박 조회
+            models.Index(fields=['person', 'expiry_date'], name='fridge_person_expiry_idx'),
+            # 전체 사용자 유통기한 스캔 (expiry_date, fridge_id keyset)
+            models.Index(fields=['expiry_date', 'fridge_id'], name='fridge_expiry_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         """added_date + ingredient.shelf_life로 expiry_date 자동 계산"""
         if self.added_date and self.ingredient.shelf_life:
             self.expiry_date = self.added_date + timedelta(days=self.ingredient.shelf_life)
+        adding = self._state.adding
         super().save(*args, **kwargs)
+        # 새 행은 scan_expiry 가 max_fridge_id 로 찾지만, 기존 행의 만료일 변경은 워터마크를 되감아야 보임
+        if not adding:
+            ExpiryWatermark.rewind(self.expiry_date)
 
     def __str__(self):
         return f"{self.person.name} - {self.ingredient.ingredient_name}"
@@ -103,7 +201,8 @@ class Fridge(models.Model):
 # ------------------------------
 class Recipe(models.Model):
     recipe_id = models.AutoField(primary_key=True)
-    recipe_name = models.CharField(max_length=100)
+    # 사용자가 같은 이름으로 레시피를 올릴 수 있으므로 unique 대신 인덱스만
+    recipe_name = models.CharField(max_length=100, db_index=True)
     description = models.TextField(blank=True, null=True)
     recipe_img = models.CharField(max_length=200, blank=True, null=True)
     recipe_category = models.CharField(max_length=50, blank=True, null=True)
@@ -134,6 +233,46 @@ class Like(models.Model):
     class Meta:
         unique_together = ('recipe', 'person')
 
+class ShoppingManager(models.Manager):
+    def bulk_ingest(self, objs, batch_size=1000):
+        """
+        Shopping.save()와 같은 결과를 내는 bulk 삽입
+            - unit_price = ingredient.price, price = unit_price * quantity
+            - added_to_fridge=False 이면 Fridge 행 생성 후 fridge_record 연결
+        구매 1건당 INSERT + INSERT + UPDATE 대신 테이블당 bulk INSERT 1번
+        """
+        objs = list(objs)
+        values = _ingredient_values(objs, 'price', 'shelf_life')
+        for obj in objs:
+            obj.unit_price = values[obj.ingredient_id][0]
+            obj.price = obj.unit_price * obj.quantity
+
+        with transaction.atomic():
+            pending = [obj for obj in objs if not obj.added_to_fridge]
+            fridge_items = [
+                Fridge(
+                    person_id=obj.person_id,
+                    ingredient_id=obj.ingredient_id,
+                    f_quantity=obj.quantity,
+                    added_date=obj.purchased_date,
+                )
+                for obj in pending
+            ]
+            if connection.features.can_return_rows_from_bulk_insert:
+                _set_expiry(fridge_items, {pk: v[1] for pk, v in values.items()})
+                Fridge.objects.bulk_create(fridge_items, batch_size=batch_size)
+            else:
+                # pk를 돌려받지 못하는 DB(MySQL)는 Fridge만 개별 INSERT
+                for item in fridge_items:
+                    item.save()
+
+            for obj, item in zip(pending, fridge_items):
+                obj.fridge_record = item
+                obj.added_to_fridge = True
+
+            return self.bulk_create(objs, batch_size=batch_size)
+
+
 class Shopping(models.Model):
     shopping_id = models.AutoField(primary_key=True)
     person = models.ForeignKey(Person, on_delete=models.CASCADE)
@@ -153,6 +292,14 @@ class Shopping(models.Model):
         blank=True
     )
 
+    objects = ShoppingManager()
+
+    class Meta:
+        indexes = [
+            # 관리자 목록 정렬 (-purchased_date, -shopping_id)
+            models.Index(fields=['purchased_date', 'shopping_id'], name='shopping_purchased_idx'),
+        ]
+
     def save(self, *args, **kwargs):
 
         # 🔥 INSERT 되기 전에 1회만 계산
@@ -180,3 +327,149 @@ class Shopping(models.Model):
     def __str__(self):
         return f"{self.person.name}의 구매: {self.ingredient.ingredient_name}"
 
+
+# ------------------------------
+# 11. 유통기한 스캔 워터마크 (ExpiryWatermark)
+# ------------------------------
+class ExpiryWatermark(models.Model):
+    """scan_expiry 가 어디까지 처리했는지 기록 (다음 실행은 이 지점 이후만 조회)"""
+    name = models.CharField(max_length=50, unique=True)
+    # (expiry_date, fridge_id) keyset 상 마지막으로 처리한 행
+    last_expiry_date = models.DateField(null=True, blank=True)
+    last_fridge_id = models.IntegerField(default=0)
+    # 마지막 실행 시점의 최대 fridge_id (이후 추가된 행 추적용)
+    max_fridge_id = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def rewind(cls, expiry_date):
+        """
+        기존 행의 expiry_date 가 바뀌었을 때 호출 (bulk_change / recompute_expiry / Fridge.save)
+        이미 지나간 구간으로 옮겨진 행을 다음 스캔이 다시 읽도록 워터마크를 그 날짜 처음으로 되돌림
+        """
+        if expiry_date is None:
+            return
+        cls.objects.filter(last_expiry_date__gte=expiry_date).update(
+            last_expiry_date=expiry_date, last_fridge_id=0
+        )
+
+    def __str__(self):
+        return f"{self.name}: {self.last_expiry_date} / {self.last_fridge_id}"
+
+
+# ------------------------------
+# 12. 유통기한 임박 다이제스트 (ExpiryNotice)
+# ------------------------------
+class ExpiryNotice(models.Model):
+    """
+    scan_expiry 가 찾은 만료 임박 항목 (냉장고 행당 1개, 다시 스캔되면 갱신)
+    cron 으로 도는 scan_expiry 프로세스와 웹 프로세스가 캐시 대신 DB 로 공유
+    """
+    fridge = models.OneToOneField(Fridge, on_delete=models.CASCADE, primary_key=True)
+    person = models.ForeignKey(Person, on_delete=models.CASCADE, to_field='p_id')
+    ingredient = models.ForeignKey(Ingredient, on_delete=models.CASCADE)
+    f_quantity = models.DecimalField(max_digits=8, decimal_places=2)
+    expiry_date = models.DateField()
+    scanned_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['person', 'expiry_date'], name='expiry_notice_person_idx'),
+            models.Index(fields=['scanned_at'], name='expiry_notice_scanned_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.person_id}: {self.fridge_id} ({self.expiry_date})"
+
+
+# ------------------------------
+# 13. 캐시 무효화 버전 (CacheVersion)
+# ------------------------------
+def _new_cache_version():
+    # 행이 지워졌다가 다시 만들어져도 예전 버전과 겹치지 않도록 시각(마이크로초) 기반
+    return time.time_ns() // 1000
+
+
+class CacheVersion(models.Model):
+    """
+    응답 캐시 / 메모리 인덱스의 범위별 무효화 버전 (범위당 1행)
+    LocMemCache 는 워커 프로세스마다 따로라서 다른 워커의 증가를 볼 수 없음 → 버전만 DB 로 공유
+    쓰기와 같은 트랜잭션에서 올라가므로 다른 워커는 커밋과 동시에 새 버전을 본다.
+    """
+    scope = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField(default=_new_cache_version)
+    written_at = models.DateTimeField(null=True, blank=True)
+
+    @classmethod
+    def current(cls, *scopes):
+        """범위별 (version, written_at) 목록 - 처음 보는 범위는 행을 만들어 둠"""
+        found = {
+            scope: (version, written_at)
+            for scope, version, written_at
+            in cls.objects.filter(scope__in=scopes).values_list("scope", "version", "written_at")
+        }
+        missing = [scope for scope in scopes if scope not in found]
+        if missing:
+            # 동시에 만든 워커가 있으면 그쪽 값을 다시 읽음
+            cls.objects.bulk_create([cls(scope=scope) for scope in missing], ignore_conflicts=True)
+            found.update(
+                (scope, (version, written_at))
+                for scope, version, written_at
+                in cls.objects.filter(scope__in=missing).values_list("scope", "version", "written_at")
+            )
+        return [found[scope] for scope in scopes]
+
+    @classmethod
+    def bump(cls, scope):
+        """
+        버전 증가 + 쓰기 시각 기록
+        +1 만 하면 롤백된 트랜잭션이 잠깐 쓴 버전을 다음 커밋이 다시 쓰게 되어
+        그 사이 만든 캐시/인덱스가 새 데이터인 것처럼 보일 수 있음 → 현재 시각 이상으로 올림
+        """
+        now = timezone.now()
+        version = Greatest(F("version") + 1, Value(_new_cache_version()))
+        if cls.objects.filter(scope=scope).update(version=version, written_at=now):
+            return
+        _, created = cls.objects.get_or_create(scope=scope, defaults={"written_at": now})
+        if not created:
+            cls.objects.filter(scope=scope).update(version=version, written_at=now)
+
+    def __str__(self):
+        return f"{self.scope}: {self.version}"
+
+
+# ------------------------------
+# 14. 이미지 분석 비동기 작업 (ClassifyJob)
+# ------------------------------
+class ClassifyJob(models.Model):
+    """
+    이미지 분석 비동기 작업 상태 (jobs.py)
+    작업을 실행하는 워커와 상태 조회를 받는 워커가 다를 수 있으므로 캐시 대신 DB 에 둔다.
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    ERROR = "error"
+
+    job_id = models.CharField(max_length=32, primary_key=True)
+    status = models.CharField(max_length=10, default=PENDING)
+    result = models.TextField(null=True, blank=True)
+    cached = models.BooleanField(default=False)
+    error = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at'], name='classify_job_updated_idx'),
+        ]
+
+    def as_dict(self):
+        """API 응답용 상태 (완료 / 실패일 때만 결과 / 오류 포함)"""
+        if self.status == self.DONE:
+            return {"status": self.status, "result": self.result, "cached": self.cached}
+        if self.status == self.ERROR:
+            return {"status": self.status, "error": self.error}
+        return {"status": self.status}
+
+    def __str__(self):
+        return f"{self.job_id}: {self.status}"
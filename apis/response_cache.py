@@ -0,0 +1,187 @@
+"""
+사용자별 API 응답 캐시 (fridge_items/, recipes/, ingredients/)
+
+키 = 엔드포인트 + 사용자 + 카탈로그 버전 + 사용자 버전 + 쿼리스트링
+    - 카탈로그 버전: Recipe / RecipeIngredient / Ingredient / Allergy / AllergyIngredient 변경 시 증가
+    - 사용자 버전:   그 사용자의 Fridge / Like / PersonAllergy / Person 변경 시 증가
+버전이 바뀌면 예전 키는 더 이상 조회되지 않고 TTL로 자연스럽게 만료된다.
+버전은 CacheVersion 테이블에 두고 (조회당 PK 쿼리 1번), 응답 본문만 캐시에 둔다.
+→ 어느 워커에서 쓰든 다른 워커도 다음 요청에서 바로 새 버전을 본다.
+
+조건부 GET (ETag / Last-Modified)
+    같은 버전 조합으로 ETag를 만들기 때문에, If-None-Match가 일치하면
+    응답을 만들지 않고 user_id → p_id 와 버전 조회만으로 304를 돌려줄 수 있다.
+
+지표 (stats())
+    - hits / misses / hit_ratio: 엔드포인트별
+    - stale_reads / max_stale_window: 마지막 쓰기 이전에 만들어진 응답을 돌려준 횟수와
+      그 쓰기 후 몇 초가 지나도록 예전 응답이 나갔는지. 버전이 DB 에서 공유되므로 0이어야 한다.
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
+from django.dispatch import receiver
+
+from .models import CacheVersion, Person
+
+ENDPOINTS = ("fridge_items", "recipes", "ingredients")
+CATALOGUE = "catalogue"
+USERS_EPOCH = "users"
+
+# 요청 하나 안에서는 버전 / p_id 를 한 번만 조회 (ETag / Last-Modified / 본문이 같은 값을 씀)
+_local = threading.local()
+
+
+@receiver(request_started)
+def _start_request(**kwargs):
+    _local.states = {}
+    _local.person_ids = {}
+
+
+@receiver(request_finished)
+def _finish_request(**kwargs):
+    _local.states = None
+    _local.person_ids = None
+
+
+def _bump(scope):
+    CacheVersion.bump(scope)
+    if getattr(_local, "states", None) is not None:
+        _local.states = {}
+
+
+def bump_catalogue():
+    _bump(CATALOGUE)
+
+
+def bump_user(person_id):
+    _bump(f"user:{person_id}")
+
+
+def bump_all_users():
+    """bulk 로드처럼 시그널 없이 여러 사용자의 데이터가 바뀐 경우"""
+    _bump(USERS_EPOCH)
+
+
+def _incr(key, delta=1):
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key, delta)
+
+
+def _scopes(person_id):
+    if person_id is None:
+        return (CATALOGUE,)
+    return (CATALOGUE, USERS_EPOCH, f"user:{person_id}")
+
+
+def _state(person_id):
+    """(버전 문자열, 마지막 쓰기 시각) - 관련 범위를 쿼리 1번으로 조회"""
+    states = getattr(_local, "states", None)
+    if states is not None and person_id in states:
+        return states[person_id]
+    rows = CacheVersion.current(*_scopes(person_id))
+    written = [written_at for _, written_at in rows if written_at is not None]
+    state = ".".join(str(version) for version, _ in rows), max(written, default=None)
+    if states is not None:
+        states[person_id] = state
+    return state
+
+
+def _state_key(endpoint, person_id, params, versions=None):
+    if versions is None:
+        versions, _ = _state(person_id)
+    param_part = "&".join(f"{k}={v}" for k, v in sorted(params.items()) if v is not None)
+    return f"{endpoint}:{person_id}:{versions}:{param_part}"
+
+
+def version_tag(person_id=None):
+    """템플릿 조각 캐시({% cache %}) vary_on 용 버전 문자열 - get_or_build 와 같은 무효화 범위"""
+    versions, _ = _state(person_id)
+    return versions
+
+
+def etag(endpoint, person_id, params):
+    """카탈로그/사용자 버전 + 파라미터로 만든 strong ETag (따옴표 포함)"""
+    digest = hashlib.sha1(_state_key(endpoint, person_id, params).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def last_modified(person_id=None):
+    """관련 범위의 마지막 쓰기 시각 (기록이 없으면 None)"""
+    _, last_write = _state(person_id)
+    if last_write is None:
+        return None
+    # HTTP 날짜는 초 단위라 같은 초 안의 다음 쓰기를 If-Modified-Since 로 구분할 수 없음
+    # → 쓰기 후 1초 동안은 Last-Modified 를 내지 않고 ETag 로만 재검증
+    if time.time() - last_write.timestamp() < 1:
+        return None
+    return last_write
+
+
+def person_id_for(user_id):
+    """
+    user_id → p_id (없는 사용자면 None)
+    user_id 변경/삭제가 다른 워커에 전달되지 않으므로 요청 안에서만 기억한다.
+    """
+    person_ids = getattr(_local, "person_ids", None)
+    if person_ids is not None and user_id in person_ids:
+        return person_ids[user_id]
+    person_id = Person.objects.filter(user_id=user_id).values_list("p_id", flat=True).first()
+    if person_ids is not None:
+        person_ids[user_id] = person_id
+    return person_id
+
+
+def get_or_build(endpoint, person_id, params, build):
+    """
+    (endpoint, person_id, params) 응답 payload를 캐시에서 찾고, 없으면 build()로 만들어 저장
+    params: 응답을 바꾸는 쿼리 파라미터 (cursor, page_size, category 등)
+    person_id가 None이면 사용자와 무관한 카탈로그 응답
+    """
+    versions, last_write = _state(person_id)
+    key = "resp:" + _state_key(endpoint, person_id, params, versions)
+
+    entry = cache.get(key)
+    if entry is not None:
+        built_at, payload = entry
+        _incr(f"resp:{endpoint}:hits")
+        _record_staleness(endpoint, built_at, last_write)
+        return payload
+
+    _incr(f"resp:{endpoint}:misses")
+    payload = build()
+    cache.set(key, (time.time(), payload), settings.RESPONSE_CACHE_TIMEOUT)
+    return payload
+
+
+def _record_staleness(endpoint, built_at, last_write):
+    if last_write is not None and built_at < last_write.timestamp():
+        _incr(f"resp:{endpoint}:stale_reads")
+        window = time.time() - last_write.timestamp()
+        max_key = f"resp:{endpoint}:max_stale_window"
+        if window > cache.get(max_key, 0):
+            cache.set(max_key, window, None)
+
+
+def stats():
+    result = {}
+    for endpoint in ENDPOINTS:
+        prefix = f"resp:{endpoint}:"
+        values = cache.get_many([prefix + name for name in ("hits", "misses", "stale_reads", "max_stale_window")])
+        hits = values.get(prefix + "hits", 0)
+        misses = values.get(prefix + "misses", 0)
+        result[endpoint] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+            "stale_reads": values.get(prefix + "stale_reads", 0),
+            "max_stale_window": round(values.get(prefix + "max_stale_window", 0.0), 3),
+        }
+    return result
@@ -0,0 +1,110 @@
+import os
+import sys
+import django
+import random
+import time
+from datetime import date, timedelta
+
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment
+from apis.models import Fridge, Shopping
+
+# Fridge / Shopping 100만 행에서 관리자 목록(changelist) / 추가 화면 지연 비교
+N_ROWS = 1_000_000
+N_PERSONS = 10_000
+N_INGREDIENTS = 500
+REPEAT = 5
+
+
+def seed():
+    rng = random.Random(42)
+    start = date(2025, 1, 1)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO apis_person (user_id, name, password_2, address, is_vegan) VALUES (%s, %s, '', '', 0)",
+            [(f"user{i}", f"user{i}") for i in range(N_PERSONS)],
+        )
+        cursor.executemany(
+            "INSERT INTO apis_ingredient (ingredient_name, unit, ingredient_category, price, shelf_life) "
+            "VALUES (%s, 'g', %s, 1000, 7)",
+            [(f"재료{i}", f"분류{i % 10}") for i in range(N_INGREDIENTS)],
+        )
+        for chunk in range(0, N_ROWS, 100_000):
+            rows = []
+            for i in range(chunk, chunk + 100_000):
+                added = start + timedelta(days=rng.randint(0, 365))
+                rows.append((rng.randint(1, N_PERSONS), rng.randint(1, N_INGREDIENTS), added, added + timedelta(days=7)))
+            cursor.executemany(
+                "INSERT INTO apis_fridge (person_id, ingredient_id, f_quantity, added_date, expiry_date) "
+                "VALUES (%s, %s, 1, %s, %s)", rows,
+            )
+            cursor.executemany(
+                "INSERT INTO apis_shopping (person_id, ingredient_id, quantity, price, unit_price, purchased_date, "
+                "added_to_fridge, fridge_record_id) VALUES (%s, %s, 1, 1000, 1000, %s, 1, %s)",
+                [(p, i, d, chunk + n + 1) for n, (p, i, d, _) in enumerate(rows)],
+            )
+        cursor.execute("ANALYZE")
+
+
+def measure(client, label, url):
+    timings, queries = [], 0
+    for _ in range(REPEAT):
+        reset_queries()
+        start = time.perf_counter()
+        resp = client.get(url)
+        timings.append(time.perf_counter() - start)
+        queries = len(connection.queries)
+        assert resp.status_code == 200, resp.status_code
+    print(f"  {label:<28} {min(timings) * 1000:9.1f}ms  쿼리 {queries}개")
+
+
+def naive(model_admin):
+    """최적화 전 설정으로 되돌림"""
+    model_admin.paginator = Paginator
+    model_admin.show_full_result_count = True
+    model_admin.list_select_related = False  # list_display 의 직접 FK 만 자동 JOIN
+    model_admin.autocomplete_fields = ()
+    model_admin.ordering = None if model_admin.model is Fridge else ('-purchased_date',)
+
+
+def run(client, title):
+    print(title)
+    for model in ("fridge", "shopping"):
+        base = f"/admin/apis/{model}/"
+        measure(client, f"{model} 목록", base)
+        measure(client, f"{model} 목록 + 필터", base + "?added_to_fridge__exact=1" if model == "shopping"
+                else base + "?expiry_date__gte=2025-06-01")
+        measure(client, f"{model} 추가 화면", base + "add/")
+
+
+def main():
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        print(f"📦 Fridge / Shopping 각 {N_ROWS:,}행 생성 중...")
+        seed()
+        client = Client()
+        client.force_login(User.objects.create_superuser("bench", "bench@example.com", "pw"))
+
+        with override_settings(DEBUG=True):
+            run(client, "✅ 현재 설정")
+            for model in (Fridge, Shopping):
+                naive(admin.site._registry[model])
+            run(client, "⛔ 최적화 전 (COUNT(*), FK 개별 조회, 전체 <select>)")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import csv
+import django
+import random
+import time
+
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from django.conf import settings
+from apis.autocomplete import IngredientPrefixIndex
+
+# 재료 이름 5만 개에서 자동완성 조회 지연 (DB 없이 인덱스만)
+N_NAMES = 50_000
+REPEAT = 10_000
+QUERIES = ["ㄷ", "두", "둡", "ㄷㅂ", "달", "고추", "ㄱㅊ", "양파", "소", "없는재료"]
+
+
+def names():
+    path = os.path.join(settings.BASE_DIR, 'apis', 'data', 'Ingredient.csv')
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        base = [r['ingredient_name'] for r in csv.DictReader(f)]
+    rng = random.Random(42)
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(300)]
+    result = list(base)
+    while len(result) < N_NAMES:
+        result.append(rng.choice(base) + "".join(rng.choices(syllables, k=rng.randint(1, 3))))
+    return result
+
+
+def main():
+    rows = [(i, name, 'g', '기타') for i, name in enumerate(names(), start=1)]
+
+    start = time.perf_counter()
+    index = IngredientPrefixIndex(rows)
+    print(f"🔨 재료 {len(rows):,}개 인덱스 생성 {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            found = index.lookup(query, 10)
+        us = (time.perf_counter() - start) / REPEAT * 1_000_000
+        print(f"{query:<8} {len(found):>3}건  {us:7.2f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import django
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from django.db import connection, transaction
+from apis.models import Person, Ingredient, Fridge, Shopping
+
+# 구매 기록 N건을 save() 경로와 bulk_ingest 경로로 각각 삽입해서 처리량 비교
+N = 5_000
+
+
+def purchases(person, ingredients):
+    start = date(2025, 1, 1)
+    return [
+        Shopping(
+            person=person,
+            ingredient=ingredients[i % len(ingredients)],
+            quantity=Decimal(i % 5 + 1),
+            purchased_date=start + timedelta(days=i % 365),
+        )
+        for i in range(N)
+    ]
+
+
+def timed(label, fn):
+    Shopping.objects.all().delete()
+    Fridge.objects.all().delete()
+    start = time.perf_counter()
+    with transaction.atomic():
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {N:,}건 → {elapsed:.2f}s ({N / elapsed:,.0f} rows/s)")
+
+
+def main():
+    # 🧪 실제 DB를 건드리지 않도록 테스트 DB에서 실행
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        person = Person.objects.create(user_id="bench", name="bench", password_2="x", address="x")
+        ingredients = [
+            Ingredient.objects.create(
+                ingredient_name=f"재료{i}", unit="g", ingredient_category="신선식품",
+                price=Decimal(100 * (i + 1)), shelf_life=i % 10,
+            )
+            for i in range(50)
+        ]
+
+        def save_path():
+            for shopping in purchases(person, ingredients):
+                shopping.save()
+
+        timed("save()", save_path)
+        timed("bulk_ingest", lambda: Shopping.objects.bulk_ingest(purchases(person, ingredients)))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
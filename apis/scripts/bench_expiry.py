@@ -0,0 +1,77 @@
+import os
+import sys
+import django
+import random
+import time
+from datetime import date, timedelta
+
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from django.db import connection
+from apis.expiry import scan_expiry
+
+# 냉장고 100만 행에서 하루 단위 증분 스캔 처리량 측정
+N_FRIDGE = 1_000_000
+N_PERSONS = 10_000
+N_INGREDIENTS = 500
+DAYS = 3
+START = date(2025, 1, 1)
+
+
+def seed():
+    rng = random.Random(42)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO apis_person (user_id, name, password_2, address, is_vegan) VALUES (%s, %s, '', '', 0)",
+            [(f"user{i}", f"user{i}") for i in range(N_PERSONS)],
+        )
+        cursor.executemany(
+            "INSERT INTO apis_ingredient (ingredient_name, unit, ingredient_category, price, shelf_life) "
+            "VALUES (%s, 'g', '신선식품', 0, 7)",
+            [(f"재료{i}",) for i in range(N_INGREDIENTS)],
+        )
+        rows = []
+        for _ in range(N_FRIDGE):
+            added = START + timedelta(days=rng.randint(0, 365))
+            rows.append((rng.randint(1, N_PERSONS), rng.randint(1, N_INGREDIENTS), 1, added, added + timedelta(days=7)))
+        cursor.executemany(
+            "INSERT INTO apis_fridge (person_id, ingredient_id, f_quantity, added_date, expiry_date) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+        cursor.execute("ANALYZE")
+
+
+def run(label, today):
+    start = time.perf_counter()
+    digests = scan_expiry(days=DAYS, today=today)
+    elapsed = time.perf_counter() - start
+    count = sum(len(items) for items in digests.values())
+    rate = count / elapsed if elapsed else 0
+    print(f"{label:<14} {count:>8,}건 / 사용자 {len(digests):>6,}명  {elapsed * 1000:9.1f}ms  ({rate:,.0f} rows/s)")
+
+
+def main():
+    # 🧪 실제 DB를 건드리지 않도록 테스트 DB에서 실행
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        print(f"📦 냉장고 {N_FRIDGE:,}행 생성 중...")
+        seed()
+
+        # 첫 실행은 과거 구간 전체를 처리, 이후는 하루치 구간만 읽음
+        today = START + timedelta(days=180)
+        run("첫 실행", today)
+        run("같은 날 재실행", today)
+        for day in range(1, 4):
+            run(f"+{day}일", today + timedelta(days=day))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
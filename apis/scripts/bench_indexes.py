@@ -0,0 +1,95 @@
+import os
+import sys
+import django
+import random
+import time
+from datetime import date, timedelta
+
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from django.db import connection
+from apis.models import Fridge
+
+# 냉장고 100만 행에서 (person, expiry_date) 조회 지연 비교
+N_FRIDGE = 1_000_000
+N_PERSONS = 10_000
+N_INGREDIENTS = 500
+REPEAT = 20
+
+
+def seed():
+    rng = random.Random(42)
+    start = date(2025, 1, 1)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO apis_person (user_id, name, password_2, address, is_vegan) VALUES (%s, %s, '', '', 0)",
+            [(f"user{i}", f"user{i}") for i in range(N_PERSONS)],
+        )
+        cursor.executemany(
+            "INSERT INTO apis_ingredient (ingredient_name, unit, ingredient_category, price, shelf_life) "
+            "VALUES (%s, 'g', '신선식품', 0, 7)",
+            [(f"재료{i}",) for i in range(N_INGREDIENTS)],
+        )
+        rows = []
+        for _ in range(N_FRIDGE):
+            added = start + timedelta(days=rng.randint(0, 365))
+            rows.append((rng.randint(1, N_PERSONS), rng.randint(1, N_INGREDIENTS), 1, added, added + timedelta(days=7)))
+        cursor.executemany(
+            "INSERT INTO apis_fridge (person_id, ingredient_id, f_quantity, added_date, expiry_date) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+        cursor.execute("ANALYZE")
+
+
+def measure(label, person_table):
+    rng = random.Random(7)
+    lookups = [
+        (rng.randint(1, N_PERSONS), date(2025, 1, 1) + timedelta(days=rng.randint(0, 365)))
+        for _ in range(REPEAT)
+    ]
+    user_ids = [f"user{rng.randrange(N_PERSONS)}" for _ in range(REPEAT)]
+
+    start = time.perf_counter()
+    for person_id, day in lookups:
+        list(Fridge.objects.filter(person_id=person_id, expiry_date__lte=day + timedelta(days=3)))
+    fridge_ms = (time.perf_counter() - start) / REPEAT * 1000
+
+    start = time.perf_counter()
+    with connection.cursor() as cursor:
+        for user_id in user_ids:
+            cursor.execute(f"SELECT * FROM {person_table} WHERE user_id = %s", [user_id])
+            cursor.fetchall()
+    person_ms = (time.perf_counter() - start) / REPEAT * 1000
+
+    print(f"{label:<16} fridge(person, expiry) {fridge_ms:7.3f}ms | person(user_id) {person_ms:7.3f}ms")
+
+
+def main():
+    # 🧪 실제 DB를 건드리지 않도록 테스트 DB에서 실행
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        print(f"📦 냉장고 {N_FRIDGE:,}행 생성 중...")
+        seed()
+        measure("인덱스 있음", "apis_person")
+
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX fridge_person_expiry_idx")
+            for name in [r[1] for r in cursor.execute("PRAGMA index_list('apis_fridge')").fetchall()]:
+                if not name.startswith("sqlite_"):
+                    cursor.execute(f'DROP INDEX "{name}"')
+            # UNIQUE 제약(자동 인덱스)은 DROP 할 수 없으므로 제약 없는 복사본으로 비교
+            cursor.execute("CREATE TABLE person_noidx AS SELECT * FROM apis_person")
+            cursor.execute("ANALYZE")
+        measure("인덱스 없음", "person_noidx")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
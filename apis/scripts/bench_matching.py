@@ -0,0 +1,46 @@
+import os
+import sys
+import django
+import random
+import time
+
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from apis.matching import RecipeIndex
+
+# 합성 카탈로그: 레시피 10만 개, 재료 2천 개, 레시피당 재료 3~12개
+N_RECIPES = 100_000
+N_INGREDIENTS = 2_000
+FRIDGE_SIZES = (5, 20, 50)
+REPEAT = 20
+
+
+def synthetic_rows(rng):
+    for recipe_id in range(1, N_RECIPES + 1):
+        for ingredient_id in rng.sample(range(1, N_INGREDIENTS + 1), rng.randint(3, 12)):
+            yield recipe_id, ingredient_id, rng.randint(1, 500)
+
+
+def main():
+    rng = random.Random(42)
+
+    start = time.perf_counter()
+    index = RecipeIndex(synthetic_rows(rng))
+    print(f"📦 인덱스 구축: 레시피 {N_RECIPES:,}개 → {time.perf_counter() - start:.2f}s")
+
+    for size in FRIDGE_SIZES:
+        fridge = {i: float(rng.randint(1, 500)) for i in rng.sample(range(1, N_INGREDIENTS + 1), size)}
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            index.match(fridge, limit=20)
+        elapsed = (time.perf_counter() - start) / REPEAT
+        print(f"🧊 냉장고 재료 {size:>3}개 → 매칭 {elapsed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import io
+import os
+import sys
+import django
+import shutil
+import tempfile
+import time
+
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.wsgi import WSGIHandler
+from django.test.utils import override_settings
+from apis import media
+
+# 20MB 파일을 WSGI 핸들러로 요청했을 때 Python 이 직접 읽는 바이트 / 요청 시간
+#   before: django.views.static.serve (DEBUG 전용)
+#   django: 전체 파일은 wsgi.file_wrapper 로 서버(sendfile)에 넘김, Range 는 해당 구간만 읽음
+#   x-accel: 바이트 전송은 nginx
+SIZE = 20 * 1024 * 1024
+REPEAT = 50
+
+
+class FileWrapper:
+    """gunicorn 처럼 fileno() 가 있으면 sendfile(여기서는 읽지 않음), 없으면 read() 로 읽어서 보냄"""
+    def __init__(self, filelike, block_size=8192):
+        self.filelike = filelike
+        self.block_size = block_size
+
+    def __iter__(self):
+        if hasattr(self.filelike, "fileno"):
+            return iter(())
+        return iter(lambda: self.filelike.read(self.block_size), b"")
+
+    def close(self):
+        self.filelike.close()
+
+
+def request(app, path, **extra):
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "SERVER_NAME": "localhost", "SERVER_PORT": "80",
+        "wsgi.input": io.BytesIO(), "wsgi.url_scheme": "http", "wsgi.file_wrapper": FileWrapper, **extra,
+    }
+    started = []
+    body = app(environ, lambda s, headers, exc_info=None: started.append((s, dict(headers))))
+    read = sum(len(chunk) for chunk in body)
+    if hasattr(body, "close"):
+        body.close()
+    status, headers = started[0]
+    return status, read, headers.get("Cache-Control", "-")
+
+
+def run(label, app, path, **extra):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        status, read, cache_control = request(app, path, **extra)
+    elapsed = (time.perf_counter() - start) / REPEAT
+    print(f"{label:<32} {status:<20} Python 이 읽은 바이트 {read / 1024 / 1024:5.1f} MB, "
+          f"{elapsed * 1000:6.2f}ms  Cache-Control: {cache_control}")
+
+
+def main():
+    media_root = tempfile.mkdtemp()
+    try:
+        with override_settings(MEDIA_ROOT=media_root, DEBUG=True, ALLOWED_HOSTS=["localhost"]):
+            data = os.urandom(SIZE)
+            names = {media.store_upload(SimpleUploadedFile(f"photo{i}.jpg", data), "recipes") for i in range(5)}
+            stored = sum(len(files) for _, _, files in os.walk(media_root))
+            print(f"같은 사진 5번 업로드 → 이름 {len(names)}개, 파일 {stored}개")
+            path = settings.MEDIA_URL + names.pop()
+
+            from django.urls import clear_url_caches, set_urlconf
+            from django.conf.urls.static import static
+            import project_fridge.urls as project_urls
+            before = project_urls.urlpatterns[:-1] + static(settings.MEDIA_URL, document_root=media_root)
+
+            app = WSGIHandler()
+            original = project_urls.urlpatterns
+            try:
+                project_urls.urlpatterns = before
+                clear_url_caches()
+                set_urlconf(None)
+                run("before (static.serve)", app, path)
+                run("before Range 1MB", app, path, HTTP_RANGE="bytes=0-1048575")
+            finally:
+                project_urls.urlpatterns = original
+                clear_url_caches()
+
+            run("django", app, path)
+            run("django Range 1MB", app, path, HTTP_RANGE="bytes=0-1048575")
+            run("django If-None-Match", app, path, HTTP_IF_NONE_MATCH=f'"{os.path.basename(path).split(".")[0]}"')
+            with override_settings(MEDIA_SERVE_MODE="x-accel"):
+                run("x-accel", app, path)
+    finally:
+        shutil.rmtree(media_root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import csv
+import django
+import random
+import time
+
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from apis import search
+from apis.models import Recipe, RecipeIngredient, Ingredient
+
+# 레시피 10만 건: 2-gram FTS5 검색 vs LIKE '%...%' 조회 지연 비교
+N_RECIPES = 100_000
+PER_RECIPE = 5
+REPEAT = 20
+# 흔한 질의(수만 건 일치)와 드문 질의(몇 건 일치, LIKE 는 끝까지 스캔)
+COMMON = ["김치", "된장", "두부", "돼지고기 볶", "계란", "치찌", "양파 대파"]
+RARE = ["김치찌개4321", "된장찌개 98765", "레시피없음", "찌개77777"]
+
+
+def seed():
+    path = os.path.join(settings.BASE_DIR, 'apis', 'data', 'Recipe.csv')
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.DictReader(f))
+    path = os.path.join(settings.BASE_DIR, 'apis', 'data', 'Ingredient.csv')
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        names = [r['ingredient_name'] for r in csv.DictReader(f)]
+
+    rng = random.Random(42)
+    Ingredient.objects.bulk_create(
+        [Ingredient(ingredient_name=name, unit='g', ingredient_category='기타') for name in names]
+    )
+    ingredient_ids = list(Ingredient.objects.values_list('pk', flat=True))
+    Recipe.objects.bulk_create(
+        [
+            Recipe(recipe_name=f"{rows[i % len(rows)]['recipe_name']}{i}",
+                   description=rows[i % len(rows)]['description'], recipe_category='한식')
+            for i in range(N_RECIPES)
+        ],
+        batch_size=2000,
+    )
+    RecipeIngredient.objects.bulk_create(
+        [
+            RecipeIngredient(recipe_id=recipe_id, ingredient_id=ingredient_id, r_quantity=1)
+            for recipe_id in Recipe.objects.values_list('pk', flat=True)
+            for ingredient_id in rng.sample(ingredient_ids, PER_RECIPE)
+        ],
+        batch_size=5000,
+    )
+
+
+def like_search(query):
+    condition = Q()
+    for word in query.split():
+        condition &= (Q(recipe_name__icontains=word) | Q(description__icontains=word)
+                      | Q(recipeingredient__ingredient__ingredient_name__icontains=word))
+    return list(Recipe.objects.filter(condition).distinct().values_list('pk', flat=True)[:20])
+
+
+def measure(label, fn, queries):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for query in queries:
+            fn(query)
+    ms = (time.perf_counter() - start) / (REPEAT * len(queries)) * 1000
+    print(f"{label:<22} {ms:8.2f}ms / 질의")
+
+
+def main():
+    # 🧪 실제 DB를 건드리지 않도록 테스트 DB에서 실행
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        print(f"📦 레시피 {N_RECIPES:,}건 생성 중...")
+        seed()
+        start = time.perf_counter()
+        search.rebuild()
+        print(f"🔨 색인 생성 {time.perf_counter() - start:.1f}s")
+
+        for kind, queries in (("흔한 질의", COMMON), ("드문 질의", RARE)):
+            measure(f"FTS5 2-gram ({kind})", lambda q: search.search_recipes(q, 20), queries)
+            measure(f"LIKE %...% ({kind})", like_search, queries)
+
+        # 레시피 1건 추가 시 증분 색인 비용
+        start = time.perf_counter()
+        recipe = Recipe.objects.create(recipe_name="벤치마크찌개", description="끓인다")
+        RecipeIngredient.objects.create(recipe=recipe, ingredient_id=1, r_quantity=1)
+        print(f"➕ 레시피 추가 + 증분 색인 {(time.perf_counter() - start) * 1000:.2f}ms")
+        assert search.search_recipes("벤치마크")[0] == recipe.pk
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import csv
+import django
+import time
+
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+from apis.models import Recipe
+
+# apis/data/Recipe.csv 를 SCALE배로 복제해서 목록 조회 비용 비교
+#   - 전체 컬럼(기존 ORM 기본값, description 포함) vs .only() 목록 컬럼
+#   - API 응답: 기본 목록 필드 vs fields=id,name,category,image vs description 포함
+SCALE = 2000
+REPEAT = 3
+
+
+def seed():
+    path = os.path.join(settings.BASE_DIR, 'apis', 'data', 'Recipe.csv')
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.DictReader(f))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO apis_person (user_id, name, password_2, address, is_vegan) "
+            "VALUES ('bench', 'bench', '', '', 0)"
+        )
+    Recipe.objects.bulk_create(
+        [
+            Recipe(recipe_name=f"{r['recipe_name']}{n}", description=r['description'],
+                   recipe_img=r['recipe_img'], recipe_category=r['recipe_category'])
+            for n in range(SCALE) for r in rows
+        ],
+        batch_size=2000,
+    )
+    return len(rows)
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def stream_size(client, params):
+    resp = client.get("/api/recipes/", {"user_id": "bench", "stream": 1, **params})
+    return sum(len(chunk) for chunk in resp.streaming_content)
+
+
+def main():
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        n_csv = seed()
+        total = Recipe.objects.count()
+        print(f"📦 Recipe.csv {n_csv}건 × {SCALE} = {total:,}건")
+
+        full_ms, _ = timed(lambda: list(Recipe.objects.all()))
+        only_ms, _ = timed(lambda: list(Recipe.objects.only("recipe_id", "recipe_name", "recipe_category", "recipe_img")))
+        print(f"ORM 전체 컬럼      {full_ms:8.1f}ms")
+        print(f"ORM .only(목록)    {only_ms:8.1f}ms  ({1 - only_ms / full_ms:.0%} 감소)")
+
+        client = Client()
+        desc_ms, desc_size = timed(lambda: sum(
+            len(client.get(f"/api/recipes/{pk}/", {"fields": "id,name,category,image,description"}).content)
+            for pk in Recipe.objects.values_list("pk", flat=True)[:1000]
+        ))
+        for label, params in [
+            ("API 기본 목록", {}),
+            ("API fields=4개", {"fields": "id,name,category,image"}),
+        ]:
+            ms, size = timed(lambda: stream_size(client, params))
+            print(f"{label:<16} {ms:8.1f}ms  {size / 1024 / 1024:7.2f}MB")
+        print(f"(참고) description 포함 상세 1,000건  {desc_ms:8.1f}ms  "
+              f"{desc_size / 1024 / 1024:7.2f}MB → {total:,}건 환산 {desc_size * total / 1000 / 1024 / 1024:7.1f}MB")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import sys
+import django
+import resource
+import subprocess
+import time
+
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment
+
+# 레시피 5만 건 전체 목록: JsonResponse(리스트 → 문자열) vs ?stream=1 최대 RSS 비교
+# ru_maxrss 는 프로세스 최고치라서 모드마다 새 프로세스에서 측정
+N_RECIPES = 50_000
+N_INGREDIENTS = 200
+PER_RECIPE = 5
+DESCRIPTION = "재료를 손질하고 양념을 넣어 끓인다. " * 60  # 약 2KB
+BATCH = 1000
+
+
+def seed():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO apis_person (user_id, name, password_2, address, is_vegan) "
+            "VALUES ('bench', 'bench', '', '', 0)"
+        )
+        cursor.executemany(
+            "INSERT INTO apis_ingredient (ingredient_name, unit, ingredient_category, price, shelf_life) "
+            "VALUES (%s, 'g', '신선식품', 0, 7)",
+            [(f"재료{i}",) for i in range(N_INGREDIENTS)],
+        )
+        # 시드 단계가 최고 RSS를 만들지 않도록 나눠서 삽입
+        for start in range(0, N_RECIPES, BATCH):
+            ids = range(start + 1, start + BATCH + 1)
+            cursor.executemany(
+                "INSERT INTO apis_recipe (recipe_id, recipe_name, recipe_category, description, recipe_img) "
+                "VALUES (%s, %s, '한식', %s, '')",
+                [(i, f"레시피{i}", DESCRIPTION) for i in ids],
+            )
+            cursor.executemany(
+                "INSERT INTO apis_recipeingredient (recipe_id, ingredient_id, r_quantity) VALUES (%s, %s, 1.5)",
+                [(i, (i * 7 + k) % N_INGREDIENTS + 1) for i in ids for k in range(PER_RECIPE)],
+            )
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(mode):
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        seed()
+        client = Client()
+        params = {"user_id": "bench"}
+        if mode == "stream":
+            params["stream"] = 1
+        else:
+            params["page_size"] = N_RECIPES
+
+        before = rss_mb()
+        start = time.perf_counter()
+        with override_settings(API_MAX_PAGE_SIZE=N_RECIPES):
+            resp = client.get("/api/recipes/", params)
+            size = 0
+            if resp.streaming:
+                for chunk in resp.streaming_content:
+                    size += len(chunk)
+            else:
+                size = len(resp.content)
+        elapsed = time.perf_counter() - start
+        print(f"{mode:<8} {size / 1024 / 1024:7.1f}MB 응답  {elapsed:6.2f}s  "
+              f"최대 RSS {rss_mb():7.1f}MB (요청 전 {before:7.1f}MB, +{rss_mb() - before:6.1f}MB)")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def main():
+    if len(sys.argv) > 1:
+        measure(sys.argv[1])
+        return
+    print(f"📦 레시피 {N_RECIPES:,}건 (설명 {len(DESCRIPTION.encode())}B, 재료 {PER_RECIPE}개)")
+    for mode in ("list", "stream"):
+        subprocess.run([sys.executable, os.path.abspath(__file__), mode], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import django
+import shutil
+import tempfile
+import time
+
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from django.conf import settings
+from django.test.utils import override_settings
+from apis import thumbnails
+
+# apis/data/photo 원본 vs 썸네일 전송량, 생성/재사용 시간 (임시 MEDIA_ROOT 복사본에서 실행)
+REPEAT = 200
+
+
+def main():
+    media_root = tempfile.mkdtemp()
+    try:
+        shutil.copytree(os.path.join(settings.MEDIA_ROOT, 'photo'), os.path.join(media_root, 'photo'),
+                        ignore=shutil.ignore_patterns(settings.THUMBNAIL_DIR))
+        images = sorted(
+            os.path.relpath(os.path.join(d, name), media_root).replace("\\", "/")
+            for d, _, names in os.walk(os.path.join(media_root, 'photo')) for name in names
+        )
+        with override_settings(MEDIA_ROOT=media_root):
+            original = sum(os.path.getsize(os.path.join(media_root, p)) for p in images)
+            print(f"원본 {len(images)}개: {original / 1024:,.0f} KB (평균 {original / len(images) / 1024:,.0f} KB)")
+
+            for size, px in settings.THUMBNAIL_SIZES.items():
+                start = time.perf_counter()
+                paths = [thumbnails.ensure_thumbnail(p, size) for p in images]
+                generate = time.perf_counter() - start
+                total = sum(os.path.getsize(p) for p in paths)
+
+                start = time.perf_counter()
+                for _ in range(REPEAT):
+                    for p in images:
+                        thumbnails.ensure_thumbnail(p, size)
+                cached = (time.perf_counter() - start) / (REPEAT * len(images))
+
+                print(
+                    f"{size:>3} ({px}px): {total / 1024:,.0f} KB ({total / original:.1%}), "
+                    f"생성 {generate / len(images) * 1000:.1f}ms/장, 이후 {cached * 1e6:.0f}µs/장"
+                )
+    finally:
+        shutil.rmtree(media_root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import io
+import os
+import sys
+import django
+import time
+import tracemalloc
+
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.test.client import encode_multipart, BOUNDARY, MULTIPART_CONTENT
+from django.test.utils import override_settings, setup_test_environment
+from apis import uploads
+
+# multipart 업로드를 WSGI 핸들러로 보냈을 때 시간 / Python 메모리 최대치
+#   before: 기본 핸들러만 (본문을 끝까지 파싱한 뒤 뷰에서 다시 읽어 sha256)
+#   after:  UploadLimitMiddleware (받는 동안 한도 검사 + sha256)
+BIG = 60 * 1024 * 1024          # 한도(20MB)를 넘는 업로드
+OK_SIZE = 15 * 1024 * 1024      # 한도 안의 업로드 (분석은 하지 않고 파싱 + 해시까지만)
+MIDDLEWARE = 'apis.uploads.UploadLimitMiddleware'
+
+
+def body_for(size, head=b"\xff\xd8\xff\xe0"):
+    data = head + os.urandom(size - len(head))
+    return encode_multipart(BOUNDARY, {"image": _File("big.jpg", data)})
+
+
+class _File(io.BytesIO):
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+
+
+def post(app, path, body):
+    environ = {
+        "REQUEST_METHOD": "POST", "PATH_INFO": path, "SERVER_NAME": "localhost", "SERVER_PORT": "80",
+        "CONTENT_TYPE": MULTIPART_CONTENT, "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body), "wsgi.url_scheme": "http",
+    }
+    status = []
+    response = app(environ, lambda s, headers, exc_info=None: status.append(s))
+    if hasattr(response, "close"):
+        response.close()
+    return status[0]
+
+
+def run(label, middleware, path, body):
+    with override_settings(MIDDLEWARE=middleware, ALLOWED_HOSTS=["localhost"]):
+        app = WSGIHandler()
+        tracemalloc.start()
+        start = time.perf_counter()
+        status = post(app, path, body)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(f"{label:<34} {status:<28} {elapsed * 1000:8.1f}ms  Python 메모리 최대 {peak / 1024 / 1024:6.1f} MB")
+
+
+def main():
+    setup_test_environment()
+    after = list(settings.MIDDLEWARE)
+    before = [m for m in after if m != MIDDLEWARE]
+
+    from django.urls import path
+    from django.http import JsonResponse
+    from django.views.decorators.csrf import csrf_exempt
+    import project_fridge.urls as project_urls
+
+    @csrf_exempt
+    def parse_only(request):
+        # classify 앞단(파싱 + 캐시 키용 해시)만
+        uploaded = request.FILES["image"]
+        return JsonResponse({"digest": uploads.streamed_digest(request, "image", uploaded)})
+
+    project_urls.urlpatterns.append(path('bench/upload/', parse_only, name='classify_query'))
+    try:
+        body = body_for(OK_SIZE)
+        run("15MB before", before, "/bench/upload/", body)
+        run("15MB after", after, "/bench/upload/", body)
+
+        body = body_for(BIG)
+        run("60MB (한도 초과) before", before, "/bench/upload/", body)
+        run("60MB (한도 초과) after", after, "/bench/upload/", body)
+
+        # Content-Length 없이(chunked) 들어온 것처럼 → 스트리밍 중 거절
+        with override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=BIG):
+            run("60MB after, 스트리밍 중 거절", after, "/bench/upload/", body)
+
+        body = body_for(OK_SIZE, head=b"<html>")
+        run("15MB 이미지 아님 after", after, "/bench/upload/", body)
+    finally:
+        project_urls.urlpatterns.pop()
+
+
+if __name__ == '__main__':
+    main()
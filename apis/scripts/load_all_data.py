@@ -1,41 +1,30 @@
 # apis/scripts/load_all_data.py
 
 import os
-import subprocess
 import sys
+import django
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-MANAGE_PY = os.path.join(os.path.dirname(BASE_DIR), '..', 'manage.py')
+# ✅ Django 프로젝트 루트 등록
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# ✅ Django 환경 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fridge.settings')
+django.setup()
+
+from django.core.management import call_command
 
-def run_script(script_name):
-    script_path = os.path.join(BASE_DIR, script_name)
-    print(f"\n🔥 Running {script_name} ...")
-    result = subprocess.run([sys.executable, script_path])
-    if result.returncode == 0:
-        print(f"✅ Success: {script_name}")
-    else:
-        print(f"❌ Failed: {script_name}")
 
 def main():
     print("========================================")
     print("🚀 Starting full database data load...")
     print("========================================\n")
 
-    load_order = [
-        "load_allergy_data.py",
-        "load_ingredient_data.py",
-        "load_person_data.py",
-        "load_personAllergy_data.py",
-        "load_allergyIngredient_data.py",
-        "load_recipe_data.py",
-        "load_recipeIngredient_data.py",
-        "load_fridge_data.py",
-        "load_like_data.py",
-        "load_shopping_data.py",
-    ]
-
-    for script in load_order:
-        run_script(script)
+    # 🔥 스크립트마다 새 프로세스를 띄우지 않고 한 프로세스에서 bulk 로드
+    #    (순서: Allergy → Ingredient → Person → PersonAllergy → AllergyIngredient
+    #           → Recipe → RecipeIngredient → Fridge → Like → Shopping)
+    #    개별 테이블만 다시 넣고 싶으면 load_*_data.py 또는
+    #    python manage.py load_data --only <table> 사용
+    call_command("load_data")
 
     print("\n========================================")
     print("🎉 ALL DATA LOADED SUCCESSFULLY!")
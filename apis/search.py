@@ -0,0 +1,206 @@
+"""
+레시피 / 재료 검색 (글자 2-gram 색인)
+
+SQLite FTS5 가상 테이블에 글자 2-gram 을 공백으로 구분한 문자열을 저장한다.
+    "김치찌개" → "김치 치찌 찌개"
+FTS5 trigram 토크나이저는 3글자 미만 질의를 찾지 못해서 2글자 단어가 많은 한글에 맞지 않으므로
+2-gram 을 직접 만들고 unicode61 토크나이저에는 공백 분리만 맡긴다.
+질의 단어도 같은 2-gram phrase 로 바꾸므로 "부분 문자열 포함"과 같은 결과가 나온다.
+
+순위
+    1) 레시피명/재료명에서 찾은 레시피를 bm25(레시피명 > 재료명 가중치)로 정렬
+    2) 모자라면 조리법까지 포함해 찾은 나머지를 recipe_id 순으로 채움
+조리법 2-gram 은 흔해서 (예: "두부" → 수만 건) 전부 bm25 로 정렬하면 수십 ms 가 걸리지만,
+2)는 정렬 없이 LIMIT 에서 멈추므로 카탈로그 크기와 거의 무관하다.
+
+색인은 시그널로 레시피 단위 갱신 (signals.py), bulk_create 경로는 reindex_recipes / rebuild 를 직접 호출.
+SQLite 가 아닌 DB 에서는 색인 없이 icontains 조회로 대체한다.
+"""
+import operator
+import re
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Recipe, RecipeIngredient, Ingredient
+
+RECIPE_TABLE = "apis_recipe_search"
+INGREDIENT_TABLE = "apis_ingredient_search"
+# bm25 컬럼 가중치: name, ingredients, description
+RECIPE_WEIGHTS = (10.0, 5.0, 1.0)
+RANKED_COLUMNS = "{name ingredients}"
+BATCH = 500
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def ngrams(text):
+    """단어별 글자 2-gram (한 글자 단어는 그대로)"""
+    tokens = []
+    for word in _WORD.findall((text or "").lower()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens += map(operator.add, word, word[1:])
+    return tokens
+
+
+def ngram_doc(*texts):
+    return " ".join(ngrams(" ".join(filter(None, texts))))
+
+
+def match_expression(query):
+    """
+    질의 → FTS5 MATCH 식. 단어마다 2-gram phrase 를 만들어 AND
+    한 글자 단어는 그 글자로 시작하는 토큰(prefix)으로 찾는다. 토큰이 없으면 None
+    """
+    phrases = []
+    for word in _WORD.findall(query.lower()):
+        if len(word) == 1:
+            phrases.append(f'"{word}"*')
+        else:
+            phrases.append('"' + " ".join(ngrams(word)) + '"')
+    return " AND ".join(phrases) or None
+
+
+def _enabled():
+    return connection.vendor == "sqlite"
+
+
+def _batches(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), BATCH):
+        yield ids[start:start + BATCH]
+
+
+def _delete(cursor, table, ids):
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor.execute(f"DELETE FROM {table} WHERE rowid IN ({placeholders})", ids)
+
+
+# ============================
+# 색인 갱신
+# ============================
+def reindex_recipes(recipe_ids):
+    """레시피 색인 행을 다시 만듦 (없어진 레시피는 삭제). 배치당 조회 2번 + DELETE/INSERT"""
+    if not _enabled():
+        return
+    for ids in _batches(set(recipe_ids)):
+        ingredient_names = defaultdict(list)
+        for recipe_id, name in (
+            RecipeIngredient.objects.filter(recipe_id__in=ids)
+            .values_list("recipe_id", "ingredient__ingredient_name")
+        ):
+            ingredient_names[recipe_id].append(name)
+        rows = [
+            (recipe_id, ngram_doc(name), ngram_doc(*ingredient_names[recipe_id]), ngram_doc(description))
+            for recipe_id, name, description in (
+                Recipe.objects.filter(pk__in=ids).values_list("recipe_id", "recipe_name", "description")
+            )
+        ]
+        with connection.cursor() as cursor:
+            _delete(cursor, RECIPE_TABLE, ids)
+            cursor.executemany(
+                f"INSERT INTO {RECIPE_TABLE} (rowid, name, ingredients, description) VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+
+
+def remove_recipe(recipe_id):
+    if not _enabled():
+        return
+    with connection.cursor() as cursor:
+        _delete(cursor, RECIPE_TABLE, [recipe_id])
+
+
+def reindex_ingredient(ingredient):
+    """재료 색인 갱신. 이름이 바뀌었으면 그 재료를 쓰는 레시피도 다시 색인"""
+    if not _enabled():
+        return
+    doc = ngram_doc(ingredient.ingredient_name)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT name FROM {INGREDIENT_TABLE} WHERE rowid = %s", [ingredient.pk])
+        old = cursor.fetchone()
+        if old is not None and old[0] == doc:
+            return
+        _delete(cursor, INGREDIENT_TABLE, [ingredient.pk])
+        cursor.execute(f"INSERT INTO {INGREDIENT_TABLE} (rowid, name) VALUES (%s, %s)", [ingredient.pk, doc])
+    if old is not None:
+        reindex_recipes(
+            RecipeIngredient.objects.filter(ingredient_id=ingredient.pk).values_list("recipe_id", flat=True)
+        )
+
+
+def remove_ingredient(ingredient_id):
+    if not _enabled():
+        return
+    with connection.cursor() as cursor:
+        _delete(cursor, INGREDIENT_TABLE, [ingredient_id])
+
+
+def rebuild():
+    """전체 재색인 (load_data 같은 bulk 로드 후)"""
+    if not _enabled():
+        return
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {RECIPE_TABLE}")
+        cursor.execute(f"DELETE FROM {INGREDIENT_TABLE}")
+        cursor.executemany(
+            f"INSERT INTO {INGREDIENT_TABLE} (rowid, name) VALUES (%s, %s)",
+            [(pk, ngram_doc(name)) for pk, name in Ingredient.objects.values_list("pk", "ingredient_name")],
+        )
+        reindex_recipes(Recipe.objects.values_list("pk", flat=True))
+
+
+# ============================
+# 검색
+# ============================
+def search_recipes(query, limit=20):
+    """관련도 순 recipe_id 목록"""
+    if not _enabled():
+        return list(
+            Recipe.objects.filter(
+                Q(recipe_name__icontains=query) | Q(description__icontains=query)
+                | Q(recipeingredient__ingredient__ingredient_name__icontains=query)
+            ).distinct().order_by("recipe_id").values_list("recipe_id", flat=True)[:limit]
+        )
+    expression = match_expression(query)
+    if expression is None:
+        return []
+    weights = ", ".join(map(str, RECIPE_WEIGHTS))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {RECIPE_TABLE} WHERE {RECIPE_TABLE} MATCH %s "
+            f"ORDER BY bm25({RECIPE_TABLE}, {weights}) LIMIT %s",
+            [f"{RANKED_COLUMNS} : ({expression})", limit],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+        remaining = limit - len(ids)
+        if remaining > 0:
+            cursor.execute(
+                f"SELECT rowid FROM {RECIPE_TABLE} WHERE {RECIPE_TABLE} MATCH %s LIMIT %s",
+                [expression, limit],
+            )
+            seen = set(ids)
+            ids += [row[0] for row in cursor.fetchall() if row[0] not in seen][:remaining]
+    return ids
+
+
+def search_ingredients(query, limit=20):
+    """관련도 순 ingredient_id 목록"""
+    if not _enabled():
+        return list(
+            Ingredient.objects.filter(ingredient_name__icontains=query)
+            .order_by("ingredient_id").values_list("ingredient_id", flat=True)[:limit]
+        )
+    expression = match_expression(query)
+    if expression is None:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {INGREDIENT_TABLE} WHERE {INGREDIENT_TABLE} MATCH %s "
+            f"ORDER BY bm25({INGREDIENT_TABLE}) LIMIT %s",
+            [expression, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
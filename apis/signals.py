@@ -0,0 +1,138 @@
+"""
+모델 변경 → 메모리 인덱스/캐시 무효화
+
+bulk_create / QuerySet.update 는 시그널을 보내지 않으므로
+그런 경로에서는 무효화 함수를 직접 호출해야 한다.
+load_data 처럼 끝나고 한 번에 갱신하는 bulk 작업은 suppressed() 안에서 돌려
+cascade 삭제가 보내는 행 단위 시그널을 건너뛴다.
+검색 재색인은 트랜잭션마다 레시피 id 를 모아 커밋 후 한 번만 한다.
+"""
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    RecipeIngredient, PersonAllergy, Person, AllergyIngredient, Allergy,
+    Recipe, Ingredient, Fridge, Like
+)
+from .matching import invalidate_recipe_index
+from .autocomplete import invalidate_ingredient_index
+from . import response_cache, search
+
+_local = threading.local()
+
+
+@contextmanager
+def suppressed():
+    """이 스레드의 모델 시그널 처리를 건너뜀 (호출한 쪽이 끝나고 직접 무효화/재색인)"""
+    previous = getattr(_local, "suppressed", False)
+    _local.suppressed = True
+    try:
+        yield
+    finally:
+        _local.suppressed = previous
+
+
+def _unless_suppressed(func):
+    @wraps(func)
+    def handler(*args, **kwargs):
+        if not getattr(_local, "suppressed", False):
+            func(*args, **kwargs)
+    return handler
+
+
+def _reindex_after_commit(recipe_id):
+    """
+    같은 트랜잭션의 변경을 모아 커밋 후 레시피별로 한 번만 재색인
+    콜백은 변경마다 등록하지만 처음 실행되는 콜백이 모인 id 를 모두 처리하고 나머지는 바로 끝난다.
+    (롤백되면 남은 id 는 다음 커밋 때 함께 재색인 - 커밋된 상태로 다시 만들므로 무해)
+    """
+    if not hasattr(_local, "recipe_ids"):
+        _local.recipe_ids = set()
+    _local.recipe_ids.add(recipe_id)
+    transaction.on_commit(_flush_reindex)
+
+
+def _flush_reindex():
+    recipe_ids = getattr(_local, "recipe_ids", None)
+    if recipe_ids:
+        _local.recipe_ids = set()
+        search.reindex_recipes(recipe_ids)
+
+
+@receiver([post_save, post_delete], sender=RecipeIngredient)
+@_unless_suppressed
+def recipe_ingredient_changed(sender, instance, **kwargs):
+    invalidate_recipe_index()
+    _reindex_after_commit(instance.recipe_id)
+    response_cache.bump_catalogue()
+
+
+@receiver(post_save, sender=Recipe)
+@_unless_suppressed
+def recipe_saved(sender, instance, **kwargs):
+    _reindex_after_commit(instance.pk)
+
+
+@receiver(post_delete, sender=Recipe)
+@_unless_suppressed
+def recipe_deleted(sender, instance, **kwargs):
+    search.remove_recipe(instance.pk)
+
+
+@receiver(post_save, sender=Ingredient)
+@_unless_suppressed
+def ingredient_saved(sender, instance, **kwargs):
+    invalidate_ingredient_index()
+    search.reindex_ingredient(instance)
+
+
+@receiver(post_delete, sender=Ingredient)
+@_unless_suppressed
+def ingredient_deleted(sender, instance, **kwargs):
+    invalidate_ingredient_index()
+    search.remove_ingredient(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Recipe)
+@receiver([post_save, post_delete], sender=Ingredient)
+@_unless_suppressed
+def catalogue_changed(sender, **kwargs):
+    response_cache.bump_catalogue()
+    # 트랜잭션 안이면 (Ingredient.save → recompute_expiry) 커밋 전에 들어온 요청이
+    # 예전 데이터를 새 버전으로 캐시할 수 있으므로 커밋 후 한 번 더 올림
+    transaction.on_commit(response_cache.bump_catalogue)
+
+
+@receiver([post_save, post_delete], sender=Fridge)
+@receiver([post_save, post_delete], sender=Like)
+@_unless_suppressed
+def user_data_changed(sender, instance, **kwargs):
+    # add_ingredient / delete_ingredient / toggle_like / Shopping.save() 자동 Fridge 생성
+    response_cache.bump_user(instance.person_id)
+
+
+@receiver([post_save, post_delete], sender=PersonAllergy)
+@_unless_suppressed
+def person_allergy_changed(sender, instance, **kwargs):
+    # 금지 재료 집합도 사용자 버전으로 무효화
+    response_cache.bump_user(instance.person_id)
+
+
+@receiver(post_save, sender=Person)
+@_unless_suppressed
+def person_changed(sender, instance, **kwargs):
+    # is_vegan 변경 가능성 (금지 재료 집합도 사용자 버전으로 무효화)
+    response_cache.bump_user(instance.p_id)
+
+
+@receiver([post_save, post_delete], sender=AllergyIngredient)
+@receiver([post_save, post_delete], sender=Allergy)
+@_unless_suppressed
+def allergy_mapping_changed(sender, **kwargs):
+    # 금지 재료 집합도 카탈로그 버전으로 무효화
+    response_cache.bump_catalogue()
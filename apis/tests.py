@@ -1,3 +1,1664 @@
-from django.test import TestCase
+import importlib
+import io
+import json
+import os
+import threading
+import time
+from concurrent import futures
+from unittest import mock
+from datetime import date, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from PIL import Image
+
+from .classification import cache_stats
+from .imaging import ImageTooLarge, prepare_for_llm
+from .exclusions import forbidden_ingredients
+from .expiry import scan_expiry, get_digest
+from . import search
+from . import thumbnails
+from . import views
+from .autocomplete import decompose, invalidate_ingredient_index
+from . import response_cache
+from .llm_stub import StubLLM
+from . import jobs
+from .matching import RecipeIndex, get_recipe_index, invalidate_recipe_index
+from .index_cache import SharedIndex
+from .models import (
+    Person, Ingredient, Recipe, RecipeIngredient, Like, Fridge,
+    Allergy, PersonAllergy, AllergyIngredient, Shopping, ExpiryWatermark, CacheVersion, ClassifyJob
+)
+
+
+def make_person(user_id="minjae01", **kwargs):
+    defaults = {"name": "박민재", "password_2": "1234", "address": "서울"}
+    defaults.update(kwargs)
+    return Person.objects.create(user_id=user_id, **defaults)
+
+
+def make_catalogue(n_recipes, n_ingredients=5, prefix="레시피"):
+    """레시피마다 n_ingredients개의 재료를 연결한 카탈로그 생성"""
+    ingredients = [
+        Ingredient.objects.get_or_create(
+            ingredient_name=f"재료{i}",
+            defaults={"unit": "g", "ingredient_category": "신선식품", "shelf_life": 3}
+        )[0]
+        for i in range(n_ingredients)
+    ]
+    recipes = Recipe.objects.bulk_create([
+        Recipe(recipe_name=f"{prefix}{i}", recipe_category="한식", description="설명")
+        for i in range(n_recipes)
+    ])
+    RecipeIngredient.objects.bulk_create([
+        RecipeIngredient(recipe=r, ingredient=ing, r_quantity=Decimal("1.5"))
+        for r in recipes for ing in ingredients
+    ])
+    return recipes, ingredients
+
+
+# ============================
+# 레시피 리스트 API
+# ============================
+class RecipeListApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.person = make_person()
+        self.url = reverse("recipe_list_api")
+        # 운영에서는 한 번 만들어진 CacheVersion 행이 계속 남음 → 첫 요청의 행 생성 쿼리를 미리 처리
+        response_cache.version_tag(self.person.p_id)
+
+    def test_payload(self):
+        recipes, _ = make_catalogue(2, n_ingredients=2)
+        Like.objects.create(person=self.person, recipe=recipes[0])
+
+        resp = self.client.get(self.url, {"user_id": "minjae01"})
+
+        self.assertEqual(resp.status_code, 200)
+        data = {r["id"]: r for r in resp.json()["recipes"]}
+        self.assertEqual(data[recipes[0].recipe_id]["ingredients"], "재료0 1.5g, 재료1 1.5g")
+        self.assertTrue(data[recipes[0].recipe_id]["favorite"])
+        self.assertFalse(data[recipes[1].recipe_id]["favorite"])
+
+    def test_query_count_is_constant(self):
+        """레시피 수가 늘어나도 쿼리 수는 고정 (person, like, recipe, recipeingredient)"""
+        make_catalogue(3)
+        # 첫 요청은 user_id → p_id(ETag용), 버전 조회, 금지 재료 집합 계산 쿼리 3개 추가
+        with self.assertNumQueries(7):
+            self.client.get(self.url, {"user_id": "minjae01"})
+        # 응답 캐시 hit → p_id + 버전 + person 조회만
+        with self.assertNumQueries(3):
+            self.client.get(self.url, {"user_id": "minjae01"})
+
+        make_catalogue(50, prefix="추가")
+        with self.assertNumQueries(6):
+            resp = self.client.get(self.url, {"user_id": "minjae01", "page_size": 100})
+        self.assertEqual(len(resp.json()["recipes"]), 53)
+
+    def test_cursor_pagination(self):
+        recipes, _ = make_catalogue(5, n_ingredients=1)
+        ids = [r.recipe_id for r in recipes]
+
+        first = self.client.get(self.url, {"user_id": "minjae01", "page_size": 2}).json()
+        self.assertEqual([r["id"] for r in first["recipes"]], ids[:2])
+        self.assertEqual(first["next"], ids[1])
+
+        seen = [r["id"] for r in first["recipes"]]
+        cursor = first["next"]
+        while cursor is not None:
+            page = self.client.get(
+                self.url, {"user_id": "minjae01", "page_size": 2, "cursor": cursor}
+            ).json()
+            seen += [r["id"] for r in page["recipes"]]
+            cursor = page["next"]
+        self.assertEqual(seen, ids)
+
+    def test_category_filter_and_bad_params(self):
+        make_catalogue(2, n_ingredients=1)
+        Recipe.objects.create(recipe_name="파스타", recipe_category="양식")
+
+        resp = self.client.get(self.url, {"user_id": "minjae01", "category": "양식"})
+        self.assertEqual([r["name"] for r in resp.json()["recipes"]], ["파스타"])
+
+        resp = self.client.get(self.url, {"user_id": "minjae01", "cursor": "abc"})
+        self.assertEqual(resp.status_code, 400)
+
+    @override_settings(API_STREAM_CHUNK_SIZE=2)
+    def test_stream_matches_paged_payload(self):
+        recipes, _ = make_catalogue(5, n_ingredients=2)
+        Like.objects.create(person=self.person, recipe=recipes[3])
+        paged = self.client.get(self.url, {"user_id": "minjae01", "page_size": 100}).json()
+
+        resp = self.client.get(self.url, {"user_id": "minjae01", "stream": 1})
+        self.assertTrue(resp.streaming)
+        self.assertEqual(json.loads(b"".join(resp.streaming_content)), paged)
+
+        resp = self.client.get(self.url, {"user_id": "minjae01", "stream": 1, "cursor": recipes[2].recipe_id})
+        streamed = json.loads(b"".join(resp.streaming_content))
+        self.assertEqual([r["id"] for r in streamed["recipes"]], [r.recipe_id for r in recipes[3:]])
+
+        Recipe.objects.all().delete()
+        resp = self.client.get(self.url, {"user_id": "minjae01", "stream": 1})
+        self.assertEqual(json.loads(b"".join(resp.streaming_content)), {"recipes": [], "next": None})
+
+    def test_list_never_reads_description(self):
+        make_catalogue(2, n_ingredients=1)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url, {"user_id": "minjae01"})
+        self.assertFalse(any("description" in q["sql"] for q in ctx.captured_queries))
+
+    def test_sparse_fields(self):
+        recipes, _ = make_catalogue(2, n_ingredients=1)
+        # ETag용 p_id + 버전 + person + 금지 재료 + 레시피 1 (재료 prefetch, 좋아요 조회 없음)
+        with self.assertNumQueries(5):
+            resp = self.client.get(self.url, {"user_id": "minjae01", "fields": "id,name"})
+        self.assertEqual(resp.json()["recipes"][0], {"id": recipes[0].recipe_id, "name": "레시피0"})
+
+        for bad in ("id,description", "id,nope"):
+            resp = self.client.get(self.url, {"user_id": "minjae01", "fields": bad})
+            self.assertEqual(resp.status_code, 400)
+
+    def test_detail(self):
+        recipes, _ = make_catalogue(1, n_ingredients=2)
+        Like.objects.create(person=self.person, recipe=recipes[0])
+        url = reverse("recipe_detail_api", args=[recipes[0].recipe_id])
+
+        data = self.client.get(url, {"user_id": "minjae01"}).json()
+        self.assertEqual(data["description"], "설명")
+        self.assertEqual(data["ingredients"], "재료0 1.5g, 재료1 1.5g")
+        self.assertTrue(data["favorite"])
+
+        self.assertEqual(self.client.get(url, {"fields": "name,description"}).json(),
+                         {"name": "레시피0", "description": "설명"})
+        self.assertEqual(self.client.get(reverse("recipe_detail_api", args=[999])).status_code, 404)
+
+
+class IngredientListTests(TestCase):
+    def test_pagination_and_category(self):
+        make_catalogue(0, n_ingredients=3)
+        Ingredient.objects.create(ingredient_name="우유", unit="ml", ingredient_category="유제품")
+        url = reverse("ingredient_list")
+
+        first = self.client.get(url, {"page_size": 2}).json()
+        self.assertEqual(len(first["ingredients"]), 2)
+        rest = self.client.get(url, {"page_size": 2, "cursor": first["next"]}).json()
+        self.assertEqual(len(rest["ingredients"]), 2)
+        self.assertIsNone(rest["next"])
+
+        dairy = self.client.get(url, {"category": "유제품"}).json()
+        self.assertEqual([i["name"] for i in dairy["ingredients"]], ["우유"])
+
+
+# ============================
+# 냉장고 ↔ 레시피 매칭
+# ============================
+class RecipeIndexTests(TestCase):
+    def test_ranking(self):
+        index = RecipeIndex([
+            (1, 10, 2), (1, 11, 1),             # 재료 둘 다 보유
+            (2, 10, 5), (2, 11, 1),             # 둘 다 보유, 10번 수량 부족
+            (3, 10, 1), (3, 12, 1),             # 12번 없음
+            (4, 13, 1),                         # 겹치는 재료 없음 → 제외
+        ])
+        fridge = {10: 3.0, 11: 1.0}
+
+        result = index.match(fridge)
+
+        self.assertEqual([m["recipe_id"] for m in result], [1, 2, 3])
+        self.assertEqual(result[1]["shortfall"], [(10, 2.0)])
+        self.assertEqual(result[2]["missing"], [12])
+        self.assertEqual(result[2]["coverage"], 0.5)
+
+    def test_exclusion_with_large_ingredient_ids(self):
+        # 재료 id 크기와 무관 (비트마스크였다면 2M 비트 정수)
+        big = 2_000_000
+        index = RecipeIndex([(1, big, 1), (1, 10, 1), (2, 10, 1)], recipe_ids=[1, 2, 3])
+        forbidden = frozenset({big})
+        self.assertFalse(index.is_safe(1, forbidden))
+        self.assertTrue(index.is_safe(2, forbidden))
+        self.assertTrue(index.is_safe(3, forbidden))   # 재료 없는 레시피
+        self.assertEqual([m["recipe_id"] for m in index.match({10: 1.0}, forbidden=forbidden)], [2])
+
+
+class CookableRecipesApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidate_recipe_index()
+        self.person = make_person()
+
+    def test_endpoint(self):
+        recipes, ingredients = make_catalogue(2, n_ingredients=2)
+        Fridge.objects.create(person=self.person, ingredient=ingredients[0], f_quantity=1)
+
+        resp = self.client.get(reverse("cookable_recipes_api"), {"user_id": "minjae01"})
+
+        self.assertEqual(resp.status_code, 200)
+        first = resp.json()["recipes"][0]
+        self.assertEqual(first["present"], ["재료0"])
+        self.assertEqual(first["missing"], ["재료1"])
+        self.assertEqual(first["shortfall"], [{"ingredient": "재료0", "quantity": 0.5, "unit": "g"}])
+
+    def test_index_invalidated_on_recipe_ingredient_write(self):
+        recipes, ingredients = make_catalogue(1, n_ingredients=1)
+        Fridge.objects.create(person=self.person, ingredient=ingredients[0], f_quantity=5)
+        url = reverse("cookable_recipes_api")
+        self.assertEqual(len(self.client.get(url, {"user_id": "minjae01"}).json()["recipes"]), 1)
+
+        new_recipe = Recipe.objects.create(recipe_name="새 레시피")
+        RecipeIngredient.objects.create(recipe=new_recipe, ingredient=ingredients[0], r_quantity=1)
+
+        self.assertEqual(len(self.client.get(url, {"user_id": "minjae01"}).json()["recipes"]), 2)
+
+    def test_limit_clamped(self):
+        recipes, ingredients = make_catalogue(3, n_ingredients=1)
+        Fridge.objects.create(person=self.person, ingredient=ingredients[0], f_quantity=5)
+        resp = self.client.get(reverse("cookable_recipes_api"), {"user_id": "minjae01", "limit": -1})
+        self.assertEqual(len(resp.json()["recipes"]), 1)
+
+    def test_invalidation_from_other_worker(self):
+        index = get_recipe_index()
+        self.assertIs(get_recipe_index(), index)
+        # 캐시가 비어 있어도 (다른 워커) 버전이 같으면 그대로 사용
+        cache.clear()
+        self.assertIs(get_recipe_index(), index)
+        # 다른 워커의 invalidate_recipe_index() = DB 버전 증가 (이 프로세스의 세대는 그대로)
+        CacheVersion.bump("index:recipe")
+        self.assertIsNot(get_recipe_index(), index)
+
+    def test_rebuild_racing_invalidation_not_installed(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            if len(builds) == 1:
+                shared.invalidate()  # 재구성 도중 변경 → 이 결과는 설치되면 안 됨
+            return len(builds)
+
+        shared = SharedIndex("test", build)
+        self.assertEqual(shared.get(), 1)
+        self.assertEqual(shared.get(), 2)
+        self.assertEqual(shared.get(), 2)
+
+
+# ============================
+# 알러지 / 비건 제외
+# ============================
+class ExclusionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidate_recipe_index()
+        self.person = make_person()
+        self.shrimp = Ingredient.objects.create(ingredient_name="새우", unit="g", ingredient_category="냉동")
+        self.tofu = Ingredient.objects.create(ingredient_name="두부", unit="모", ingredient_category="신선식품")
+        self.shellfish = Allergy.objects.create(allergy_name="갑각류")
+        self.vegan = Allergy.objects.create(allergy_name="비건")
+        AllergyIngredient.objects.create(ingredient=self.shrimp, allergy=self.shellfish)
+
+        self.shrimp_recipe = Recipe.objects.create(recipe_name="새우볶음밥")
+        self.tofu_recipe = Recipe.objects.create(recipe_name="두부조림")
+        RecipeIngredient.objects.create(recipe=self.shrimp_recipe, ingredient=self.shrimp, r_quantity=1)
+        RecipeIngredient.objects.create(recipe=self.tofu_recipe, ingredient=self.tofu, r_quantity=1)
+
+    def recipe_names(self, **params):
+        resp = self.client.get(reverse("recipe_list_api"), {"user_id": "minjae01", **params})
+        return [r["name"] for r in resp.json()["recipes"]]
+
+    def test_allergy_filters_recipe_list(self):
+        self.assertEqual(self.recipe_names(), ["새우볶음밥", "두부조림"])
+
+        PersonAllergy.objects.create(person=self.person, allergy=self.shellfish)
+        self.assertEqual(forbidden_ingredients(self.person), {self.shrimp.ingredient_id})
+        self.assertEqual(self.recipe_names(), ["두부조림"])
+
+    def test_filtered_pages_stay_full(self):
+        PersonAllergy.objects.create(person=self.person, allergy=self.shellfish)
+        extra = Recipe.objects.create(recipe_name="두부김치")
+        RecipeIngredient.objects.create(recipe=extra, ingredient=self.tofu, r_quantity=1)
+
+        self.assertEqual(self.recipe_names(page_size=2), ["두부조림", "두부김치"])
+
+    def test_recipe_missing_from_index_is_excluded(self):
+        PersonAllergy.objects.create(person=self.person, allergy=self.shellfish)
+        index = RecipeIndex.from_db()
+        empty = Recipe.objects.create(recipe_name="맹물")  # 재료 없음 → 스냅샷에 있으면 안전
+        forbidden = frozenset({self.shrimp.ingredient_id})
+        self.assertTrue(RecipeIndex.from_db().is_safe(empty.recipe_id, forbidden))
+        # 스냅샷 이후 추가된 레시피는 재료를 모르므로 제외 (fail closed)
+        self.assertFalse(index.is_safe(empty.recipe_id, forbidden))
+
+    def test_recipe_added_by_other_worker_not_hidden(self):
+        PersonAllergy.objects.create(person=self.person, allergy=self.shellfish)
+        self.assertEqual(self.recipe_names(), ["두부조림"])
+        # 다른 워커가 레시피를 추가하고 DB 버전을 올린 상황 (이 프로세스에는 시그널이 오지 않음)
+        [extra] = Recipe.objects.bulk_create([Recipe(recipe_name="두부김치")])
+        RecipeIngredient.objects.bulk_create([RecipeIngredient(recipe=extra, ingredient=self.tofu, r_quantity=1)])
+        CacheVersion.bump("index:recipe")
+        CacheVersion.bump(response_cache.CATALOGUE)
+        self.assertEqual(self.recipe_names(), ["두부조림", "두부김치"])
+
+    @override_settings(API_KEYSET_MAX_BATCHES=3)
+    def test_filtered_scan_is_bounded(self):
+        PersonAllergy.objects.create(person=self.person, allergy=self.shellfish)
+        shrimp = Recipe.objects.bulk_create([Recipe(recipe_name=f"새우{i}") for i in range(20)])
+        RecipeIngredient.objects.bulk_create([
+            RecipeIngredient(recipe=r, ingredient=self.shrimp, r_quantity=1) for r in shrimp
+        ])
+        invalidate_recipe_index()
+        url = reverse("recipe_list_api")
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(url, {"user_id": "minjae01", "page_size": 2}).json()
+        # 두부조림만 찾고 3구간(각 3행) 뒤 멈춤 → 덜 찬 페이지 + 이어서 읽을 cursor
+        self.assertEqual([r["name"] for r in data["recipes"]], ["두부조림"])
+        self.assertEqual(data["next"], shrimp[6].recipe_id)
+        self.assertLess(len(ctx), 20)
+
+        names, cursor = [], data["next"]
+        while cursor is not None:
+            data = self.client.get(url, {"user_id": "minjae01", "page_size": 2, "cursor": cursor}).json()
+            names += [r["name"] for r in data["recipes"]]
+            cursor = data["next"]
+        self.assertEqual(names, [])
+
+    def test_allergy_change_from_other_worker(self):
+        self.assertEqual(self.recipe_names(), ["새우볶음밥", "두부조림"])
+        # 다른 워커의 변경: 시그널 없이 행이 바뀌고 DB 의 사용자 버전만 올라감
+        PersonAllergy.objects.bulk_create([PersonAllergy(person=self.person, allergy=self.shellfish)])
+        CacheVersion.bump(f"user:{self.person.p_id}")
+        self.assertEqual(forbidden_ingredients(self.person), {self.shrimp.ingredient_id})
+        self.assertEqual(self.recipe_names(), ["두부조림"])
+
+    def test_vegan_and_mapping_invalidation(self):
+        self.person.is_vegan = True
+        self.person.save()
+        self.assertEqual(forbidden_ingredients(self.person), frozenset())
+
+        AllergyIngredient.objects.create(ingredient=self.tofu, allergy=self.vegan)
+        self.assertEqual(forbidden_ingredients(self.person), {self.tofu.ingredient_id})
+        self.assertEqual(self.recipe_names(), ["새우볶음밥"])
+
+
+# ============================
+# GPT 이미지 분석 캐시
+# ============================
+def tiny_jpeg(color):
+    """업로드 형식 검사를 통과하는 작은 JPEG (색으로 내용 구분)"""
+    out = io.BytesIO()
+    Image.new("RGB", (8, 8), color).save(out, format="JPEG")
+    return out.getvalue()
+
+
+@override_settings(CLASSIFY_LLM_BACKEND="apis.llm_stub.StubLLM")
+class ClassifyCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["classify"].clear()
+        StubLLM.reset()
+
+    def upload(self, data):
+        image = SimpleUploadedFile("fridge.jpg", data, content_type="image/jpeg")
+        return self.client.post(reverse("classify_query"), {"image": image})
+
+    def test_same_image_hits_cache(self):
+        first = self.upload(tiny_jpeg((200, 0, 0)))
+        second = self.upload(tiny_jpeg((200, 0, 0)))
+        self.upload(tiny_jpeg((0, 200, 0)))
+
+        self.assertEqual(first["X-Classify-Cache"], "MISS")
+        self.assertEqual(second["X-Classify-Cache"], "HIT")
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(StubLLM.calls, 2)
+        self.assertEqual(cache_stats()["hits"], 1)
+        self.assertEqual(cache_stats()["misses"], 2)
+
+    def test_missing_image(self):
+        self.assertEqual(self.client.post(reverse("classify_query")).status_code, 400)
+
+
+def make_photo(width=3000, height=2000):
+    """휴대폰 사진 크기의 노이즈 JPEG (압축이 잘 안 되도록 랜덤 픽셀)"""
+    img = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=95)
+    return out.getvalue()
+
+
+@override_settings(CLASSIFY_LLM_BACKEND="apis.llm_stub.StubLLM")
+class ImagePreprocessTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["classify"].clear()
+
+    def test_downscale_and_reencode(self):
+        photo = SimpleUploadedFile("big.jpg", make_photo(), content_type="image/jpeg")
+
+        prepared = prepare_for_llm(photo)
+
+        self.assertEqual((prepared.width, prepared.height), (1152, 768))
+        self.assertEqual(prepared.media_type, "image/jpeg")
+        self.assertLess(len(prepared.data), prepared.original_bytes)
+
+    def test_not_an_image_is_sent_as_is(self):
+        prepared = prepare_for_llm(SimpleUploadedFile("x.jpg", b"not-an-image"))
+        self.assertEqual(prepared.data, b"not-an-image")
+
+    def test_response_reports_bytes_saved(self):
+        data = make_photo()
+        image = SimpleUploadedFile("big.jpg", data, content_type="image/jpeg")
+        resp = self.client.post(reverse("classify_query"), {"image": image})
+
+        self.assertEqual(int(resp["X-Image-Original-Bytes"]), len(data))
+        self.assertGreater(int(resp["X-Image-Bytes-Saved"]), 0)
+
+    @mock.patch.object(Image, "MAX_IMAGE_PIXELS", 10)
+    def test_decompression_bomb_rejected(self):
+        # 8x8 = 64픽셀 > MAX_IMAGE_PIXELS * 2 → DecompressionBombError (OSError 아님)
+        with self.assertRaises(ImageTooLarge):
+            prepare_for_llm(SimpleUploadedFile("bomb.jpg", tiny_jpeg((0, 0, 0))))
+        image = SimpleUploadedFile("bomb.jpg", tiny_jpeg((0, 0, 0)), content_type="image/jpeg")
+        resp = self.client.post(reverse("classify_query"), {"image": image})
+        self.assertEqual(resp.status_code, 413)
+
+
+class RecordingExecutor(futures.ThreadPoolExecutor):
+    """job_id → Future 를 기억하는 executor (테스트에서 작업이 끝날 때까지 기다리는 용도)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.futures = {}
+        self.args = {}
+
+    def submit(self, fn, job_id, *args, **kwargs):
+        self.args[job_id] = args
+        future = self.futures[job_id] = super().submit(fn, job_id, *args, **kwargs)
+        return future
+
+
+@override_settings(
+    CLASSIFY_LLM_BACKEND="apis.llm_stub.StubLLM",
+    CLASSIFY_LLM_CONCURRENCY=2,
+)
+class ClassifyJobTests(TransactionTestCase):
+    # 작업 스레드가 자기 연결로 상태를 쓰므로 테스트 트랜잭션으로 감싸지 않음
+    def setUp(self):
+        cache.clear()
+        caches["classify"].clear()
+        StubLLM.reset()
+        self.addCleanup(StubLLM.reset)
+        self.executor = RecordingExecutor(max_workers=settings.CLASSIFY_WORKERS)
+        self.addCleanup(self.executor.shutdown)
+        patcher = mock.patch.object(jobs, "_get_executor", return_value=self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def submit(self, data):
+        image = SimpleUploadedFile("fridge.jpg", data, content_type="image/jpeg")
+        return self.client.post(reverse("classify_query") + "?mode=async", {"image": image})
+
+    def wait(self, resp):
+        job_id = resp.json()["job_id"]
+        futures.wait([self.executor.futures[job_id]], timeout=10)
+        # 다른 워커로 조회가 가도 보이도록 상태는 DB 에서 읽음
+        job = self.client.get(resp.json()["status_url"]).json()
+        self.assertIn(job["status"], (jobs.DONE, jobs.ERROR), "작업이 제한 시간 안에 끝나지 않았습니다.")
+        return job
+
+    def test_async_jobs_respect_llm_concurrency(self):
+        # LLM 응답을 막아 둔 상태에서도 업로드 응답은 바로 온다
+        StubLLM.gate = threading.Event()
+        self.addCleanup(StubLLM.gate.set)
+        submitted = [self.submit(tiny_jpeg((i * 40, 0, 0))) for i in range(6)]
+        for resp in submitted:
+            self.assertEqual(resp.status_code, 202)
+            self.assertEqual(resp.json()["status"], jobs.PENDING)
+
+        # 작업 스레드 4개 중 LLM 에 들어간 것은 동시 호출 제한(2)만큼
+        for _ in range(2):
+            self.assertTrue(StubLLM.entered.acquire(timeout=10))
+        self.assertEqual(StubLLM.active, 2)
+        StubLLM.gate.set()
+
+        for resp in submitted:
+            job = self.wait(resp)
+            self.assertEqual(job["status"], jobs.DONE)
+            self.assertIn("계란", job["result"])
+
+        self.assertEqual(StubLLM.calls, 6)
+        self.assertEqual(StubLLM.max_active, 2)
+
+    def test_unknown_job(self):
+        resp = self.client.get(reverse("classify_job", args=["nope"]))
+        self.assertEqual(resp.status_code, 404)
+
+    @override_settings(CLASSIFY_MAX_PENDING=0)
+    def test_queue_full(self):
+        self.assertEqual(self.submit(tiny_jpeg((0, 0, 0))).status_code, 429)
+
+    @override_settings(CLASSIFY_MAX_PENDING=0)
+    def test_cache_hit_skips_preprocessing_and_queue(self):
+        data = tiny_jpeg((0, 0, 0))
+        image = SimpleUploadedFile("fridge.jpg", data, content_type="image/jpeg")
+        self.client.post(reverse("classify_query"), {"image": image})
+
+        with mock.patch("apis.jobs.prepare_for_llm") as prepare:
+            resp = self.submit(data)
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(resp.json()["status"], jobs.DONE)
+        self.assertTrue(self.client.get(resp.json()["status_url"]).json()["cached"])
+        prepare.assert_not_called()
+        self.assertEqual(StubLLM.calls, 1)
+
+    def test_preprocessing_runs_in_job(self):
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 10):
+            resp = self.submit(tiny_jpeg((0, 0, 0)))
+            self.assertEqual(resp.status_code, 202)
+            job = self.wait(resp)
+        self.assertEqual(job["status"], jobs.ERROR)
+        self.assertEqual(StubLLM.calls, 0)
+
+    def test_upload_spooled_to_temp_file_and_removed(self):
+        StubLLM.gate = threading.Event()
+        self.addCleanup(StubLLM.gate.set)
+        data = tiny_jpeg((0, 0, 0))
+        resp = self.submit(data)
+        path = self.executor.args[resp.json()["job_id"]][1]
+        self.assertTrue(StubLLM.entered.acquire(timeout=10))
+        # 작업 중에는 임시 파일에 원본 그대로
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), data)
+        StubLLM.gate.set()
+        self.assertEqual(self.wait(resp)["status"], jobs.DONE)
+        self.assertFalse(os.path.exists(path))
+
+    def test_status_visible_from_other_worker(self):
+        resp = self.submit(tiny_jpeg((0, 0, 0)))
+        self.wait(resp)
+        # 작업을 돌린 워커의 캐시가 없어도 (다른 워커) DB 에서 조회
+        cache.clear()
+        self.assertEqual(ClassifyJob.objects.get(pk=resp.json()["job_id"]).status, jobs.DONE)
+        self.assertEqual(self.client.get(resp.json()["status_url"]).json()["status"], jobs.DONE)
+
+    def test_expired_job_not_found(self):
+        resp = self.submit(tiny_jpeg((0, 0, 0)))
+        self.wait(resp)
+        with override_settings(CLASSIFY_JOB_TIMEOUT=0):
+            self.assertEqual(self.client.get(resp.json()["status_url"]).status_code, 404)
+
+
+# ============================
+# CSV 로더 (manage.py load_data)
+# ============================
+class LoadDataCommandTests(TestCase):
+    def test_loads_shipped_csv(self):
+        make_person("minjae01", name="옛이름")
+        out = io.StringIO()
+
+        call_command("load_data", stdout=out)
+
+        # Person은 user_id 기준으로 갱신 (중복 생성 없음)
+        self.assertEqual(Person.objects.filter(user_id="minjae01").count(), 1)
+        self.assertEqual(Person.objects.get(user_id="minjae01").name, "박민재")
+        self.assertEqual(Recipe.objects.count(), 11)
+        self.assertTrue(RecipeIngredient.objects.filter(recipe__recipe_name="김치찌개").exists())
+        # Shopping.save() 부수효과(단가 계산 + Fridge 자동 생성) 유지
+        shopping = Shopping.objects.select_related("ingredient").first()
+        self.assertEqual(shopping.unit_price, shopping.ingredient.price)
+        self.assertTrue(shopping.added_to_fridge)
+        self.assertFalse(Fridge.objects.filter(expiry_date__isnull=True).exists())
+        self.assertIn("rows/s", out.getvalue())
+
+    def test_reload_skips_row_signals(self):
+        call_command("load_data", stdout=io.StringIO())
+        Like.objects.all().delete()
+        with CaptureQueriesContext(connection) as first:
+            call_command("load_data", only=["recipe", "recipe_ingredient"], stdout=io.StringIO())
+        # cascade 삭제의 행 단위 재색인/버전 증가 없이 끝에서 한 번에 → 행 수와 무관
+        RecipeIngredient.objects.bulk_create([
+            RecipeIngredient(recipe=recipe, ingredient=Ingredient.objects.first(), r_quantity=1)
+            for recipe in Recipe.objects.all()
+        ])
+        with CaptureQueriesContext(connection) as second:
+            call_command("load_data", only=["recipe", "recipe_ingredient"], stdout=io.StringIO())
+        self.assertEqual(len(first), len(second))
+        self.assertEqual(search.search_recipes("김치찌개"), [Recipe.objects.get(recipe_name="김치찌개").pk])
+
+    def test_only_reloads_selected_tables(self):
+        call_command("load_data", stdout=io.StringIO())
+        call_command("load_data", only=["like"], stdout=io.StringIO())
+        self.assertEqual(Like.objects.count(), 3)
+        self.assertEqual(Recipe.objects.count(), 11)
+
+
+# ============================
+# Fridge / Shopping bulk 삽입
+# ============================
+class BulkIngestTests(TestCase):
+    FIELDS = ("person_id", "ingredient_id", "quantity", "unit_price", "price",
+              "purchased_date", "added_to_fridge")
+    FRIDGE_FIELDS = ("person_id", "ingredient_id", "f_quantity", "added_date", "expiry_date")
+
+    def setUp(self):
+        self.person = make_person()
+        self.onion = Ingredient.objects.create(
+            ingredient_name="양파", unit="개", ingredient_category="신선식품", price=Decimal("800"), shelf_life=7
+        )
+        self.milk = Ingredient.objects.create(
+            ingredient_name="우유", unit="ml", ingredient_category="유제품", price=Decimal("2500"), shelf_life=0
+        )
+
+    def purchases(self):
+        return [
+            Shopping(person=self.person, ingredient=self.onion, quantity=Decimal("3"),
+                     purchased_date=date(2025, 11, 20)),
+            Shopping(person=self.person, ingredient=self.milk, quantity=Decimal("1.5"),
+                     purchased_date=date(2025, 11, 19)),
+        ]
+
+    def snapshot(self):
+        shopping = [
+            tuple(getattr(s, f) for f in self.FIELDS)
+            + tuple(getattr(s.fridge_record, f) for f in self.FRIDGE_FIELDS)
+            for s in Shopping.objects.select_related("fridge_record").order_by("ingredient_id")
+        ]
+        fridge = sorted(Fridge.objects.values_list(*self.FRIDGE_FIELDS), key=str)
+        return shopping, fridge
+
+    def test_shopping_bulk_matches_save(self):
+        for purchase in self.purchases():
+            purchase.save()
+        expected = self.snapshot()
+        Shopping.objects.all().delete()
+        Fridge.objects.all().delete()
+
+        # 재료 조회 1 + Fridge INSERT 1 + Shopping INSERT 1 (+ savepoint 2), 건수와 무관
+        with self.assertNumQueries(5):
+            Shopping.objects.bulk_ingest(self.purchases())
+
+        self.assertEqual(self.snapshot(), expected)
+
+    def test_fridge_bulk_matches_save(self):
+        rows = [(self.onion, date(2025, 10, 21)), (self.milk, date(2025, 10, 30)), (self.onion, None)]
+        for ingredient, added in rows:
+            Fridge.objects.create(person=self.person, ingredient=ingredient, f_quantity=1, added_date=added)
+        expected = sorted(Fridge.objects.values_list(*self.FRIDGE_FIELDS), key=str)
+        Fridge.objects.all().delete()
+
+        Fridge.objects.bulk_ingest(
+            Fridge(person=self.person, ingredient=ingredient, f_quantity=1, added_date=added)
+            for ingredient, added in rows
+        )
+
+        self.assertEqual(sorted(Fridge.objects.values_list(*self.FRIDGE_FIELDS), key=str), expected)
+
+
+# ============================
+# shelf_life 변경 → expiry_date 일괄 재계산
+# ============================
+class RecomputeExpiryTests(TestCase):
+    def setUp(self):
+        self.person = make_person()
+        self.tofu = Ingredient.objects.create(
+            ingredient_name="두부", unit="모", ingredient_category="신선식품", shelf_life=3
+        )
+        self.milk = Ingredient.objects.create(
+            ingredient_name="우유", unit="ml", ingredient_category="유제품", shelf_life=7
+        )
+        for ingredient in (self.tofu, self.tofu, self.milk):
+            Fridge.objects.create(person=self.person, ingredient=ingredient, f_quantity=1,
+                                  added_date=date(2025, 11, 1))
+        Fridge.objects.create(person=self.person, ingredient=self.tofu, f_quantity=1)
+
+    def expiries(self, ingredient):
+        return sorted(Fridge.objects.filter(ingredient=ingredient).values_list("expiry_date", flat=True), key=str)
+
+    def test_shelf_life_change_updates_fridge_in_one_statement(self):
+        self.tofu.shelf_life = 5
+        with CaptureQueriesContext(connection) as ctx:
+            self.tofu.save()
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "apis_fridge"')]
+        self.assertEqual(len(updates), 1)
+
+        self.assertEqual(self.expiries(self.tofu), [date(2025, 11, 6), date(2025, 11, 6), None])
+        self.assertEqual(self.expiries(self.milk), [date(2025, 11, 8)])
+
+        # 다른 필드만 바뀌면 재계산하지 않음
+        self.tofu.price = Decimal("1500")
+        with CaptureQueriesContext(connection) as ctx:
+            self.tofu.save()
+        self.assertFalse(any(q["sql"].startswith('UPDATE "apis_fridge"') for q in ctx.captured_queries))
+
+    def test_cache_bumped_after_recompute_commits(self):
+        seen = []
+        bump = response_cache.bump_catalogue
+        with mock.patch.object(response_cache, "bump_catalogue",
+                               side_effect=lambda: (seen.append(self.expiries(self.tofu)), bump())):
+            self.tofu.shelf_life = 5
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                self.tofu.save()
+        self.assertEqual(len(callbacks), 1)
+        # 마지막 버전 증가는 재계산 결과가 반영된 뒤
+        self.assertEqual(seen[-1], [date(2025, 11, 6), date(2025, 11, 6), None])
+
+    def test_save_and_recompute_are_atomic(self):
+        self.tofu.shelf_life = 5
+        with mock.patch.object(Fridge.objects, "recompute_expiry", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.tofu.save()
+        self.assertEqual(Ingredient.objects.get(pk=self.tofu.pk).shelf_life, 3)
+
+    def test_command_recomputes_whole_table(self):
+        Ingredient.objects.filter(pk=self.milk.pk).update(shelf_life=2)
+        Ingredient.objects.filter(pk=self.tofu.pk).update(shelf_life=0)
+        call_command("recompute_expiry", stdout=io.StringIO())
+
+        self.assertEqual(self.expiries(self.milk), [date(2025, 11, 3)])
+        # shelf_life 0 은 save()와 같이 기존 값 유지
+        self.assertEqual(self.expiries(self.tofu), [date(2025, 11, 4), date(2025, 11, 4), None])
+
+
+# ============================
+# 조회 키 인덱스 (SQLite 쿼리 플랜)
+# ============================
+class LookupIndexTests(TestCase):
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        self.assertIn("USING", plan)
+        self.assertIn("INDEX", plan)
+        self.assertNotRegex(plan, r"SCAN apis_\w+\s*$")
+
+    def test_lookups_use_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite 쿼리 플랜 전용")
+        today = date(2025, 11, 1)
+        self.assertUsesIndex(Person.objects.filter(user_id="minjae01"))
+        self.assertUsesIndex(Ingredient.objects.filter(ingredient_name="두부"))
+        self.assertUsesIndex(Recipe.objects.filter(recipe_name="김치찌개"))
+        self.assertUsesIndex(Fridge.objects.filter(person_id=1, expiry_date__lte=today))
+        self.assertIn("fridge_person_expiry_idx",
+                      Fridge.objects.filter(person_id=1, expiry_date__lte=today).explain())
+
+
+# ============================
+# 사용자별 응답 캐시
+# ============================
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidate_recipe_index()
+        self.person = make_person()
+        self.recipes, self.ingredients = make_catalogue(2, n_ingredients=1)
+
+    def get(self, name):
+        return self.client.get(reverse(name), {"user_id": "minjae01"}).json()
+
+    def test_fridge_items_invalidated_by_fridge_writes(self):
+        self.assertEqual(self.get("fridge_items_api")["items"], [])
+        self.assertEqual(self.get("fridge_items_api")["items"], [])
+
+        item = Fridge.objects.create(person=self.person, ingredient=self.ingredients[0],
+                                     f_quantity=2, added_date=date(2025, 11, 1))
+        self.assertEqual(len(self.get("fridge_items_api")["items"]), 1)
+
+        # 다른 사용자의 변경은 이 사용자 캐시에 영향 없음
+        other = make_person("hansuk02")
+        Fridge.objects.create(person=other, ingredient=self.ingredients[0],
+                              f_quantity=1, added_date=date(2025, 11, 1))
+        self.assertEqual(len(self.get("fridge_items_api")["items"]), 1)
+
+        self.client.get(reverse("delete_ingredient", args=[item.fridge_id]))
+        self.assertEqual(self.get("fridge_items_api")["items"], [])
+
+        stats = response_cache.stats()["fridge_items"]
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 3))
+        self.assertEqual(stats["stale_reads"], 0)
+
+    def test_recipe_list_invalidated_by_like_and_catalogue_writes(self):
+        self.assertFalse(self.get("recipe_list_api")["recipes"][0]["favorite"])
+
+        self.client.get(reverse("toggle_like", args=[self.recipes[0].recipe_id]))
+        self.assertTrue(self.get("recipe_list_api")["recipes"][0]["favorite"])
+
+        Recipe.objects.filter(pk=self.recipes[1].pk).first().delete()
+        self.assertEqual(len(self.get("recipe_list_api")["recipes"]), 1)
+
+        Shopping(person=self.person, ingredient=self.ingredients[0], quantity=1,
+                 purchased_date=date(2025, 11, 1)).save()
+        self.assertEqual(len(self.get("fridge_items_api")["items"]), 1)
+
+    def test_stats_endpoint(self):
+        self.get("recipe_list_api")
+        self.get("recipe_list_api")
+        # 익명 / 일반 사용자는 볼 수 없음
+        self.assertIn(self.client.get(reverse("cache_stats_api")).status_code, (401, 403))
+        from django.contrib.auth.models import User
+        self.client.force_login(User.objects.create_user("user", password="pw"))
+        self.assertEqual(self.client.get(reverse("cache_stats_api")).status_code, 403)
+
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+        stats = self.client.get(reverse("cache_stats_api")).json()
+        self.assertEqual(stats["responses"]["recipes"]["hit_ratio"], 0.5)
+
+
+# ============================
+# 조건부 GET (ETag / 304)
+# ============================
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.person = make_person()
+        self.recipes, self.ingredients = make_catalogue(2, n_ingredients=1)
+
+    def test_ingredient_list_304_with_version_lookup_only(self):
+        url = reverse("ingredient_list")
+        first = self.client.get(url)
+        self.assertTrue(first.has_header("ETag"))
+
+        # 버전 조회 1번 (ETag / Last-Modified 공용)
+        with self.assertNumQueries(1):
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(resp.status_code, 304)
+
+        # 다른 페이지는 다른 ETag
+        self.assertNotEqual(self.client.get(url, {"page_size": 1})["ETag"], first["ETag"])
+
+        Ingredient.objects.create(ingredient_name="우유", unit="ml", ingredient_category="유제품")
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], first["ETag"])
+
+    def test_recipe_list_etag_follows_user_writes(self):
+        url = reverse("recipe_list_api")
+        params = {"user_id": "minjae01"}
+        first = self.client.get(url, params)
+
+        # user_id → p_id + 버전 조회
+        with self.assertNumQueries(2):
+            resp = self.client.get(url, params, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(resp.status_code, 304)
+
+        # 다른 사용자의 좋아요는 영향 없음
+        other = make_person("hansuk02")
+        Like.objects.create(person=other, recipe=self.recipes[0])
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        Like.objects.create(person=self.person, recipe=self.recipes[0])
+        resp = self.client.get(url, params, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.json()["recipes"][0]["favorite"])
+
+    def test_versions_shared_across_workers(self):
+        url = reverse("ingredient_list")
+        first = self.client.get(url)
+        # 캐시가 비어 있는 다른 워커도 같은 ETag
+        cache.clear()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        # 다른 워커의 쓰기는 이 프로세스의 캐시를 거치지 않고 DB 버전만 올림
+        CacheVersion.bump(response_cache.CATALOGUE)
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], first["ETag"])
+
+    def test_last_modified_withheld_within_same_second(self):
+        url = reverse("ingredient_list")
+        Ingredient.objects.create(ingredient_name="우유", unit="ml", ingredient_category="유제품")
+        # 방금 쓴 직후에는 Last-Modified 없이 ETag 만 → 같은 초의 다음 쓰기도 놓치지 않음
+        self.assertFalse(self.client.get(url).has_header("Last-Modified"))
+
+        with mock.patch("apis.response_cache.time.time", return_value=time.time() + 2):
+            first = self.client.get(url)
+            self.assertTrue(first.has_header("Last-Modified"))
+            self.assertEqual(
+                self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code, 304
+            )
+
+    def test_person_id_follows_user_id_change(self):
+        self.assertEqual(response_cache.person_id_for("minjae01"), self.person.p_id)
+        self.person.user_id = "minjae02"
+        self.person.save()
+        self.assertIsNone(response_cache.person_id_for("minjae01"))
+        self.assertEqual(response_cache.person_id_for("minjae02"), self.person.p_id)
+
+        # 같은 user_id 로 다른 사용자가 생기면 새 p_id
+        newcomer = make_person("minjae01")
+        self.assertEqual(response_cache.person_id_for("minjae01"), newcomer.p_id)
+
+        # 다른 워커에서의 변경 (이 프로세스에 시그널이 오지 않음) 도 바로 반영
+        Person.objects.filter(pk=newcomer.pk).update(user_id="minjae03")
+        self.assertIsNone(response_cache.person_id_for("minjae01"))
+
+
+# ============================
+# 유통기한 스캐너 / 임박 재료 API
+# ============================
+class ExpiryScanTests(TestCase):
+    TODAY = date(2025, 11, 1)
+
+    def setUp(self):
+        cache.clear()
+        self.person = make_person()
+        self.other = make_person("hansuk02")
+        # shelf_life=0 이면 save()가 expiry_date를 덮어쓰지 않음
+        self.tofu = Ingredient.objects.create(
+            ingredient_name="두부", unit="모", ingredient_category="신선식품", shelf_life=0
+        )
+
+    def put(self, person, days_left):
+        return Fridge.objects.create(
+            person=person, ingredient=self.tofu, f_quantity=1,
+            expiry_date=self.TODAY + timedelta(days=days_left)
+        )
+
+    def scanned_ids(self, digests):
+        return sorted(item[0] for items in digests.values() for item in items)
+
+    def test_scan_never_rereads_processed_rows(self):
+        soon = [self.put(self.person, 0), self.put(self.other, 2)]
+        self.put(self.person, 10)
+
+        digests = scan_expiry(days=3, today=self.TODAY)
+        self.assertEqual(self.scanned_ids(digests), sorted(f.fridge_id for f in soon))
+        self.assertEqual(len(get_digest(self.person.p_id)), 1)
+
+        # 같은 날 다시 돌리면 새로 읽을 행이 없음
+        self.assertEqual(scan_expiry(days=3, today=self.TODAY), {})
+
+        # 다음 날은 늘어난 구간만
+        later = self.put(self.person, 4)
+        digests = scan_expiry(days=3, today=self.TODAY + timedelta(days=1))
+        self.assertEqual(self.scanned_ids(digests), [later.fridge_id])
+        self.assertEqual(len(get_digest(self.person.p_id)), 2)
+
+    def test_late_insert_behind_watermark_is_caught(self):
+        self.put(self.person, 2)
+        scan_expiry(days=3, today=self.TODAY)
+        mark = ExpiryWatermark.objects.get(name="default")
+        self.assertEqual(mark.last_expiry_date, self.TODAY + timedelta(days=2))
+
+        # 워터마크보다 이른 만료일로 나중에 추가된 행
+        late = [self.put(self.other, 1), self.put(self.other, 2)]
+        digests = scan_expiry(days=3, today=self.TODAY)
+        self.assertEqual(self.scanned_ids(digests), [f.fridge_id for f in late])
+        self.assertEqual(scan_expiry(days=3, today=self.TODAY), {})
+
+    def test_digest_survives_process_cache(self):
+        item = self.put(self.person, 1)
+        scan_expiry(days=3, today=self.TODAY)
+        # cron 프로세스가 끝난 뒤 (프로세스별 캐시 없음) 웹 프로세스에서 읽기
+        cache.clear()
+        self.assertEqual([row[0] for row in get_digest(self.person.p_id)], [item.fridge_id])
+
+    def test_changed_expiry_behind_watermark_is_rescanned(self):
+        milk = Ingredient.objects.create(ingredient_name="우유", unit="개", ingredient_category="유제품",
+                                         shelf_life=30)
+        self.put(self.person, 2)
+        item = Fridge.objects.create(person=self.other, ingredient=milk, f_quantity=1, added_date=self.TODAY)
+        scan_expiry(days=3, today=self.TODAY)
+
+        # bulk_change 로 이미 지나간 구간(+1일)으로 옮겨진 행
+        item.added_date = self.TODAY - timedelta(days=29)
+        Fridge.objects.bulk_change([item])
+        self.assertIn(item.fridge_id, self.scanned_ids(scan_expiry(days=3, today=self.TODAY)))
+
+        # 재료 shelf_life 변경 (recompute_expiry) 도 마찬가지
+        item.added_date = self.TODAY
+        Fridge.objects.bulk_change([item])
+        scan_expiry(days=3, today=self.TODAY)
+        milk.shelf_life = 2
+        milk.save()
+        self.assertIn(item.fridge_id, self.scanned_ids(scan_expiry(days=3, today=self.TODAY)))
+        self.assertEqual(get_digest(self.other.p_id)[0][3], self.TODAY + timedelta(days=2))
+
+    def test_batches_resume_within_same_date(self):
+        rows = [self.put(self.person, 1) for _ in range(5)]
+        digests = scan_expiry(days=3, batch_size=2, today=self.TODAY)
+        self.assertEqual(self.scanned_ids(digests), [f.fridge_id for f in rows])
+
+    def test_expiring_api(self):
+        today = timezone.localdate()
+        for person, days_left in [(self.person, 1), (self.person, 5), (self.person, -1), (self.other, 1)]:
+            Fridge.objects.create(person=person, ingredient=self.tofu, f_quantity=1,
+                                  expiry_date=today + timedelta(days=days_left))
+        url = reverse("expiring_items_api")
+
+        resp = self.client.get(url, {"user_id": "minjae01", "days": 3})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([item["days_left"] for item in resp.json()["items"]], [1])
+        resp = self.client.get(url, {"user_id": "minjae01", "days": 7})
+        self.assertEqual([item["days_left"] for item in resp.json()["items"]], [1, 5])
+
+        self.assertEqual(self.client.get(url, {"user_id": "minjae01", "days": "x"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"user_id": "nobody"}).status_code, 404)
+
+
+# ============================
+# 2-gram 검색
+# ============================
+class SearchTests(TestCase):
+    def setUp(self):
+        self.kimchi = Ingredient.objects.create(ingredient_name="신김치", unit="g", ingredient_category="김치류")
+        self.tofu = Ingredient.objects.create(ingredient_name="두부", unit="모", ingredient_category="신선식품")
+        # 레시피 재색인은 커밋 후 → 테스트 트랜잭션 안에서는 콜백을 직접 실행
+        with self.captureOnCommitCallbacks(execute=True):
+            self.stew = Recipe.objects.create(recipe_name="김치찌개", recipe_category="한식",
+                                              description="신김치와 돼지고기를 볶다가 물을 붓고 끓인다.")
+            self.soup = Recipe.objects.create(recipe_name="된장국", recipe_category="한식",
+                                              description="두부를 썰어 넣고 한소끔 끓인다. 김치를 곁들인다.")
+            RecipeIngredient.objects.create(recipe=self.stew, ingredient=self.kimchi, r_quantity=1)
+            RecipeIngredient.objects.create(recipe=self.soup, ingredient=self.tofu, r_quantity=1)
+        self.url = reverse("search_api")
+
+    def test_ngrams(self):
+        self.assertEqual(search.ngrams("김치찌개 a"), ["김치", "치찌", "찌개", "a"])
+        self.assertEqual(search.match_expression("김치 찌개"), '"김치" AND "찌개"')
+        self.assertIsNone(search.match_expression("!!"))
+
+    def test_ranked_by_field_weight(self):
+        # 이름에 있는 레시피가 조리법에만 있는 레시피보다 먼저
+        self.assertEqual(search.search_recipes("김치"), [self.stew.recipe_id, self.soup.recipe_id])
+        self.assertEqual(search.search_recipes("두부"), [self.soup.recipe_id])
+        # 부분 문자열 (2-gram phrase) 과 여러 단어 AND
+        self.assertEqual(search.search_recipes("치찌"), [self.stew.recipe_id])
+        self.assertEqual(search.search_recipes("돼지 김치"), [self.stew.recipe_id])
+        self.assertEqual(search.search_recipes("김치볶음밥"), [])
+        # 한 글자는 그 글자로 시작하는 2-gram
+        self.assertEqual(search.search_recipes("두"), [self.soup.recipe_id])
+
+    def test_index_updates_incrementally(self):
+        resp = self.client.post(reverse("add_recipe"), {
+            "name": "두부조림", "category": "한식", "description": "간장에 조린다.",
+            "ingredients": json.dumps(["두부"]),
+        })
+        self.assertEqual(resp.status_code, 201)
+        new_id = resp.json()["recipe_id"]
+        self.assertEqual(search.search_recipes("조림"), [new_id])
+        self.assertIn(new_id, search.search_recipes("두부"))
+
+        # 재료 이름이 바뀌면 그 재료를 쓰는 레시피도 다시 색인
+        self.tofu.ingredient_name = "순두부"
+        self.tofu.save()
+        self.assertEqual(search.search_ingredients("순두"), [self.tofu.ingredient_id])
+        self.assertEqual(sorted(search.search_recipes("순두")), [self.soup.recipe_id, new_id])
+
+        Recipe.objects.filter(pk=new_id).delete()
+        self.assertEqual(search.search_recipes("조림"), [])
+
+    def test_reindexed_once_per_recipe_after_commit(self):
+        with mock.patch.object(search, "reindex_recipes", wraps=search.reindex_recipes) as reindex:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                stew = Recipe.objects.get(pk=self.stew.pk)
+                stew.description = "두부를 넣는다."
+                stew.save()
+                RecipeIngredient.objects.create(recipe=stew, ingredient=self.tofu, r_quantity=1)
+                RecipeIngredient.objects.filter(recipe=self.soup).first().delete()
+                reindex.assert_not_called()
+        self.assertGreater(len(callbacks), 1)
+        reindex.assert_called_once()
+        self.assertEqual(set(reindex.call_args.args[0]), {self.stew.pk, self.soup.pk})
+        self.assertEqual(search.search_recipes("넣는다"), [self.stew.recipe_id])
+
+    def test_api(self):
+        data = self.client.get(self.url, {"q": "김치"}).json()
+        self.assertEqual([r["name"] for r in data["recipes"]], ["김치찌개", "된장국"])
+        self.assertEqual([i["name"] for i in data["ingredients"]], ["신김치"])
+        self.assertEqual(self.client.get(self.url, {"q": " "}).status_code, 400)
+        # 0 / 음수 limit 은 1 로 (SQLite LIMIT -1 = 무제한이 되지 않게)
+        data = self.client.get(self.url, {"q": "김치", "limit": -1}).json()
+        self.assertEqual(len(data["recipes"]), 1)
+
+    def test_migration_does_not_import_search(self):
+        # 마이그레이션은 앱 코드가 바뀌어도 같은 결과를 내야 하므로 apis.search 에 의존하지 않음
+        migration = importlib.import_module("apis.migrations.0004_search_index")
+        self.assertEqual(migration.ngram_doc.__module__, migration.__name__)
+        self.assertEqual(migration.ngram_doc("김치찌개", "a"), search.ngram_doc("김치찌개", "a"))
+        self.assertEqual(migration.RECIPE_TABLE, search.RECIPE_TABLE)
+        self.assertEqual(migration.INGREDIENT_TABLE, search.INGREDIENT_TABLE)
+
+
+# ============================
+# 재료 자동완성 (자모 접두사)
+# ============================
+class IngredientAutocompleteTests(TestCase):
+    def setUp(self):
+        invalidate_ingredient_index()
+        for name in ("두부", "당근", "닭고기", "대파", "우유", "Butter"):
+            Ingredient.objects.create(ingredient_name=name, unit="g", ingredient_category="기타")
+        self.url = reverse("ingredient_autocomplete")
+
+    def names(self, q):
+        return [i["name"] for i in self.client.get(self.url, {"q": q}).json()["ingredients"]]
+
+    def test_decompose(self):
+        self.assertEqual(decompose("두부"), "ㄷㅜㅂㅜ")
+        self.assertEqual(decompose("닭 과"), "ㄷㅏㄹㄱㄱㅗㅏ")
+
+    def test_jamo_prefix(self):
+        self.assertEqual(self.names("ㄷ"), ["닭고기", "당근", "대파", "두부"])
+        self.assertEqual(self.names("둡"), ["두부"])
+        self.assertEqual(self.names("달"), ["닭고기"])
+        self.assertEqual(self.names("ㄷㅂ"), ["두부"])
+        self.assertEqual(self.names("bu"), ["Butter"])
+        self.assertEqual(self.names(""), [])
+
+    def test_served_from_memory_and_refreshed_on_write(self):
+        self.names("ㄷ")
+        # 버전 조회만
+        with self.assertNumQueries(1):
+            self.names("ㄷ")
+
+        Ingredient.objects.create(ingredient_name="도토리묵", unit="g", ingredient_category="기타")
+        self.assertIn("도토리묵", self.names("도"))
+        Ingredient.objects.filter(ingredient_name="두부").delete()
+        self.assertEqual(self.names("ㄷㅂ"), [])
+
+    def test_limit_clamped(self):
+        resp = self.client.get(self.url, {"q": "ㄷ", "limit": -1})
+        self.assertEqual(len(resp.json()["ingredients"]), 1)
+
+    def test_invalidation_from_other_worker(self):
+        self.names("ㄷ")
+        # 다른 워커가 재료를 추가하고 DB 버전을 올린 상황 (이 프로세스에는 시그널이 오지 않음)
+        Ingredient.objects.bulk_create([Ingredient(ingredient_name="도라지", unit="g", ingredient_category="기타")])
+        self.assertNotIn("도라지", self.names("도"))
+        CacheVersion.bump("index:ingredient")
+        self.assertIn("도라지", self.names("도"))
+
+    def test_write_in_this_worker_reaches_other_workers(self):
+        self.names("ㄷ")
+        [(version, _)] = CacheVersion.current("index:ingredient")
+        Ingredient.objects.filter(ingredient_name="두부").first().delete()
+        # 다른 워커는 캐시를 공유하지 않음 → DB 버전이 올라가야 알 수 있음
+        cache.clear()
+        [(new_version, _)] = CacheVersion.current("index:ingredient")
+        self.assertGreater(new_version, version)
+        self.assertEqual(self.names("ㄷㅂ"), [])
+
+
+# ============================
+# 레시피 저장 (재료 일괄 조회 + 트랜잭션)
+# ============================
+class AddRecipeTests(TestCase):
+    def setUp(self):
+        invalidate_recipe_index()
+        make_catalogue(0, n_ingredients=20)
+        self.url = reverse("add_recipe")
+
+    def post(self, names, name="두부조림"):
+        return self.client.post(self.url, {
+            "name": name, "category": "한식", "description": "간장에 조린다.",
+            "ingredients": json.dumps(names),
+        })
+
+    def test_query_count_independent_of_ingredient_count(self):
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(self.post(["재료0", "재료1"]).status_code, 201)
+        with CaptureQueriesContext(connection) as large:
+            resp = self.post([f"재료{i}" for i in range(20)] + ["재료0"], name="모둠")
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(len(small), len(large))
+
+        recipe = Recipe.objects.get(pk=resp.json()["recipe_id"])
+        self.assertEqual(recipe.recipeingredient_set.count(), 20)
+        # 매칭 인덱스 / 검색 색인에도 바로 반영
+        self.assertEqual(len(RecipeIndex.from_db().requirements[recipe.recipe_id]), 20)
+        self.assertEqual(search.search_recipes("모둠"), [recipe.recipe_id])
+
+    def test_unknown_ingredients_reported_together(self):
+        resp = self.post(["재료0", "없는재료", "재료1", "또없음"])
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json()["unknown_ingredients"], ["없는재료", "또없음"])
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_ingredients_must_be_list_of_names(self):
+        for bad in ('"재료0"', '{"재료0": 1}', '[1]', '[""]', '["재료0", null]', "not json"):
+            resp = self.client.post(self.url, {"name": "두부조림", "ingredients": bad})
+            self.assertEqual(resp.status_code, 400, bad)
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_failure_leaves_no_partial_recipe(self):
+        with mock.patch.object(RecipeIngredient.objects, "bulk_create", side_effect=RuntimeError("boom")):
+            resp = self.post(["재료0"])
+        self.assertEqual(resp.status_code, 500)
+        self.assertFalse(Recipe.objects.exists())
+
+
+# ============================
+# 냉장고 일괄 변경 API
+# ============================
+class FridgeBatchApiTests(TestCase):
+    def setUp(self):
+        self.person = make_person()
+        self.other = make_person("hansuk02")
+        self.tofu = Ingredient.objects.create(
+            ingredient_name="두부", unit="모", ingredient_category="신선식품", shelf_life=3
+        )
+        self.milk = Ingredient.objects.create(
+            ingredient_name="우유", unit="ml", ingredient_category="유제품", shelf_life=7
+        )
+        self.kept = Fridge.objects.create(person=self.person, ingredient=self.tofu, f_quantity=1,
+                                          added_date=date(2025, 11, 1))
+        self.gone = Fridge.objects.create(person=self.person, ingredient=self.milk, f_quantity=1,
+                                          added_date=date(2025, 11, 1))
+        self.url = reverse("fridge_batch_api")
+
+    def post(self, operations, user_id="minjae01"):
+        return self.client.post(self.url, {"user_id": user_id, "operations": operations},
+                                content_type="application/json")
+
+    def test_applies_all_ops_in_constant_queries(self):
+        def ops(n):
+            return [{"op": "add", "ingredient": "우유", "quantity": 2, "added_date": "2025-11-02"}] * n
+
+        with CaptureQueriesContext(connection) as small:
+            self.post(ops(1))
+        with CaptureQueriesContext(connection) as large:
+            self.post(ops(10))
+        self.assertEqual(len(small), len(large))
+
+        resp = self.post([
+            {"op": "add", "ingredient": "두부", "quantity": "1.5", "added_date": "2025-11-10"},
+            {"op": "update", "fridge_id": self.kept.fridge_id, "quantity": 3, "added_date": "2025-11-05"},
+            {"op": "delete", "fridge_id": self.gone.fridge_id},
+        ])
+        self.assertEqual(resp.status_code, 200)
+        results = resp.json()["results"]
+        self.assertEqual([r["status"] for r in results], ["created", "updated", "deleted"])
+        self.assertEqual(results[0]["expiry_date"], "2025-11-13")
+
+        self.kept.refresh_from_db()
+        self.assertEqual((self.kept.f_quantity, self.kept.expiry_date), (Decimal("3"), date(2025, 11, 8)))
+        self.assertFalse(Fridge.objects.filter(pk=self.gone.pk).exists())
+        self.assertEqual(Fridge.objects.get(pk=results[0]["fridge_id"]).expiry_date, date(2025, 11, 13))
+
+    def test_any_error_rejects_whole_batch(self):
+        foreign = Fridge.objects.create(person=self.other, ingredient=self.tofu, f_quantity=1)
+        before = Fridge.objects.count()
+        resp = self.post([
+            {"op": "add", "ingredient": "두부", "quantity": 1},
+            {"op": "add", "ingredient": "없는재료", "quantity": 1},
+            {"op": "update", "fridge_id": foreign.fridge_id, "quantity": 1},
+            {"op": "delete", "fridge_id": self.gone.fridge_id},
+            {"op": "update", "fridge_id": self.gone.fridge_id, "quantity": 2},
+            {"op": "add", "ingredient": "두부", "quantity": -1},
+            {"op": "move"},
+        ])
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual([r["index"] for r in resp.json()["results"]], [1, 2, 4, 5, 6])
+        self.assertEqual(Fridge.objects.count(), before)
+
+    def test_bool_fridge_id_rejected(self):
+        # true == 1 이므로 fridge_id 1 인 항목이 있어도 bool 은 id 로 받지 않음
+        Fridge.objects.filter(pk=1).delete()
+        first = Fridge.objects.create(fridge_id=1, person=self.person, ingredient=self.tofu, f_quantity=1)
+        resp = self.post([
+            {"op": "delete", "fridge_id": True},
+            {"op": "update", "fridge_id": True, "quantity": 5},
+        ])
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual([r["index"] for r in resp.json()["results"]], [0, 1])
+        first.refresh_from_db()
+        self.assertEqual(first.f_quantity, Decimal("1"))
+
+    def test_invalidates_fridge_items_cache(self):
+        cache.clear()
+        url = reverse("fridge_items_api")
+        self.assertEqual(len(self.client.get(url, {"user_id": "minjae01"}).json()["items"]), 2)
+        self.post([{"op": "add", "ingredient": "두부", "quantity": 1}])
+        self.assertEqual(len(self.client.get(url, {"user_id": "minjae01"}).json()["items"]), 3)
+
+
+# ============================
+# my_fridge 페이지 (select_related + 조각 캐시)
+# ============================
+class MyFridgePageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.person = make_person()
+        self.recipes, self.ingredients = make_catalogue(3, n_ingredients=3)
+        self.url = reverse("my_fridge")
+        response_cache.version_tag(self.person.p_id)
+
+    def fill(self, n):
+        Fridge.objects.bulk_create([
+            Fridge(person=self.person, ingredient=self.ingredients[i % 3], f_quantity=1) for i in range(n)
+        ])
+        response_cache.bump_user(self.person.p_id)
+
+    def test_query_count_flat_and_cached(self):
+        self.fill(2)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url)
+        cache.clear()
+        self.fill(100)
+        with CaptureQueriesContext(connection) as large:
+            resp = self.client.get(self.url)
+        self.assertEqual(len(small), len(large))
+        self.assertContains(resp, "재료2", count=33)
+
+        # 조각 캐시 hit → person + 버전 조회만
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+
+    def test_mutations_invalidate_fragments(self):
+        self.client.get(self.url)
+        self.client.post(reverse("add_ingredient"),
+                         {"ingredient": "재료1", "quantity": "2", "added_date": "2025-11-01"})
+        self.assertContains(self.client.get(self.url), "재료1")
+
+        self.client.get(reverse("toggle_like", args=[self.recipes[0].recipe_id]))
+        self.assertContains(self.client.get(self.url), "레시피0")
+
+        item = Fridge.objects.get(person=self.person)
+        self.client.get(reverse("delete_ingredient", args=[item.fridge_id]))
+        self.assertNotContains(self.client.get(self.url), "재료1")
+
+
+# ============================
+# 관리자 목록 (대용량 테이블)
+# ============================
+class AdminChangelistTests(TestCase):
+    MODELS = ("fridge", "shopping", "recipeingredient", "like", "personallergy")
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+        self.people = [make_person(f"user{i}") for i in range(3)]
+        self.recipes, self.ingredients = make_catalogue(3, n_ingredients=3)
+        self.allergy = Allergy.objects.create(allergy_name="갑각류")
+
+    def fill(self, n):
+        for i in range(n):
+            person, ingredient = self.people[i % 3], self.ingredients[i % 3]
+            Shopping.objects.create(person=person, ingredient=ingredient, quantity=1,
+                                    purchased_date=date(2025, 11, 1))
+            Like.objects.get_or_create(person=person, recipe=self.recipes[i % 3])
+            PersonAllergy.objects.get_or_create(person=person, allergy=self.allergy)
+
+    def changelist_queries(self):
+        counts = {}
+        for model in self.MODELS:
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(reverse(f"admin:apis_{model}_changelist"))
+            self.assertEqual(resp.status_code, 200)
+            counts[model] = len(ctx)
+        return counts
+
+    def test_query_count_independent_of_rows(self):
+        self.fill(3)
+        small = self.changelist_queries()
+        self.fill(30)
+        self.assertEqual(self.changelist_queries(), small)
+
+    def test_estimated_count(self):
+        from .admin import EstimatedCountPaginator
+        self.fill(12)
+        with mock.patch.object(EstimatedCountPaginator, "COUNT_LIMIT", 5):
+            self.assertEqual(EstimatedCountPaginator(Fridge.objects.order_by("pk"), 100).count,
+                             Fridge.objects.order_by("-pk").first().pk)
+            # 필터가 있으면 COUNT_LIMIT 까지만 (capped)
+            filtered = Fridge.objects.filter(f_quantity=1).order_by("pk")
+            paginator = EstimatedCountPaginator(filtered, 2)
+            self.assertEqual((paginator.count, paginator.capped), (5, True))
+            # 상한 뒤 페이지를 요청하면 그 다음 페이지까지 셈 → 다음/이전 이동 가능
+            paginator = EstimatedCountPaginator(filtered, 2)
+            paginator.requested_page = 4
+            self.assertEqual((paginator.count, paginator.capped), (10, True))
+            self.assertEqual(len(paginator.page(5).object_list), 2)
+            paginator = EstimatedCountPaginator(filtered, 2)
+            paginator.requested_page = 6
+            self.assertEqual((paginator.count, paginator.capped), (12, False))
+
+    def test_capped_count_shown_and_pages_beyond_cap(self):
+        from .admin import EstimatedCountPaginator, ShoppingAdmin
+        self.fill(12)
+        url = reverse("admin:apis_shopping_changelist")
+        with mock.patch.object(EstimatedCountPaginator, "COUNT_LIMIT", 5), \
+                mock.patch.object(ShoppingAdmin, "list_per_page", 2):
+            resp = self.client.get(url, {"added_to_fridge__exact": 1})
+            self.assertContains(resp, "5+ ")
+            resp = self.client.get(url, {"added_to_fridge__exact": 1, "p": 5})
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(len(resp.context["cl"].result_list), 2)
+
+
+# ============================
+# 사진 썸네일
+# ============================
+class ThumbnailTests(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        os.makedirs(os.path.join(self.media_root, "photo", "FOOD"))
+        with open(os.path.join(self.media_root, "photo", "FOOD", "김치찌개.webp"), "wb") as f:
+            Image.new("RGB", (1200, 900), (200, 40, 30)).save(f, format="WEBP")
+        self.recipe = Recipe.objects.create(recipe_name="김치찌개", recipe_img="photo/FOOD/김치찌개.webp")
+
+    def thumb_file(self, size):
+        return thumbnails.thumbnail_path(self.recipe.recipe_img, size)
+
+    def test_generated_on_first_request_and_cached(self):
+        url = thumbnails.thumbnail_url(self.recipe.recipe_img, "sm")
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Type"], "image/jpeg")
+        self.assertIn(f"max-age={settings.THUMBNAIL_CACHE_MAX_AGE}", resp["Cache-Control"])
+        with Image.open(io.BytesIO(b"".join(resp.streaming_content))) as img:
+            self.assertEqual(img.size, (160, 120))
+        self.assertTrue(os.path.exists(self.thumb_file("sm")))
+
+        resp = self.client.get(url, HTTP_IF_MODIFIED_SINCE=resp["Last-Modified"])
+        self.assertEqual(resp.status_code, 304)
+
+    def test_regenerated_when_original_changes(self):
+        src = thumbnails.source_path(self.recipe.recipe_img)
+        old = thumbnails.ensure_thumbnail(self.recipe.recipe_img, "sm")
+        # mtime 을 보존한 채 다른 이미지로 교체 (cp -p / rsync -t)
+        st = os.stat(src)
+        with open(src, "wb") as f:
+            Image.new("RGB", (600, 900), (0, 0, 200)).save(f, format="WEBP")
+        os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        new = thumbnails.ensure_thumbnail(self.recipe.recipe_img, "sm")
+        self.assertNotEqual(new, old)
+        self.assertFalse(os.path.exists(old))
+        with Image.open(new) as img:
+            self.assertEqual(img.size, (107, 160))
+
+    def test_extension_does_not_collide(self):
+        # "x" 와 "x.jpg" 의 썸네일 이름이 겹치지 않음
+        for name in ("x", "x.jpg"):
+            with open(os.path.join(self.media_root, "photo", "FOOD", name), "wb") as f:
+                Image.new("RGB", (10, 10)).save(f, format="JPEG")
+        self.assertNotEqual(thumbnails.ensure_thumbnail("photo/FOOD/x", "sm"),
+                            thumbnails.ensure_thumbnail("photo/FOOD/x.jpg", "sm"))
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, "photo", "FOOD", "thumbs", "sm"))), 2)
+
+    def test_rejects_bad_paths(self):
+        for size, path in [("xl", "photo/FOOD/김치찌개.webp"), ("sm", "photo/FOOD/없음.jpg"),
+                           ("sm", "../../settings.py"), ("sm", "photo/FOOD/thumbs/sm/김치찌개.webp.jpg")]:
+            resp = self.client.get(reverse("thumbnail", args=[size, path]))
+            self.assertEqual(resp.status_code, 404, (size, path))
+
+    def test_recipe_list_points_at_thumbnail(self):
+        person = make_person()
+        resp = self.client.get(reverse("recipe_list_api"), {"user_id": person.user_id})
+        self.assertEqual(resp.json()["recipes"][0]["thumbnail"],
+                         thumbnails.thumbnail_url("photo/FOOD/김치찌개.webp", "md"))
+        # add_recipe 가 저장하는 "/media/..." 형태도 같은 원본으로
+        self.assertEqual(thumbnails.media_path("/media/recipes/a.jpg"), "recipes/a.jpg")
+
+    def test_backfill_command(self):
+        Ingredient.objects.create(ingredient_name="없는사진", unit="개", ingredient_category="기타",
+                                  ingredient_img="photo/INGREDIENT/없음.jpg")
+        out, err = io.StringIO(), io.StringIO()
+        call_command("make_thumbnails", stdout=out, stderr=err)
+        for size in settings.THUMBNAIL_SIZES:
+            self.assertTrue(os.path.exists(self.thumb_file(size)))
+        self.assertIn("실패 2건", out.getvalue())
+        self.assertIn("없음.jpg", err.getvalue())
+
+
+# ============================
+# 미디어 저장 / 서빙
+# ============================
+class MediaServingTests(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        make_catalogue(0, n_ingredients=1)
+        self.photo = make_photo(64, 48)
+
+    def upload(self, filename):
+        resp = self.client.post(reverse("add_recipe"), {
+            "name": f"레시피-{filename}", "ingredients": json.dumps(["재료0"]),
+            "image": SimpleUploadedFile(filename, self.photo, content_type="image/jpeg"),
+        })
+        self.assertEqual(resp.status_code, 201)
+        return Recipe.objects.get(pk=resp.json()["recipe_id"]).recipe_img
+
+    def test_uploads_are_content_addressed_and_deduplicated(self):
+        import hashlib
+        digest = hashlib.sha256(self.photo).hexdigest()
+        first, second = self.upload("내 사진.JPG"), self.upload("other.jpg")
+        self.assertEqual(first, f"/media/recipes/{digest[:2]}/{digest}.jpg")
+        self.assertEqual(first, second)
+        stored = os.listdir(os.path.join(self.media_root, "recipes", digest[:2]))
+        self.assertEqual(sorted(stored), [f"{digest}.jpg", settings.THUMBNAIL_DIR])
+
+        resp = self.client.get(first)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(b"".join(resp.streaming_content), self.photo)
+        self.assertIn("immutable", resp["Cache-Control"])
+        self.assertEqual(resp["ETag"], f'"{digest}"')
+        self.assertEqual(self.client.get(first, HTTP_IF_NONE_MATCH=resp["ETag"]).status_code, 304)
+
+    def test_rolled_back_recipe_stores_no_image(self):
+        with mock.patch.object(RecipeIngredient.objects, "bulk_create", side_effect=RuntimeError("boom")):
+            resp = self.client.post(reverse("add_recipe"), {
+                "name": "실패", "ingredients": json.dumps(["재료0"]),
+                "image": SimpleUploadedFile("a.jpg", self.photo, content_type="image/jpeg"),
+            })
+        self.assertEqual(resp.status_code, 500)
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, "recipes")))
+
+    def test_range_requests(self):
+        url = self.upload("a.jpg")
+        size = len(self.photo)
+        resp = self.client.get(url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp["Content-Range"], f"bytes 10-19/{size}")
+        self.assertEqual(b"".join(resp.streaming_content), self.photo[10:20])
+
+        resp = self.client.get(url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(resp.streaming_content), self.photo[-5:])
+        self.assertEqual(self.client.get(url, HTTP_RANGE=f"bytes={size}-").status_code, 416)
+        # If-Range 가 맞지 않으면 전체 응답
+        self.assertEqual(self.client.get(url, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE='"old"').status_code, 200)
+
+    def test_mutable_files_and_bad_paths(self):
+        os.makedirs(os.path.join(self.media_root, "photo"))
+        with open(os.path.join(self.media_root, "photo", "a.jfif"), "wb") as f:
+            f.write(self.photo)
+        resp = self.client.get("/media/photo/a.jfif")
+        self.assertEqual(resp["Content-Type"], "image/jpeg")
+        self.assertNotIn("immutable", resp["Cache-Control"])
+        self.assertIn(f"max-age={settings.MEDIA_CACHE_MAX_AGE}", resp["Cache-Control"])
+        with open(os.path.join(self.media_root, "photo", "notes.txt"), "w") as f:
+            f.write("not an image")
+        for path in ["/media/photo/none.jpg", "/media/photo/", "/media/../manage.py", "/media/photo/notes.txt"]:
+            self.assertEqual(self.client.get(path).status_code, 404, path)
+
+    def test_seed_data_not_served(self):
+        # 실제 MEDIA_ROOT(apis/data) 의 시드 CSV (user_id, 비밀번호, 주소 포함)
+        with override_settings(MEDIA_ROOT=settings.BASE_DIR / "apis" / "data"):
+            self.assertTrue(os.path.exists(os.path.join(settings.MEDIA_ROOT, "Person.csv")))
+            self.assertEqual(self.client.get("/media/Person.csv").status_code, 404)
+            self.assertEqual(self.client.get("/media/photo/../Person.csv").status_code, 404)
+
+    @override_settings(MEDIA_SERVE_MODE="x-accel")
+    def test_x_accel_redirect(self):
+        url = self.upload("a.jpg")
+        resp = self.client.get(url)
+        self.assertEqual(resp["X-Accel-Redirect"], "/protected-media/" + url[len("/media/"):])
+        self.assertEqual(resp.content, b"")
+
+
+# ============================
+# 업로드 한도 / 스트리밍 해시
+# ============================
+@override_settings(CLASSIFY_LLM_BACKEND="apis.llm_stub.StubLLM")
+class UploadLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["classify"].clear()
+        StubLLM.reset()
+
+    def classify(self, data, name="fridge.jpg"):
+        image = SimpleUploadedFile(name, data, content_type="image/jpeg")
+        return self.client.post(reverse("classify_query"), {"image": image})
+
+    def limits(self, max_bytes):
+        return {name: {**limits, "max_bytes": max_bytes} for name, limits in settings.UPLOAD_LIMITS.items()}
+
+    def test_oversized_file_rejected_while_streaming(self):
+        with override_settings(UPLOAD_LIMITS=self.limits(1024)):
+            resp = self.classify(make_photo(64, 48))
+        self.assertEqual(resp.status_code, 413)
+        self.assertEqual(StubLLM.calls, 0)
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=0)
+    def test_content_length_rejected_before_reading_body(self):
+        from .uploads import LimitedDigestUploadHandler
+        with override_settings(UPLOAD_LIMITS=self.limits(1024)), \
+                mock.patch.object(LimitedDigestUploadHandler, "receive_data_chunk") as receive:
+            resp = self.classify(make_photo(64, 48))
+        self.assertEqual(resp.status_code, 413)
+        receive.assert_not_called()
+
+    def test_content_sniffed_not_trusted_from_client(self):
+        resp = self.classify(b"<html><script>alert(1)</script></html>")
+        self.assertEqual(resp.status_code, 415)
+        # HEIC 는 Pillow 로 열 수 없으므로 LLM 에 넘기지 않고 415 (classify / add_recipe 모두)
+        heic = b"\x00\x00\x00\x18ftypheic" + bytes(64)
+        self.assertEqual(self.classify(heic, name="IMG_0001.HEIC").status_code, 415)
+        self.assertEqual(StubLLM.calls, 0)
+        make_catalogue(0, n_ingredients=1)
+        resp = self.client.post(reverse("add_recipe"), {
+            "name": "레시피", "ingredients": json.dumps(["재료0"]),
+            "image": SimpleUploadedFile("a.jpg", heic, content_type="image/jpeg"),
+        })
+        self.assertEqual(resp.status_code, 415)
+        self.assertFalse(Recipe.objects.exists())
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_digest_computed_while_streaming(self):
+        import hashlib
+        from django.core.files.uploadedfile import TemporaryUploadedFile
+        data = make_photo(64, 48)
+        with mock.patch("apis.uploads.upload_digest") as second_pass, \
+                mock.patch("apis.views.prepare_for_llm", wraps=prepare_for_llm) as prepare, \
+                mock.patch("apis.views.classify_image", wraps=views.classify_image) as classify:
+            self.assertEqual(self.classify(data).status_code, 200)
+        second_pass.assert_not_called()
+        self.assertEqual(classify.call_args.args[0], hashlib.sha256(data).hexdigest())
+        # FILE_UPLOAD_MAX_MEMORY_SIZE 를 넘는 파일은 임시 파일로
+        self.assertIsInstance(prepare.call_args.args[0], TemporaryUploadedFile)
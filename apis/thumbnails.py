@@ -0,0 +1,145 @@
+"""
+재료/레시피 사진 썸네일 (파생 이미지)
+
+원본은 MEDIA_ROOT 아래 photo/FOOD, photo/INGREDIENT, recipes/ 에 있고 (수백 KB jpg/jfif/webp/png)
+관리자 목록은 60~80px, 앱 목록 카드는 그보다 조금 큰 크기로만 보여준다.
+크기별 썸네일을 원본 옆 thumbs/<size>/ 디렉터리에 JPEG 로 만들어 두고 그것을 내려준다.
+    photo/FOOD/김치찌개.webp  →  photo/FOOD/thumbs/sm/김치찌개.webp.<원본 mtime>-<원본 크기>.jpg
+
+생성 시점
+    1) 업로드 직후 (add_recipe → pregenerate)
+    2) 첫 요청 시 (thumbnail_view → ensure_thumbnail)
+    3) 기존 파일 일괄 생성: python manage.py make_thumbnails
+이름에 원본의 mtime(ns) + 크기를 넣어 두므로 (media.serve 의 ETag 와 같은 값)
+원본이 바뀌면 mtime 을 보존한 채 교체돼도 이름이 달라져 다시 만들고, 예전 썸네일은 지운다.
+"""
+import logging
+import os
+import re
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.urls import reverse
+from django.utils._os import safe_join
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailError(ValueError):
+    """썸네일을 만들 수 없는 경로/파일"""
+
+
+def media_path(value):
+    """
+    DB에 저장된 이미지 값 → MEDIA_ROOT 기준 상대 경로
+    load_data 는 "photo/FOOD/x.jpg", add_recipe 는 "/media/recipes/x.jpg" 형태로 저장한다.
+    """
+    path = (value or "").replace("\\", "/")
+    for prefix in (settings.MEDIA_URL, settings.MEDIA_URL.lstrip("/")):
+        if prefix and path.startswith(prefix):
+            path = path[len(prefix):]
+            break
+    return path.lstrip("/")
+
+
+def source_path(value):
+    """원본 파일의 절대 경로. MEDIA_ROOT 밖을 가리키거나 썸네일 자체면 ThumbnailError"""
+    path = media_path(value)
+    if not path or f"/{settings.THUMBNAIL_DIR}/" in f"/{path}":
+        raise ThumbnailError(f"썸네일을 만들 수 없는 경로입니다: {value!r}")
+    try:
+        return safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise ThumbnailError(f"MEDIA_ROOT 밖의 경로입니다: {value!r}")
+
+
+def _source_key(st):
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def thumbnail_path(value, size, st=None):
+    """원본 옆 thumbs/<size>/<파일명>.<원본 mtime-크기>.jpg (st: 원본 os.stat 결과, 없으면 stat)"""
+    src = source_path(value)
+    st = st or os.stat(src)
+    directory, name = os.path.split(src)
+    return os.path.join(directory, settings.THUMBNAIL_DIR, size, f"{name}.{_source_key(st)}.jpg")
+
+
+def _remove_stale(dst):
+    """같은 원본의 예전 버전 썸네일 삭제"""
+    directory, current = os.path.split(dst)
+    name = current[:current.rindex(".", 0, len(current) - len(".jpg"))]
+    stale = re.compile(re.escape(name) + r"\.[0-9a-f]+-[0-9a-f]+\.jpg")
+    for other in os.listdir(directory):
+        if other != current and stale.fullmatch(other):
+            try:
+                os.unlink(os.path.join(directory, other))
+            except FileNotFoundError:
+                pass
+
+
+def thumbnail_url(value, size="sm"):
+    """썸네일 URL (디스크를 읽지 않음). 이미지 값이 없으면 None"""
+    path = media_path(value)
+    if not path:
+        return None
+    return reverse("thumbnail", args=[size, path])
+
+
+def _render(src, dst, px):
+    try:
+        with Image.open(src) as img:
+            # JPEG는 디코딩 단계에서부터 축소해서 읽음
+            img.draft("RGB", (px, px))
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((px, px), Image.LANCZOS)
+            if img.mode in ("RGBA", "LA", "P"):
+                # 투명 배경(png)은 흰 배경에 합성
+                img = img.convert("RGBA")
+                background = Image.new("RGB", img.size, (255, 255, 255))
+                background.paste(img, mask=img.getchannel("A"))
+                img = background
+            elif img.mode != "RGB":
+                img = img.convert("RGB")
+
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            # 임시 파일에 쓰고 교체 → 동시에 읽는 요청이 반쯤 쓴 파일을 보지 않음
+            fd, tmp = tempfile.mkstemp(suffix=".jpg", dir=os.path.dirname(dst))
+            try:
+                with os.fdopen(fd, "wb") as out:
+                    img.save(out, format="JPEG", quality=settings.THUMBNAIL_QUALITY, optimize=True)
+                os.replace(tmp, dst)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+    except (UnidentifiedImageError, Image.DecompressionBombError) as e:
+        raise ThumbnailError(f"이미지로 열 수 없습니다: {src} ({e})")
+
+
+def ensure_thumbnail(value, size, force=False):
+    """
+    썸네일 절대 경로 반환 (지금 원본의 썸네일이 없으면 생성)
+    원본이 없으면 FileNotFoundError, 크기 이름이 잘못됐거나 이미지가 아니면 ThumbnailError
+    """
+    if size not in settings.THUMBNAIL_SIZES:
+        raise ThumbnailError(f"size는 {', '.join(settings.THUMBNAIL_SIZES)} 중 하나여야 합니다.")
+    src = source_path(value)
+    dst = thumbnail_path(value, size, os.stat(src))
+    if not force and os.path.exists(dst):
+        return dst
+    _render(src, dst, settings.THUMBNAIL_SIZES[size])
+    _remove_stale(dst)
+    return dst
+
+
+def pregenerate(value):
+    """업로드 직후 모든 크기를 미리 생성. 실패해도 업로드는 성공 (첫 요청 때 다시 시도)"""
+    if not media_path(value):
+        return
+    for size in settings.THUMBNAIL_SIZES:
+        try:
+            ensure_thumbnail(value, size)
+        except (ThumbnailError, OSError) as e:
+            logger.warning("썸네일 생성 실패 (%s, %s): %s", value, size, e)
@@ -0,0 +1,131 @@
+"""
+업로드 한도 / 스트리밍 해시
+
+UPLOAD_LIMITS 에 등록된 URL(name 기준)의 multipart 업로드는
+    1) Content-Length 만 보고 한도를 넘으면 본문을 읽기 전에 413
+    2) 본문을 읽는 동안 파일 크기가 한도를 넘거나 첫 바이트(매직 넘버)가
+       허용 형식이 아니면 그 자리에서 중단 → 413 / 415
+    3) chunk 를 받는 대로 sha256 을 계산 → request.upload_digests[필드명]
+chunk 는 그대로 기본 핸들러(작으면 메모리, FILE_UPLOAD_MAX_MEMORY_SIZE 초과 시 임시 파일)로 넘기므로
+큰 파일도 메모리에 전부 올라가지 않고, 캐시 키 / 중복 제거용 해시를 얻으려고 파일을 다시 읽지 않는다.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.http import JsonResponse
+
+from .classification import upload_digest
+
+# 형식 판별에 필요한 앞부분 바이트 수
+SNIFF_BYTES = 12
+
+
+def sniff_content_type(head):
+    """파일 앞부분(매직 넘버) → MIME 타입. 모르는 형식이면 None (클라이언트가 보낸 Content-Type 은 믿지 않음)"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def _too_large_message(max_bytes):
+    return f"파일은 {max_bytes / (1024 * 1024):g}MB 이하여야 합니다."
+
+
+class UploadRejected(StopUpload):
+    def __init__(self, status, message):
+        # 나머지 본문은 읽지 않고 버림
+        super().__init__(connection_reset=True)
+        self.status = status
+        self.message = message
+
+
+class LimitedDigestUploadHandler(FileUploadHandler):
+    """
+    핸들러 체인 맨 앞에서 크기 / 형식을 검사하고 sha256 을 계산한 뒤
+    chunk 를 다음 핸들러(메모리 / 임시 파일)로 그대로 넘긴다.
+    """
+
+    def __init__(self, request, max_bytes, content_types):
+        super().__init__(request)
+        self.max_bytes = max_bytes
+        self.content_types = set(content_types)
+        self.rejected = None
+        request.upload_digests = {}
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hash = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_bytes:
+            self._reject(413, _too_large_message(self.max_bytes))
+        if len(self.head) < SNIFF_BYTES:
+            self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) == SNIFF_BYTES:
+                self._check_type()
+        self.hash.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if len(self.head) < SNIFF_BYTES:
+            self._check_type()
+        self.request.upload_digests[self.field_name] = self.hash.hexdigest()
+        # 파일 객체는 다음 핸들러가 만든다
+        return None
+
+    def _check_type(self):
+        if sniff_content_type(self.head) not in self.content_types:
+            self._reject(415, f"지원하지 않는 파일 형식입니다. ({', '.join(sorted(self.content_types))})")
+
+    def _reject(self, status, message):
+        self.rejected = UploadRejected(status, message)
+        raise self.rejected
+
+
+def streamed_digest(request, field_name, uploaded_file):
+    """업로드 중 계산한 sha256 (한도가 설정되지 않은 경로면 파일을 읽어서 계산)"""
+    digest = getattr(request, "upload_digests", {}).get(field_name)
+    return digest or upload_digest(uploaded_file)
+
+
+class UploadLimitMiddleware:
+    """
+    UPLOAD_LIMITS 에 등록된 뷰의 POST 를 뷰(와 CSRF 검사)보다 먼저 파싱해 한도를 적용
+    CsrfViewMiddleware 가 request.POST 를 읽기 전에 핸들러를 바꿔야 하므로 그보다 앞에 둔다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        limits = settings.UPLOAD_LIMITS.get(request.resolver_match.url_name)
+        if limits is None or request.method != "POST":
+            return None
+
+        # 파일 외 필드는 DATA_UPLOAD_MAX_MEMORY_SIZE 까지 허용
+        try:
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > limits["max_bytes"] + settings.DATA_UPLOAD_MAX_MEMORY_SIZE:
+            return JsonResponse({"detail": _too_large_message(limits["max_bytes"])}, status=413)
+
+        handler = LimitedDigestUploadHandler(request, limits["max_bytes"], limits["content_types"])
+        request.upload_handlers = [handler, *request.upload_handlers]
+        request.FILES  # 여기서 파싱 (거절되면 handler 가 중간에 멈춤)
+        if handler.rejected is not None:
+            return JsonResponse({"detail": handler.rejected.message}, status=handler.rejected.status)
+        return None
@@ -3,26 +3,44 @@ from .views import (
     login_user,
     signup_user,
     classify_query_view,
+    classify_job_view,
     my_fridge,
     add_ingredient,
     delete_ingredient,
     toggle_like,
     fridge_items_api,
+    fridge_batch_api,
+    expiring_items_api,
     recipe_list_api,   
+    recipe_detail_api,
     add_recipe,
-    ingredient_list
+    ingredient_list,
+    ingredient_autocomplete,
+    cookable_recipes_api,
+    search_api,
+    cache_stats_api,
+    thumbnail_view
 )
 
 urlpatterns = [
     path('login/', login_user, name='login_user'),
     path('signup/', signup_user, name='signup_user'),
     path('fridge_items/', fridge_items_api, name='fridge_items_api'),
+    path('fridge_items/batch/', fridge_batch_api, name='fridge_batch_api'),
+    path('expiring/', expiring_items_api, name='expiring_items_api'),
     path('classify/', classify_query_view, name='classify_query'),
+    path('classify/jobs/<str:job_id>/', classify_job_view, name='classify_job'),
 
     # 🔥 레시피 리스트 + 레시피 추가 API 등록
     path('recipes/', recipe_list_api, name='recipe_list_api'),
+    path('recipes/<int:recipe_id>/', recipe_detail_api, name='recipe_detail_api'),
     path('add_recipe/', add_recipe, name='add_recipe'),
     path('ingredients/', ingredient_list, name='ingredient_list'),
+    path('ingredients/autocomplete/', ingredient_autocomplete, name='ingredient_autocomplete'),
+    path('cookable/', cookable_recipes_api, name='cookable_recipes_api'),
+    path('search/', search_api, name='search_api'),
+    path('cache_stats/', cache_stats_api, name='cache_stats_api'),
+    path('thumbs/<str:size>/<path:path>', thumbnail_view, name='thumbnail'),
 
     # 냉장고 기능
     path('my_fridge/', my_fridge, name='my_fridge'),
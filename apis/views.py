@@ -1,43 +1,41 @@
 from django.shortcuts import render, HttpResponse, redirect, get_object_or_404
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse, Http404
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Prefetch
 from django.utils import timezone
 from django.conf import settings
-from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.views.decorators.http import condition
 
 from .models import (
     Person, Fridge, Ingredient, Like, Recipe,
     Allergy, PersonAllergy, RecipeIngredient
 )
+from .matching import get_recipe_index, invalidate_recipe_index
+from .autocomplete import get_ingredient_index
+from .exclusions import forbidden_ingredients
+from .expiry import expiring_items
 
 # REST API용 import
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 from django.views.decorators.csrf import csrf_exempt
 
 # GPT 관련 import
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
-import os, base64, mimetypes, json
-
-
-# ============================
-# GPT 초기화
-# ============================
-llm_consistent = None
-try:
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if api_key:
-        llm_consistent = ChatOpenAI(
-            model='gpt-4o',
-            temperature=0,
-            max_tokens=1000,
-            top_p=0.3,
-            frequency_penalty=0.1,
-        )
-    else:
-        print("⚠️ OPENAI_API_KEY 없음 → GPT 비활성화")
-except Exception as e:
-    print(f"⚠️ ChatOpenAI 초기화 실패: {e}")
+from .classification import classify_image, LLMUnavailable
+from .classification import cache_stats as classify_cache_stats
+from .imaging import ImageTooLarge, prepare_for_llm
+from . import jobs
+from . import response_cache
+from . import media
+from . import search
+from . import thumbnails
+from . import uploads
+import json
+import os
+from datetime import date
+from decimal import Decimal, InvalidOperation
 
 
 # ============================
@@ -45,28 +43,57 @@ except Exception as e:
 # ============================
 def classify_query_view(request):
     uploaded_file = request.FILES.get("image")
-    base64_image_data = None
-    media_type = "image/jpeg"
-
-    if uploaded_file:
-        media_type = uploaded_file.content_type or "image/jpeg"
-        base64_image_data = base64.b64encode(uploaded_file.read()).decode("utf-8")
-    else:
+    if not uploaded_file:
         return JsonResponse({"detail": "이미지가 없습니다."}, status=400)
 
-    image_data_uri = f"data:{media_type};base64,{base64_image_data}"
+    # 크기/형식 검사와 sha256 은 업로드를 받는 동안 끝남 (uploads.UploadLimitMiddleware)
+    digest = uploads.streamed_digest(request, "image", uploaded_file)
+    prepared = None
+
+    def load_image():
+        # 🔥 원본을 통째로 base64 하지 않고 모델 해상도로 축소 + JPEG 재인코딩
+        nonlocal prepared
+        prepared = prepare_for_llm(uploaded_file)
+        return prepared.data, prepared.media_type
+
+    # 🔥 ?mode=async → 작업 id만 바로 반환하고 전처리 + 분석은 작업 큐에서 수행 (캐시 hit 이면 바로 완료)
+    if request.GET.get("mode") == "async":
+        try:
+            job_id, status = jobs.submit(digest, uploaded_file)
+        except jobs.QueueFull as e:
+            return JsonResponse({"detail": str(e)}, status=429)
+        return JsonResponse({
+            "job_id": job_id,
+            "status": status,
+            "status_url": reverse("classify_job", args=[job_id]),
+        }, status=202)
 
-    system_prompt = """
-    재료 분석 전문가 역할을 수행하세요.
-    """
+    try:
+        content, cached = classify_image(digest, load_image)
+    except LLMUnavailable as e:
+        return JsonResponse({"detail": str(e)}, status=503)
+    except ImageTooLarge as e:
+        return JsonResponse({"detail": str(e)}, status=413)
 
-    messages = [
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=[{"type": "image_url", "image_url": {"url": image_data_uri}}])
-    ]
+    response = JsonResponse(content, safe=False)
+    response["X-Classify-Cache"] = "HIT" if cached else "MISS"
+    return _with_image_stats(response, prepared)
+
+
+def _with_image_stats(response, prepared):
+    """전처리로 줄인 바이트 수를 응답 헤더로 노출 (캐시 hit이면 전처리 없음)"""
+    if prepared is not None:
+        response["X-Image-Original-Bytes"] = prepared.original_bytes
+        response["X-Image-Sent-Bytes"] = len(prepared.data)
+        response["X-Image-Bytes-Saved"] = prepared.original_bytes - len(prepared.data)
+    return response
 
-    response = llm_consistent.invoke(messages)
-    return JsonResponse(response.content, safe=False)
+
+def classify_job_view(request, job_id):
+    job = jobs.get_job(job_id)
+    if job is None:
+        return JsonResponse({"detail": "존재하지 않는 작업입니다."}, status=404)
+    return JsonResponse({"job_id": job_id, **job})
 
 
 # ============================
@@ -74,13 +101,20 @@ def classify_query_view(request):
 # ============================
 def my_fridge(request):
     person = Person.objects.get(user_id='minjae01')
-    fridge_items = Fridge.objects.filter(person=person)
-    liked_recipes = Recipe.objects.filter(like__person=person)
+    # 🔥 재료 이름은 JOIN 으로 한 번에 (행마다 Ingredient 조회 방지)
+    #    QuerySet은 lazy 라서 템플릿 조각 캐시가 hit 이면 실행되지 않음
+    fridge_items = Fridge.objects.filter(person=person).select_related('ingredient')
+    liked_recipes = Recipe.objects.filter(like__person=person).only(
+        'recipe_id', 'recipe_name', 'recipe_category'
+    )
 
     return render(request, "fridge_app/my_fridge.html", {
         'person': person,
         'fridge_items': fridge_items,
-        'liked_recipes': liked_recipes
+        'liked_recipes': liked_recipes,
+        # Fridge / Like / Ingredient 변경 시 버전이 바뀌어 조각 캐시 무효화
+        'cache_version': response_cache.version_tag(person.p_id),
+        'cache_timeout': settings.RESPONSE_CACHE_TIMEOUT,
     })
 
 
@@ -91,7 +125,8 @@ def add_ingredient(request):
 
         ingredient_name = request.POST["ingredient"]
         quantity = request.POST["quantity"]
-        added_date = request.POST["added_date"]
+        # Fridge.save()에서 timedelta를 더하므로 문자열이 아닌 date로
+        added_date = date.fromisoformat(request.POST["added_date"])
 
         ingredient = Ingredient.objects.get(ingredient_name=ingredient_name)
 
@@ -190,69 +225,595 @@ def fridge_items_api(request):
     user_id = request.GET.get("user_id")
     person = Person.objects.get(user_id=user_id)
 
-    fridge_items = Fridge.objects.filter(person=person).select_related("ingredient")
+    def build():
+        fridge_items = Fridge.objects.filter(person=person).select_related("ingredient")
+        return [
+            {
+                "ingredient": f.ingredient.ingredient_name,
+                "quantity": float(f.f_quantity),
+                "unit": f.ingredient.unit,
+                "added_date": f.added_date.strftime("%Y-%m-%d"),
+                "expiry_date": f.expiry_date.strftime("%Y-%m-%d")
+            }
+            for f in fridge_items
+        ]
 
-    data = [
+    # 🔥 Fridge/Ingredient 변경 전까지는 캐시된 응답 사용
+    data = response_cache.get_or_build("fridge_items", person.p_id, {}, build)
+    return JsonResponse({"items": data})
+
+
+# ============================
+# 냉장고 일괄 변경 API (추가 / 수량·날짜 변경 / 삭제)
+#   {"user_id": "...", "operations": [
+#       {"op": "add", "ingredient": "두부", "quantity": 2, "added_date": "2025-11-01"},
+#       {"op": "update", "fridge_id": 3, "quantity": 1},
+#       {"op": "delete", "fridge_id": 4}]}
+#   하나라도 잘못되면 아무것도 반영하지 않고 400 + 항목별 오류
+# ============================
+FRIDGE_OPS = ("add", "update", "delete")
+
+
+def _parse_quantity(value):
+    """Fridge.f_quantity (max_digits=8, decimal_places=2) 범위의 양수"""
+    quantity = Decimal(str(value))
+    if not quantity.is_finite() or not 0 < quantity < 10 ** 6:
+        raise ValueError
+    return quantity.quantize(Decimal("0.01"))
+
+
+def _is_id(value):
+    # JSON true/false 는 파이썬 bool = int 하위 타입 → True 가 fridge_id 1 로 처리되지 않게 제외
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _parse_fridge_op(op, ingredient_ids, owned):
+    """작업 1건 검증 → (정규화된 작업, 오류 메시지)"""
+    kind = op.get("op") if isinstance(op, dict) else None
+    if kind not in FRIDGE_OPS:
+        return None, f"op는 {', '.join(FRIDGE_OPS)} 중 하나여야 합니다."
+
+    parsed = {"op": kind}
+    if kind == "add":
+        name = op.get("ingredient")
+        if not isinstance(name, str) or name not in ingredient_ids:
+            return None, f"존재하지 않는 재료입니다: {name}"
+        parsed["ingredient_id"] = ingredient_ids[name]
+    else:
+        if not _is_id(op.get("fridge_id")) or op["fridge_id"] not in owned:
+            return None, f"존재하지 않는 냉장고 항목입니다: {op.get('fridge_id')}"
+        parsed["fridge_id"] = op["fridge_id"]
+
+    try:
+        if kind == "add" or "quantity" in op:
+            parsed["quantity"] = _parse_quantity(op.get("quantity"))
+    except (InvalidOperation, ValueError, TypeError):
+        return None, "quantity는 0보다 큰 숫자여야 합니다."
+    try:
+        if op.get("added_date"):
+            parsed["added_date"] = date.fromisoformat(op["added_date"])
+    except (ValueError, TypeError):
+        return None, "added_date는 YYYY-MM-DD 형식이어야 합니다."
+    return parsed, None
+
+
+@api_view(['POST'])
+@csrf_exempt
+def fridge_batch_api(request):
+    data = request.data
+    try:
+        person = Person.objects.get(user_id=data.get("user_id"))
+    except Person.DoesNotExist:
+        return JsonResponse({"error": "존재하지 않는 사용자입니다."}, status=404)
+
+    ops = data.get("operations")
+    if not isinstance(ops, list) or not ops:
+        return JsonResponse({"error": "operations 배열이 필요합니다."}, status=400)
+    if len(ops) > settings.FRIDGE_BATCH_MAX_ITEMS:
+        return JsonResponse(
+            {"error": f"한 번에 최대 {settings.FRIDGE_BATCH_MAX_ITEMS}건까지 처리할 수 있습니다."}, status=400
+        )
+
+    # 🔥 재료 이름 / 냉장고 항목은 IN 쿼리 1번씩으로 조회
+    valid_ops = [op for op in ops if isinstance(op, dict)]
+    names = {op.get("ingredient") for op in valid_ops if isinstance(op.get("ingredient"), str)}
+    fridge_ids = {op.get("fridge_id") for op in valid_ops if _is_id(op.get("fridge_id"))}
+    ingredient_ids = dict(
+        Ingredient.objects.filter(ingredient_name__in=names).values_list("ingredient_name", "ingredient_id")
+    )
+    owned = Fridge.objects.filter(person=person, fridge_id__in=fridge_ids).in_bulk()
+
+    parsed, errors, touched = [], [], set()
+    for index, op in enumerate(ops):
+        item, error = _parse_fridge_op(op, ingredient_ids, owned)
+        if item and "fridge_id" in item:
+            if item["fridge_id"] in touched:
+                item, error = None, "같은 냉장고 항목을 한 요청에서 두 번 변경할 수 없습니다."
+            else:
+                touched.add(item["fridge_id"])
+        if error:
+            errors.append({"index": index, "status": "error", "error": error})
+        parsed.append(item)
+
+    if errors:
+        return JsonResponse({"error": "잘못된 작업이 있어 반영하지 않았습니다.", "results": errors}, status=400)
+
+    today = timezone.localdate()
+    adds = [
+        (index, Fridge(person=person, ingredient_id=op["ingredient_id"], f_quantity=op["quantity"],
+                       added_date=op.get("added_date", today)))
+        for index, op in enumerate(parsed) if op["op"] == "add"
+    ]
+    updates = []
+    for index, op in enumerate(parsed):
+        if op["op"] == "update":
+            item = owned[op["fridge_id"]]
+            item.f_quantity = op.get("quantity", item.f_quantity)
+            item.added_date = op.get("added_date", item.added_date)
+            updates.append((index, item))
+    delete_ids = [op["fridge_id"] for op in parsed if op["op"] == "delete"]
+
+    # 🔥 추가 bulk_create 1번 + 변경 bulk_update 1번 + 삭제 1번을 한 트랜잭션으로
+    with transaction.atomic():
+        Fridge.objects.bulk_ingest(item for _, item in adds)
+        Fridge.objects.bulk_change(item for _, item in updates)
+        Fridge.objects.filter(pk__in=delete_ids).delete()
+
+    # bulk_create / bulk_update 는 시그널을 보내지 않으므로 직접 무효화
+    response_cache.bump_user(person.p_id)
+
+    results = [None] * len(parsed)
+    for status, rows in (("created", adds), ("updated", updates)):
+        for index, item in rows:
+            results[index] = {
+                "index": index,
+                "status": status,
+                "fridge_id": item.fridge_id,
+                "quantity": float(item.f_quantity),
+                "added_date": item.added_date.strftime("%Y-%m-%d") if item.added_date else None,
+                "expiry_date": item.expiry_date.strftime("%Y-%m-%d") if item.expiry_date else None,
+            }
+    for index, op in enumerate(parsed):
+        if op["op"] == "delete":
+            results[index] = {"index": index, "status": "deleted", "fridge_id": op["fridge_id"]}
+    return JsonResponse({"results": results})
+
+
+# ============================
+# 유통기한 임박 재료 API (?days=N, 기본 EXPIRY_SCAN_DAYS)
+# ============================
+@api_view(['GET'])
+def expiring_items_api(request):
+    user_id = request.GET.get("user_id")
+    try:
+        person = Person.objects.get(user_id=user_id)
+    except Person.DoesNotExist:
+        return JsonResponse({"error": "존재하지 않는 사용자입니다."}, status=404)
+
+    try:
+        days = int(request.GET.get("days", settings.EXPIRY_SCAN_DAYS))
+    except ValueError:
+        return JsonResponse({"error": "days는 정수여야 합니다."}, status=400)
+    if days < 0:
+        return JsonResponse({"error": "days는 0 이상이어야 합니다."}, status=400)
+
+    today = timezone.localdate()
+    items = [
         {
+            "fridge_id": f.fridge_id,
             "ingredient": f.ingredient.ingredient_name,
             "quantity": float(f.f_quantity),
             "unit": f.ingredient.unit,
-            "added_date": f.added_date.strftime("%Y-%m-%d"),
-            "expiry_date": f.expiry_date.strftime("%Y-%m-%d")
+            "expiry_date": f.expiry_date.strftime("%Y-%m-%d"),
+            "days_left": (f.expiry_date - today).days,
         }
-        for f in fridge_items
+        for f in expiring_items(person, days, today)
     ]
+    return JsonResponse({"days": days, "items": items})
 
-    return JsonResponse({"items": data})
+
+# ============================
+# 조건부 GET (If-None-Match / If-Modified-Since → 304)
+#   ETag는 user_id → p_id 와 카탈로그/사용자 버전(CacheVersion)만 조회해서 계산 (응답은 만들지 않음)
+# ============================
+def _query_params(request):
+    return {k: v for k, v in request.GET.items() if k != "user_id"}
+
+
+def _recipe_list_etag(request):
+    person_id = response_cache.person_id_for(request.GET.get("user_id"))
+    if person_id is None:
+        return None
+    return response_cache.etag("recipes", person_id, _query_params(request))
+
+
+def _recipe_list_last_modified(request):
+    person_id = response_cache.person_id_for(request.GET.get("user_id"))
+    if person_id is None:
+        return None
+    return response_cache.last_modified(person_id)
+
+
+def _ingredient_list_etag(request):
+    return response_cache.etag("ingredients", None, _query_params(request))
+
+
+def _ingredient_list_last_modified(request):
+    return response_cache.last_modified()
 
 
 # ============================
 # 레시피 리스트 API
 # ============================
+# ============================
+# 커서(keyset) 페이지네이션
+# ============================
+def _page_params(request):
+    """?cursor=<마지막 id>&page_size=<n> 파싱. 잘못된 값이면 ValueError"""
+    cursor = request.GET.get("cursor")
+    page_size = request.GET.get("page_size")
+
+    try:
+        cursor = int(cursor) if cursor else None
+        page_size = int(page_size) if page_size else settings.API_PAGE_SIZE
+    except ValueError:
+        raise ValueError("cursor와 page_size는 정수여야 합니다.")
+
+    if page_size < 1:
+        raise ValueError("page_size는 1 이상이어야 합니다.")
+    return cursor, min(page_size, settings.API_MAX_PAGE_SIZE)
+
+
+def _keyset_page(queryset, pk_field, cursor, page_size, keep=None):
+    """
+    pk 기준 keyset 페이지 조회. OFFSET 없이 WHERE pk > cursor LIMIT n+1 만 실행
+    keep(row)가 False인 행은 건너뛰고, 페이지가 찰 때까지 다음 구간을 이어서 조회
+    구간은 최대 API_KEYSET_MAX_BATCHES 번까지만 읽고, 그래도 안 차면 덜 찬 페이지 + 마지막으로 읽은 pk 를 cursor 로 반환
+    """
+    queryset = queryset.order_by(pk_field)
+    rows = []
+    for _ in range(settings.API_KEYSET_MAX_BATCHES):
+        batch_qs = queryset
+        if cursor is not None:
+            batch_qs = queryset.filter(**{f"{pk_field}__gt": cursor})
+
+        # 한 건 더 가져와서 다음 페이지 존재 여부 판단
+        batch = list(batch_qs[:page_size + 1])
+        for row in batch:
+            if keep is not None and not keep(row):
+                continue
+            if len(rows) == page_size:
+                return rows, getattr(rows[-1], pk_field)
+            rows.append(row)
+
+        if len(batch) <= page_size:
+            return rows, None
+        cursor = getattr(batch[-1], pk_field)
+    return rows, cursor
+
+
+def _ingredient_summary(recipe):
+    """prefetch된 recipeingredient_set으로 "재료 수량단위" 문자열 생성 (추가 쿼리 없음)"""
+    return ", ".join(
+        f"{ri.ingredient.ingredient_name} {float(ri.r_quantity)}{ri.ingredient.unit}"
+        for ri in recipe.recipeingredient_set.all()
+    )
+
+
+# 응답 필드 → (Recipe 컬럼, 값 계산). 컬럼이 None이면 관계에서 계산
+RECIPE_FIELDS = {
+    "id": ("recipe_id", lambda r, liked_ids: r.recipe_id),
+    "name": ("recipe_name", lambda r, liked_ids: r.recipe_name),
+    "category": ("recipe_category", lambda r, liked_ids: r.recipe_category),
+    "image": ("recipe_img", lambda r, liked_ids: r.recipe_img),
+    "thumbnail": ("recipe_img", lambda r, liked_ids: thumbnails.thumbnail_url(r.recipe_img, "md")),
+    "description": ("description", lambda r, liked_ids: r.description),
+    "ingredients": (None, lambda r, liked_ids: _ingredient_summary(r)),
+    "favorite": (None, lambda r, liked_ids: r.recipe_id in liked_ids),
+}
+# 목록 API는 description(긴 조리 과정)을 읽지 않음 → 상세 API에서만
+LIST_FIELDS = ("id", "name", "category", "image", "thumbnail", "ingredients", "favorite")
+
+
+def _field_params(request, allowed):
+    """?fields=id,name,... 파싱 (없으면 allowed 전체). 허용되지 않은 이름이면 ValueError"""
+    raw = request.GET.get("fields")
+    if not raw:
+        return allowed
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in allowed]
+    if unknown or not fields:
+        raise ValueError(f"fields는 {', '.join(allowed)} 중에서 선택해야 합니다.")
+    return fields
+
+
+def _serialize_recipe(recipe, liked_ids, fields=LIST_FIELDS):
+    return {name: RECIPE_FIELDS[name][1](recipe, liked_ids) for name in fields}
+
+
+def _recipe_queryset(fields=LIST_FIELDS):
+    """
+    응답에 필요한 컬럼만 .only()로 조회 (레시피 1 쿼리)
+    ingredients가 있을 때만 재료를 prefetch (+ 재료 1 쿼리)
+    """
+    columns = ["recipe_id"] + [RECIPE_FIELDS[name][0] for name in fields if RECIPE_FIELDS[name][0]]
+    recipes = Recipe.objects.only(*dict.fromkeys(columns))
+    if "ingredients" in fields:
+        recipes = recipes.prefetch_related(
+            Prefetch(
+                "recipeingredient_set",
+                queryset=RecipeIngredient.objects.select_related("ingredient")
+            )
+        )
+    return recipes
+
+
+def _stream_json_list(key, rows, serialize):
+    """
+    {"<key>": [...], "next": null} 을 청크 단위로 생성
+    rows는 .iterator()로 읽으므로 전체 목록/JSON 문자열을 메모리에 올리지 않음
+    """
+    encoder = DjangoJSONEncoder()
+    yield f'{{"{key}": ['
+    chunk, first = [], True
+    for row in rows:
+        chunk.append(encoder.encode(serialize(row)))
+        if len(chunk) == settings.API_STREAM_CHUNK_SIZE:
+            yield ("" if first else ", ") + ", ".join(chunk)
+            chunk, first = [], False
+    if chunk:
+        yield ("" if first else ", ") + ", ".join(chunk)
+    yield '], "next": null}'
+
+
+def _stream_recipe_list(recipes, cursor, keep, liked_ids, fields):
+    if cursor is not None:
+        recipes = recipes.filter(recipe_id__gt=cursor)
+    rows = recipes.order_by("recipe_id").iterator(chunk_size=settings.API_STREAM_CHUNK_SIZE)
+    if keep is not None:
+        rows = filter(keep, rows)
+    return StreamingHttpResponse(
+        _stream_json_list("recipes", rows, lambda r: _serialize_recipe(r, liked_ids, fields)),
+        content_type="application/json",
+    )
+
+
+@condition(etag_func=_recipe_list_etag, last_modified_func=_recipe_list_last_modified)
 @api_view(['GET'])
 def recipe_list_api(request):
     user_id = request.GET.get("user_id")
     person = Person.objects.get(user_id=user_id)
 
-    recipes = Recipe.objects.all()
-    liked_ids = Like.objects.filter(person=person).values_list("recipe_id", flat=True)
+    try:
+        cursor, page_size = _page_params(request)
+        fields = _field_params(request, LIST_FIELDS)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    category = request.GET.get("category")
+
+    def query():
+        recipes = _recipe_queryset(fields)
+        if category:
+            recipes = recipes.filter(recipe_category=category)
+
+        # 🔥 알러지/비건 금지 재료가 들어간 레시피 제외 (레시피 재료 집합과 isdisjoint)
+        forbidden = forbidden_ingredients(person)
+        keep = None
+        if forbidden:
+            index = get_recipe_index()
+            keep = lambda r: index.is_safe(r.recipe_id, forbidden)
+
+        # 🔥 좋아요는 set으로 한 번만 평가 (lazy QuerySet 재평가 방지)
+        liked_ids = set()
+        if "favorite" in fields:
+            liked_ids = set(Like.objects.filter(person=person).values_list("recipe_id", flat=True))
+        return recipes, keep, liked_ids
+
+    # 🔥 ?stream=1: 페이지 없이 cursor 이후 전체를 청크 단위로 스트리밍 (캐시하지 않음)
+    if request.GET.get("stream") in ("1", "true"):
+        recipes, keep, liked_ids = query()
+        return _stream_recipe_list(recipes, cursor, keep, liked_ids, fields)
+
+    def build():
+        recipes, keep, liked_ids = query()
+        page, next_cursor = _keyset_page(recipes, "recipe_id", cursor, page_size, keep)
+        return {"recipes": [_serialize_recipe(r, liked_ids, fields) for r in page], "next": next_cursor}
+
+    # 🔥 사용자 + 카탈로그 버전이 같으면 캐시된 페이지 사용
+    params = {"cursor": cursor, "page_size": page_size, "category": category, "fields": ",".join(fields)}
+    data = response_cache.get_or_build("recipes", person.p_id, params, build)
+    return JsonResponse(data)
 
-    data = []
-    for r in recipes:
-        ing_list = RecipeIngredient.objects.filter(recipe=r)
-        ingredients = [
-            f"{ri.ingredient.ingredient_name} {float(ri.r_quantity)}{ri.ingredient.unit}"
-            for ri in ing_list
-        ]
 
-        data.append({
-            "id": r.recipe_id,
-            "name": r.recipe_name,
-            "category": r.recipe_category,
-            "image": r.recipe_img,
-            "ingredients": ", ".join(ingredients),
-            "favorite": r.recipe_id in liked_ids
-        })
+# ============================
+# 레시피 상세 API (?fields= 로 description 등 선택)
+# ============================
+@api_view(['GET'])
+def recipe_detail_api(request, recipe_id):
+    try:
+        fields = _field_params(request, tuple(RECIPE_FIELDS))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    recipe = _recipe_queryset(fields).filter(recipe_id=recipe_id).first()
+    if recipe is None:
+        return JsonResponse({"error": "존재하지 않는 레시피입니다."}, status=404)
+
+    # user_id가 있을 때만 좋아요 여부 확인
+    liked_ids = set()
+    user_id = request.GET.get("user_id")
+    if "favorite" in fields and user_id:
+        liked_ids = set(
+            Like.objects.filter(person__user_id=user_id, recipe_id=recipe_id).values_list("recipe_id", flat=True)
+        )
+    return JsonResponse(_serialize_recipe(recipe, liked_ids, fields))
+
+
+# ============================
+# 검색 API (레시피명 / 재료명 / 조리법, 2-gram 색인)
+# ============================
+@api_view(['GET'])
+def search_api(request):
+    query = request.GET.get("q", "").strip()
+    if not query:
+        return JsonResponse({"error": "검색어(q)를 입력하세요."}, status=400)
+    try:
+        # 음수는 SQLite 에서 LIMIT -1(무제한)이 되므로 1 이상으로
+        limit = max(1, min(int(request.GET.get("limit", 20)), settings.API_MAX_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({"error": "limit는 정수여야 합니다."}, status=400)
+
+    recipe_ids = search.search_recipes(query, limit)
+    ingredient_ids = search.search_ingredients(query, limit)
+    fields = ("id", "name", "category", "image", "thumbnail")
+    recipes = _recipe_queryset(fields).in_bulk(recipe_ids)
+    ingredients = Ingredient.objects.in_bulk(ingredient_ids)
+
+    # 색인 순위(관련도) 유지
+    return JsonResponse({
+        "recipes": [
+            _serialize_recipe(recipes[pk], set(), fields)
+            for pk in recipe_ids if pk in recipes
+        ],
+        "ingredients": [
+            {
+                "id": ingredients[pk].ingredient_id,
+                "name": ingredients[pk].ingredient_name,
+                "unit": ingredients[pk].unit,
+                "category": ingredients[pk].ingredient_category,
+            }
+            for pk in ingredient_ids if pk in ingredients
+        ],
+    })
+
+
+# ============================
+# 지금 만들 수 있는 레시피 API (냉장고 ↔ 레시피 매칭)
+# ============================
+@api_view(['GET'])
+def cookable_recipes_api(request):
+    user_id = request.GET.get("user_id")
+    try:
+        person = Person.objects.get(user_id=user_id)
+    except Person.DoesNotExist:
+        return JsonResponse({"error": "존재하지 않는 사용자입니다."}, status=404)
+
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 20)), settings.API_MAX_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({"error": "limit는 정수여야 합니다."}, status=400)
+
+    # 같은 재료가 여러 줄이면 수량 합산
+    fridge = {}
+    for ingredient_id, qty in Fridge.objects.filter(person=person).values_list("ingredient_id", "f_quantity"):
+        fridge[ingredient_id] = fridge.get(ingredient_id, 0.0) + float(qty)
+
+    forbidden = forbidden_ingredients(person)
+    matches = get_recipe_index().match(fridge, limit=limit, forbidden=forbidden)
+
+    # 상위 결과에 필요한 이름만 IN 쿼리 2번으로 조회
+    recipe_ids = [m["recipe_id"] for m in matches]
+    ingredient_ids = {i for m in matches for i in m["present"] + m["missing"]}
+    recipes = Recipe.objects.only("recipe_name", "recipe_category", "recipe_img").in_bulk(recipe_ids)
+    ingredients = Ingredient.objects.in_bulk(ingredient_ids)
+
+    data = [
+        {
+            "id": m["recipe_id"],
+            "name": recipes[m["recipe_id"]].recipe_name,
+            "category": recipes[m["recipe_id"]].recipe_category,
+            "image": recipes[m["recipe_id"]].recipe_img,
+            "thumbnail": thumbnails.thumbnail_url(recipes[m["recipe_id"]].recipe_img, "md"),
+            "coverage": round(m["coverage"], 3),
+            "present": [ingredients[i].ingredient_name for i in m["present"]],
+            "missing": [ingredients[i].ingredient_name for i in m["missing"]],
+            "shortfall": [
+                {"ingredient": ingredients[i].ingredient_name, "quantity": round(q, 2),
+                 "unit": ingredients[i].unit}
+                for i, q in m["shortfall"]
+            ],
+        }
+        for m in matches
+        if m["recipe_id"] in recipes
+    ]
 
     return JsonResponse({"recipes": data})
 
 
+# ============================
+# 캐시 지표 API (관리자 전용)
+# ============================
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats_api(request):
+    return JsonResponse({
+        "responses": response_cache.stats(),
+        "classify": classify_cache_stats(),
+    })
+
+
+# ============================
+# 사진 썸네일 (없으면 첫 요청에서 생성)
+#   api/thumbs/<size>/<MEDIA_ROOT 기준 원본 경로>
+# ============================
+@api_view(['GET'])
+def thumbnail_view(request, size, path):
+    try:
+        dst = thumbnails.ensure_thumbnail(path, size)
+    except (thumbnails.ThumbnailError, OSError):
+        raise Http404("썸네일을 만들 수 없습니다.")
+    # 원본이 바뀌면 Last-Modified / ETag 로 재검증되므로 immutable 은 붙이지 않음
+    relative = os.path.relpath(dst, settings.MEDIA_ROOT).replace(os.sep, "/")
+    return media.serve(request, relative, max_age=settings.THUMBNAIL_CACHE_MAX_AGE)
+
+
 # ===========================
 # 🔥 1) 재료 목록 제공 API (프론트에서 선택 UI를 만들 때 사용)
 # ===========================
+@condition(etag_func=_ingredient_list_etag, last_modified_func=_ingredient_list_last_modified)
 @api_view(['GET'])
 def ingredient_list(request):
-    ingredients = Ingredient.objects.all()
+    try:
+        cursor, page_size = _page_params(request)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    category = request.GET.get("category")
+
+    def build():
+        ingredients = Ingredient.objects.all()
+        if category:
+            ingredients = ingredients.filter(ingredient_category=category)
+        page, next_cursor = _keyset_page(ingredients, "ingredient_id", cursor, page_size)
+
+        data = [
+            {
+                "id": ing.ingredient_id,
+                "name": ing.ingredient_name,
+                "category": ing.ingredient_category
+            }
+            for ing in page
+        ]
+        return {"ingredients": data, "next": next_cursor}
 
-    data = [
-        {
-            "name": ing.ingredient_name,
-            "category": ing.ingredient_category
-        }
-        for ing in ingredients
-    ]
+    params = {"cursor": cursor, "page_size": page_size, "category": category}
+    data = response_cache.get_or_build("ingredients", None, params, build)
+    return JsonResponse(data, status=200)
+
+
+# ===========================
+# 🔥 재료 자동완성 API (?q=ㄷ → 두부, 당근 ...) - 메모리 인덱스, DB 조회 없음
+# ===========================
+@api_view(['GET'])
+def ingredient_autocomplete(request):
+    query = request.GET.get("q", "")
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 10)), settings.API_MAX_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({"error": "limit는 정수여야 합니다."}, status=400)
 
-    return JsonResponse({"ingredients": data}, status=200)
+    return JsonResponse({"ingredients": get_ingredient_index().lookup(query, limit)})
 
 
 
@@ -267,39 +828,72 @@ def add_recipe(request):
         name = request.POST.get("name")
         description = request.POST.get("description")
         category = request.POST.get("category")
-        ingredients = json.loads(request.POST.get("ingredients", "[]"))
         image_file = request.FILES.get("image")
+        try:
+            ingredient_names = json.loads(request.POST.get("ingredients", "[]"))
+        except ValueError:
+            ingredient_names = None
+        # 문자열이면 글자 단위로, dict 면 키로 풀려 버리므로 비어 있지 않은 문자열 배열만 허용
+        if not isinstance(ingredient_names, list) or not all(
+            isinstance(n, str) and n.strip() for n in ingredient_names
+        ):
+            return JsonResponse({"error": "ingredients는 재료 이름 JSON 배열이어야 합니다."}, status=400)
+        # 같은 재료가 여러 번 와도 한 번만 연결 (recipe, ingredient unique)
+        ingredient_names = list(dict.fromkeys(ingredient_names))
+
+        if not name:
+            return JsonResponse({"error": "레시피 이름을 입력하세요."}, status=400)
 
         # -------------------------
-        # 1) Recipe 생성
+        # 1) 재료 이름 → id 를 IN 쿼리 1번으로 조회
+        #    없는 재료는 저장 전에 한꺼번에 알려줌
         # -------------------------
-        recipe = Recipe.objects.create(
-            recipe_name=name,
-            description=description,
-            recipe_category=category
+        ingredient_ids = dict(
+            Ingredient.objects.filter(ingredient_name__in=ingredient_names)
+            .values_list("ingredient_name", "ingredient_id")
         )
+        unknown = [n for n in ingredient_names if n not in ingredient_ids]
+        if unknown:
+            return JsonResponse(
+                {"error": "존재하지 않는 재료가 있습니다.", "unknown_ingredients": unknown}, status=400
+            )
 
-        # -------------------------
-        # 2) 이미지 파일 저장
-        # -------------------------
+        # 내용 해시 이름 → 같은 사진은 한 번만 저장, URL 은 immutable 캐시
+        recipe_img = digest = None
         if image_file:
-            save_path = default_storage.save(f"recipes/{image_file.name}", image_file)
-            recipe.recipe_img = settings.MEDIA_URL + save_path
-            recipe.save()
+            digest = uploads.streamed_digest(request, "image", image_file)
+            recipe_img = settings.MEDIA_URL + media.content_name(image_file, "recipes", digest)
 
         # -------------------------
-        # 3) RecipeIngredient 생성
-        #    재료 이름만 넘어온다고 가정.
-        #    수량은 기본 1로 저장.
+        # 2) Recipe + RecipeIngredient 를 한 트랜잭션으로
+        #    수량은 기본 1로 저장
         # -------------------------
-        for ing_name in ingredients:
-            ingredient = Ingredient.objects.get(ingredient_name=ing_name)
-
-            RecipeIngredient.objects.create(
-                recipe=recipe,
-                ingredient=ingredient,
-                r_quantity=1  # 기본 1개로 저장
+        with transaction.atomic():
+            recipe = Recipe.objects.create(
+                recipe_name=name,
+                description=description,
+                recipe_category=category,
+                recipe_img=recipe_img
             )
+            RecipeIngredient.objects.bulk_create([
+                RecipeIngredient(recipe=recipe, ingredient_id=ingredient_ids[n], r_quantity=1)
+                for n in ingredient_names
+            ])
+            # bulk_create 는 시그널을 보내지 않으므로 검색 색인은 같은 트랜잭션에서 갱신
+            search.reindex_recipes([recipe.recipe_id])
+
+        # 이미지는 커밋 후 저장 → 롤백된 레시피의 파일이 남아 같은 사진 업로드에 재사용되지 않음
+        if image_file:
+            try:
+                media.store_upload(image_file, "recipes", digest)
+            except Exception:
+                recipe.delete()
+                raise
+
+        # 커밋 후 매칭 인덱스/응답 캐시 무효화, 썸네일 미리 생성
+        invalidate_recipe_index()
+        response_cache.bump_catalogue()
+        thumbnails.pregenerate(recipe.recipe_img)
 
         return JsonResponse({"message": "레시피 저장 완료", "recipe_id": recipe.recipe_id}, status=201)
 
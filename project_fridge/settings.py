@@ -37,6 +37,7 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'apis.uploads.UploadLimitMiddleware',  # CsrfViewMiddleware 가 본문을 읽기 전에 업로드 한도 적용
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -79,6 +80,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 이미지 분석 작업 스레드도 DB 에 쓰므로 테스트 DB 도 파일로
+        # (메모리 DB 의 공유 캐시 모드는 잠금을 기다리지 않고 바로 "table is locked")
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
@@ -125,9 +129,90 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Cache
+# 'classify': GPT 이미지 분석 결과 캐시 (이미지 해시 키, TTL 7일, 최대 1000건)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'classify': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'classify',
+        'TIMEOUT': 60 * 60 * 24 * 7,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+# 이미지 분석 LLM 교체용 (None이면 ChatOpenAI, 테스트: 'apis.llm_stub.StubLLM')
+CLASSIFY_LLM_BACKEND = None
+
+# 이미지 분석 전 축소/재인코딩 (gpt-4o 고해상도 모드 기준: 짧은 변 768, 긴 변 2048)
+CLASSIFY_IMAGE_SHORT_SIDE = 768
+CLASSIFY_IMAGE_LONG_SIDE = 2048
+CLASSIFY_IMAGE_QUALITY = 85
+
+# 이미지 분석 비동기 작업 (POST classify/?mode=async → GET classify/jobs/<job_id>/)
+CLASSIFY_WORKERS = 4            # 작업 스레드 수
+CLASSIFY_LLM_CONCURRENCY = 4    # LLM 동시 호출 제한 (동기/비동기 공통)
+CLASSIFY_MAX_PENDING = 32       # 대기열 최대 길이, 초과 시 429
+CLASSIFY_JOB_TIMEOUT = 60 * 60  # 작업 결과 보관 시간(초)
+
+# 목록 API(recipes/, ingredients/) 커서 페이지네이션 기본/최대 크기
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+# 필터로 건너뛰는 행이 많을 때 한 페이지를 채우려고 읽는 최대 구간 수 (초과 시 덜 찬 페이지 + cursor)
+API_KEYSET_MAX_BATCHES = 10
+
+# recipes/?stream=1 전체 목록 스트리밍 시 DB에서 한 번에 읽을 행 수 (= JSON 청크 크기)
+API_STREAM_CHUNK_SIZE = 500
+
+# fridge_items/, recipes/ 응답 캐시 유지 시간(초) - 데이터 변경 시 CacheVersion(DB) 버전으로 즉시 무효화됨
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+
+# 비건 사용자에게 제외할 재료를 묶어 두는 Allergy 이름 (AllergyIngredient로 매핑)
+VEGAN_ALLERGY_NAME = '비건'
+
+# 사용자별 금지 재료 집합 캐시 유지 시간(초) - 변경 시 CacheVersion(DB) 버전으로 즉시 무효화됨
+EXCLUSION_CACHE_TIMEOUT = 60 * 60
+
+# fridge_items/batch/ 한 요청에 담을 수 있는 최대 작업 수
+FRIDGE_BATCH_MAX_ITEMS = 500
+
+# 유통기한 스캐너(scan_expiry) 기본 조회 범위(일)와 다이제스트(ExpiryNotice) 보관 시간(초)
+EXPIRY_SCAN_DAYS = 3
+EXPIRY_DIGEST_TIMEOUT = 60 * 60 * 24
+
+# 사진 썸네일: 크기 이름 → 긴 변(px). sm = 관리자 미리보기(60~80px)의 2배, md = 앱 목록 카드
+THUMBNAIL_SIZES = {'sm': 160, 'md': 480}
+THUMBNAIL_DIR = 'thumbs'        # 원본 디렉터리 아래 thumbs/<size>/ 에 저장
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_CACHE_MAX_AGE = 60 * 60 * 24 * 30  # 썸네일 응답 Cache-Control max-age(초)
+
 MEDIA_ROOT = os.path.join(BASE_DIR, 'apis', 'data')
 MEDIA_URL = '/media/'
 
+# 업로드 한도 (URL name 별): 파일 최대 크기, 허용 형식(파일 앞부분 매직 넘버로 판별)
+#   classify: 휴대폰 원본을 받아 서버에서 축소, add_recipe: 썸네일을 만들 수 있는 형식만
+#   (HEIC 는 Pillow 로 디코딩할 수 없으므로 받지 않음 → 415)
+UPLOAD_LIMITS = {
+    'classify_query': {
+        'max_bytes': 20 * 1024 * 1024,
+        'content_types': ['image/jpeg', 'image/png', 'image/webp'],
+    },
+    'add_recipe': {
+        'max_bytes': 10 * 1024 * 1024,
+        'content_types': ['image/jpeg', 'image/png', 'image/webp', 'image/gif'],
+    },
+}
+
+# 미디어 서빙 방식: 'django'(FileResponse + Range) / 'x-accel'(nginx) / 'x-sendfile'(Apache, lighttpd)
+MEDIA_SERVE_MODE = 'django'
+MEDIA_ACCEL_PREFIX = '/protected-media/'       # x-accel: nginx internal location
+MEDIA_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365   # 내용 해시 이름(업로드) 파일
+MEDIA_CACHE_MAX_AGE = 60 * 60                  # 그 외 파일(photo/...) - 이후 ETag로 재검증
+# MEDIA_ROOT(apis/data)에는 시드 CSV(개인정보 포함)도 있으므로 이 하위 디렉터리의 이미지만 서빙
+MEDIA_SERVE_DIRS = ('photo/', 'recipes/')
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # ✅ React 개발 서버 주소
 ]
@@ -1,9 +1,10 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
 from django.shortcuts import redirect
 
+from apis.media import serve as serve_media
+
 urlpatterns = [
     path('admin/', admin.site.urls),
 
@@ -12,8 +13,7 @@ urlpatterns = [
 
     # ✅ 기본 루트('/') 접속 시 my_fridge로 이동 (선택사항)
     path('', lambda request: redirect('my_fridge')),
-]
 
-# ⚙️ 개발 중 미디어 파일 서빙
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    # ⚙️ 미디어 파일 서빙 (DEBUG 와 무관, 방식은 MEDIA_SERVE_MODE)
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:path>", serve_media, name='media'),
+]